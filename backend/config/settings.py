@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,6 +46,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    "tickets.metrics.RequestMetricsMiddleware",
+    "tickets.auth.TokenAuthMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,9 +88,53 @@ DATABASES = {
     'PASSWORD': os.getenv("DB_PASSWORD"),
     'HOST': os.getenv("DB_HOST"),
     'PORT': '3306',
+    # 워커마다 연결을 N초 동안 다시 씀 (요청마다 새로 연결하지 않음), 쓰기 전 상태 확인
+    'CONN_MAX_AGE': int(os.getenv("DB_CONN_MAX_AGE", "60")),
+    'CONN_HEALTH_CHECKS': True,
   }
 }
 
+# 읽기 전용 복제본 (DB_REPLICA_HOST 를 지정했을 때만 사용)
+# 조회 전용 뷰(@use_replica)만 replica 에서 읽고, 쓰기/트랜잭션은 항상 default
+if os.getenv("DB_REPLICA_HOST"):
+  DATABASES['replica'] = {
+    **DATABASES['default'],
+    'HOST': os.getenv("DB_REPLICA_HOST"),
+    'PORT': os.getenv("DB_REPLICA_PORT", '3306'),
+    'USER': os.getenv("DB_REPLICA_USER", DATABASES['default']['USER']),
+    'PASSWORD': os.getenv("DB_REPLICA_PASSWORD", DATABASES['default']['PASSWORD']),
+    'TEST': {'MIRROR': 'default'},
+  }
+
+DATABASE_ROUTERS = ["tickets.routers.ReplicaRouter"]
+
+# 쓰기 후 N초 동안은 그 사용자의 조회를 default 에서 처리 (복제 지연 대비, 0 이면 끔)
+REPLICA_READ_YOUR_WRITES = 5
+
+# Cache
+# 좌석 맵 버전/변경 로그, 경기 목록, 좌석 배치, 내 예매, replica 고정 등은 워커끼리 공유해야 함
+# CACHE_URL(예: redis://127.0.0.1:6379/0)을 지정하면 Redis, 없으면 프로세스별 LocMem (개발용, 워커 1개)
+# LocMem 인데 워커가 여럿(WEB_CONCURRENCY > 1)이거나 replica / SEAT_SHM_DIR 을 쓰면
+# 시스템 체크(tickets.E001)가 실패해서 서버가 뜨지 않음
+CACHE_URL = os.getenv("CACHE_URL")
+if CACHE_URL:
+  CACHES = {
+    'default': {
+      'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+      'LOCATION': CACHE_URL,
+      'KEY_PREFIX': 'tickets',
+    }
+  }
+else:
+  CACHES = {
+    'default': {
+      'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+  }
+
+# 이 서버를 띄우는 워커 프로세스 수 (gunicorn 등과 같은 WEB_CONCURRENCY 사용)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
 # Password validation# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -126,3 +175,91 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 CORS_ALLOW_ALL_ORIGINS = True
+# 좌석 맵 버전/ETag 를 프론트에서 읽을 수 있게 노출
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified", "X-Seat-Version", "Retry-After"]
+# 대기열 대기표 헤더 허용
+CORS_ALLOW_HEADERS = (*default_headers, "x-queue-ticket")
+
+# 예매 엔진: "direct"(요청마다 바로 DB 선점) / "sequencer"(경기별 단일 작성자 큐)
+RESERVATION_ENGINE = os.getenv("RESERVATION_ENGINE", "direct")
+SEQUENCER_BATCH_SIZE = 32
+SEQUENCER_TIMEOUT = 5.0
+# 한 경기는 한 프로세스만 sequencer 로 처리 (공유 캐시의 소유 키를 OWNER_TTL 초마다 갱신, 나머지는 직접 선점)
+SEQUENCER_OWNER_TTL = 30
+
+# request_log 비동기 버퍼 기록 (큐 크기 / 한 번에 INSERT 할 행 수 / 최대 대기 초)
+REQUEST_LOG_ASYNC = True
+REQUEST_LOG_QUEUE_SIZE = 10000
+REQUEST_LOG_BATCH_SIZE = 200
+REQUEST_LOG_FLUSH_INTERVAL = 1.0
+
+# 좌석 임시 선점(hold) 유지 시간(분) / 만료 hold 정리 주기(초) / 한 번에 해제할 개수
+HOLD_MINUTES = 5
+HOLD_SWEEP_INTERVAL = 10
+HOLD_SWEEP_BATCH_SIZE = 500
+
+# 대기열(입장 제어): 초당 RATE 명씩 입장(조용하던 뒤에는 최대 BURST 명까지 바로 입장), 입장 후 PASS_TTL 초 동안 유효
+# MATCHES = None 이면 모든 경기, [1, 2] 처럼 지정하면 해당 경기만
+# STORE = "memory" 또는 SQLite 파일 경로(같은 노드의 워커끼리 공유)
+WAITING_ROOM_ENABLED = os.getenv("WAITING_ROOM_ENABLED") == "1"
+WAITING_ROOM_MATCHES = None
+WAITING_ROOM_RATE = 20
+WAITING_ROOM_BURST = 100
+WAITING_ROOM_PASS_TTL = 600
+WAITING_ROOM_STORE = os.getenv("WAITING_ROOM_STORE", "memory")
+
+# match_stats 증분 갱신: 변화량을 모아서 N초마다 반영 (False 면 커밋 직후 바로 UPDATE)
+MATCH_STATS_ASYNC = True
+MATCH_STATS_FLUSH_INTERVAL = 1.0
+
+# 이상 예매 탐지(슬라이딩 윈도우): WINDOW 초 안의 예매 시도 횟수/실패 비율,
+# CANCEL_WINDOW 초 안의 취소 횟수로 판단해서 abuse_log 에 기록
+ABUSE_DETECTION_ENABLED = True
+ABUSE_WINDOW = 60
+ABUSE_MAX_ATTEMPTS = 30
+ABUSE_MIN_ATTEMPTS = 10
+ABUSE_FAILURE_RATIO = 0.8
+ABUSE_CANCEL_WINDOW = 3600
+ABUSE_MAX_CANCELS = 3
+# 관리자 화면에 보여줄 abuse_log 기간(시간)
+ABUSE_REPORT_HOURS = 24
+
+# API 별 지표: 이보다 느린 요청은 실행한 SQL(최대 SLOW_SQL_LIMIT 개)과 함께 로그 (None 이면 끔)
+METRICS_SLOW_REQUEST_MS = 500
+METRICS_SLOW_SQL_LIMIT = 50
+
+# 경기 목록 캐시 유지 시간(초). Match/Team 을 저장하면 바로 무효화되고,
+# DB 를 직접 고친 경우에는 이 시간이 지나야 반영됨
+MATCH_LIST_CACHE_TTL = 60
+
+# 노드 공유 좌석 비트맵(mmap) 디렉터리. 지정하면 format=bitmap 조회를 DB 없이 처리
+# (예: /dev/shm/tickets). RECONCILE_INTERVAL 초마다 seats 와 대조
+SEAT_SHM_DIR = os.getenv("SEAT_SHM_DIR")
+SEAT_SHM_RECONCILE_INTERVAL = 30
+
+# 좌석 실시간 전송(SSE): 변경을 COALESCE_MS 동안 모아 한 프레임으로, HEARTBEAT 초마다 ping
+# 워커가 여럿이면 BROKER 를 프로세스 간 전달이 되는 구현으로 바꿔야 함 (tickets.push.Broker)
+PUSH_BROKER = "tickets.push.InProcessBroker"
+PUSH_COALESCE_MS = 200
+PUSH_HEARTBEAT = 15
+
+# 등급/블록별 잔여 좌석 요약(seat_availability) 증분 갱신: 변화량을 모아서 N초마다 반영
+SEAT_AVAILABILITY_ASYNC = True
+SEAT_AVAILABILITY_FLUSH_INTERVAL = 1.0
+
+# 로그인 접근 토큰(서명, 서버 저장 없음) 유효 시간(초)과 사용자 정보 캐시(프로세스별 LRU)
+# REQUIRE_TOKEN = True 면 예매/선점/취소/내 예매 API 는 토큰이 있어야 함 (user_id 만으로는 안 됨)
+AUTH_TOKEN_MAX_AGE = 86400
+AUTH_USER_CACHE_SIZE = 10000
+AUTH_USER_CACHE_TTL = 300
+AUTH_REQUIRE_TOKEN = False
+
+# 판매 오픈 예열(onsale_scheduler): 오픈 WARM_LEAD 초 전부터 좌석 맵/요약/경기 목록 캐시와 DB 연결 예열
+# PROBE_URL(예: http://127.0.0.1:8000)을 지정하면 실제 서버에 REQUESTS 번씩 CONCURRENCY 개 동시 요청
+ONSALE_WARM_LEAD = 300
+ONSALE_PROBE_URL = os.getenv("ONSALE_PROBE_URL")
+ONSALE_PROBE_REQUESTS = 20
+ONSALE_PROBE_CONCURRENCY = 4
+
+# 테스트 DB 에 운영 전용 테이블/트리거를 먼저 만드는 러너 (python manage.py test tickets)
+TEST_RUNNER = "tickets.tests.runner.TicketsTestRunner"
@@ -0,0 +1,34 @@
+"""
+벤치마크 전용 설정 (python manage.py bench_ticket_rush --settings=config.settings_bench)
+
+운영 DB 대신 빈 로컬 DB 를 쓴다.
+  - 기본: SQLite 파일 (BENCH_DB, 기본 backend/bench.sqlite3)
+  - BENCH_DB_HOST 를 주면 MySQL (BENCH_DB_NAME 은 비어 있는 DB 여야 함)
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, os
+
+DEBUG = False  # 쿼리 로그가 메모리에 쌓이지 않도록
+ALLOWED_HOSTS = ["testserver", "localhost"]
+
+if os.getenv("BENCH_DB_HOST"):
+  DATABASES = {
+    'default': {
+      'ENGINE': 'django.db.backends.mysql',
+      'NAME': os.getenv("BENCH_DB_NAME", "ticket_bench"),
+      'USER': os.getenv("BENCH_DB_USER", os.getenv("DB_USER")),
+      'PASSWORD': os.getenv("BENCH_DB_PASSWORD", os.getenv("DB_PASSWORD")),
+      'HOST': os.getenv("BENCH_DB_HOST"),
+      'PORT': os.getenv("BENCH_DB_PORT", '3306'),
+    }
+  }
+else:
+  DATABASES = {
+    'default': {
+      'ENGINE': 'django.db.backends.sqlite3',
+      'NAME': os.getenv("BENCH_DB", str(BASE_DIR / "bench.sqlite3")),
+      'OPTIONS': {'timeout': 20},
+    }
+  }
+
+WAITING_ROOM_ENABLED = False
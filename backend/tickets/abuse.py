@@ -0,0 +1,307 @@
+"""
+이상 예매 탐지 (슬라이딩 윈도우)
+
+예매 시도/취소 이벤트를 큐로 받아 백그라운드 스레드에서 처리한다.
+사용자별 / IP별 최근 기록만 메모리에 두고, 규칙에 걸리면 abuse_log 에 기록.
+관리자 화면은 cancel_log 를 집계하지 않고 abuse_log / cancel_counters 를 읽는다.
+(cancel_log 는 후보 사용자의 대표 예매 ID 를 찾을 때만 user_id 로 좁혀 조회)
+
+규칙 (ABUSE_* 설정)
+  attempt_rate    : 사용자가 ABUSE_WINDOW 초 안에 예매 시도 ABUSE_MAX_ATTEMPTS 회 초과
+  ip_attempt_rate : 같은 IP 에서 ABUSE_WINDOW 초 안에 예매 시도 ABUSE_MAX_ATTEMPTS 회 초과
+  failure_ratio   : ABUSE_WINDOW 초 안의 시도가 ABUSE_MIN_ATTEMPTS 회 이상이고
+                    실패 비율이 ABUSE_FAILURE_RATIO 이상
+  cancel_churn    : ABUSE_CANCEL_WINDOW 초 안에 취소 ABUSE_MAX_CANCELS 회 이상
+
+같은 대상/규칙은 윈도우 안에서 한 번만 기록한다.
+카운터는 프로세스 단위 (워커가 여러 개면 워커별로 판단).
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+
+from . import routers
+from .serializers import DATETIME, INT, JSON, RowLayout
+
+logger = logging.getLogger(__name__)
+
+
+def _conf(name, default):
+    return getattr(settings, f"ABUSE_{name}", default)
+
+
+class _Window:
+    """최근 window 초 동안의 (시각, 실패 여부) 기록"""
+
+    __slots__ = ("events", "failures", "match_id")
+
+    def __init__(self):
+        self.events = deque()
+        self.failures = 0
+        self.match_id = None
+
+    def add(self, now, failed, match_id):
+        self.events.append((now, failed))
+        if failed:
+            self.failures += 1
+        if match_id is not None:
+            self.match_id = match_id
+
+    def prune(self, now, window):
+        events = self.events
+        while events and events[0][0] <= now - window:
+            _, failed = events.popleft()
+            if failed:
+                self.failures -= 1
+        return len(events)
+
+
+class AbuseDetector:
+    def __init__(self, max_queue=10000):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.flagged = 0
+        self._users = {}     # user_id -> _Window (예매 시도)
+        self._ips = {}       # ip -> _Window (예매 시도)
+        self._cancels = {}   # user_id -> _Window (취소)
+        self._last_flag = {}  # (대상, 규칙) -> 마지막 기록 시각
+        self._processed = 0
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="abuse-detector", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, event):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            # 예외로 스레드가 끝나면 이후 이벤트가 쌓이기만 하므로 기록하고 계속
+            try:
+                close_old_connections()
+                self.drain(batch)
+            except Exception:
+                logger.exception("이상 예매 탐지 스레드 오류 (%d건)", len(batch))
+
+    def drain(self, events=None):
+        """이벤트 처리 후 걸린 것들을 abuse_log 에 기록"""
+        if events is None:
+            events = []
+            while True:
+                try:
+                    events.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+        flags = []
+        with self._drain_lock:
+            for event in events:
+                flags.extend(self.process(*event))
+        if flags:
+            try:
+                write_flags(flags)
+                self.flagged += len(flags)
+            except DatabaseError:
+                logger.exception("abuse_log 기록 실패 (%d건)", len(flags))
+
+    def process(self, kind, now, user_id, match_id, ip, success):
+        """
+        이벤트 1건 반영. 새로 걸린 [(user_id, match_id, event_type), ...]
+        """
+        flags = []
+        if kind == "attempt":
+            window = _conf("WINDOW", 60)
+            max_attempts = _conf("MAX_ATTEMPTS", 30)
+
+            targets = [(self._users, user_id, "attempt_rate")]
+            if ip:
+                targets.append((self._ips, ip, "ip_attempt_rate"))
+            for table, key, rule in targets:
+                if key is None:
+                    continue
+                w = table.get(key)
+                if w is None:
+                    w = table[key] = _Window()
+                w.add(now, not success, match_id)
+                count = w.prune(now, window)
+                if count > max_attempts:
+                    self._flag(flags, key, rule, now, window, user_id, w.match_id)
+                if table is self._users and count >= _conf("MIN_ATTEMPTS", 10) \
+                        and w.failures / count >= _conf("FAILURE_RATIO", 0.8):
+                    self._flag(flags, key, "failure_ratio", now, window, user_id, w.match_id)
+
+        elif kind == "cancel":
+            window = _conf("CANCEL_WINDOW", 3600)
+            w = self._cancels.get(user_id)
+            if w is None:
+                w = self._cancels[user_id] = _Window()
+            w.add(now, False, match_id)
+            if w.prune(now, window) >= _conf("MAX_CANCELS", 3):
+                self._flag(flags, user_id, "cancel_churn", now, window, user_id, w.match_id)
+
+        self._processed += 1
+        if self._processed % 1000 == 0:
+            self._evict(now)
+        return flags
+
+    def _flag(self, flags, key, rule, now, window, user_id, match_id):
+        if user_id is None or match_id is None:
+            return
+        last = self._last_flag.get((key, rule))
+        if last is not None and now - last < window:
+            return
+        self._last_flag[(key, rule)] = now
+        flags.append((user_id, match_id, rule))
+
+    def _evict(self, now):
+        """윈도우가 빈 대상은 메모리에서 제거"""
+        window = _conf("WINDOW", 60)
+        cancel_window = _conf("CANCEL_WINDOW", 3600)
+        for table, span in ((self._users, window), (self._ips, window), (self._cancels, cancel_window)):
+            for key in [k for k, w in table.items() if not w.prune(now, span)]:
+                del table[key]
+        horizon = max(window, cancel_window)
+        for key in [k for k, t in self._last_flag.items() if now - t >= horizon]:
+            del self._last_flag[key]
+
+    def stats(self):
+        return {
+            "queued": self.queue.qsize(),
+            "flagged": self.flagged,
+            "dropped": self.dropped,
+            "users": len(self._users),
+            "ips": len(self._ips),
+        }
+
+
+def write_flags(flags):
+    """flags = [(user_id, match_id, event_type), ...] 를 INSERT 한 번으로 기록"""
+    values = ", ".join(["(%s, %s, %s)"] * len(flags))
+    params = [v for row in flags for v in row]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO abuse_log (user_id, match_id, event_type) VALUES {values}",
+            params,
+        )
+
+
+detector = AbuseDetector()
+atexit.register(detector.drain)
+
+
+def is_enabled():
+    return _conf("DETECTION_ENABLED", True)
+
+
+def observe_attempt(user_id, match_id, ip, success):
+    """예매 시도 1건 (log_request 에서 호출)"""
+    if is_enabled():
+        detector.submit(("attempt", time.monotonic(), user_id, match_id, ip, success))
+
+
+def observe_cancel(user_id, match_id, ip=None):
+    """취소 1건 (취소 커밋 후 호출)"""
+    if is_enabled():
+        detector.submit(("cancel", time.monotonic(), user_id, match_id, ip, True))
+
+
+CANDIDATES_SQL = """
+    SELECT user_id, match_id, event_type, COUNT(*), MAX(detected_time)
+    FROM abuse_log
+    WHERE detected_time >= %s
+    GROUP BY user_id, match_id, event_type
+"""
+
+CANCEL_CANDIDATES_SQL = """
+    SELECT user_id, SUM(cancel_count)
+    FROM cancel_counters
+    GROUP BY user_id
+    HAVING SUM(cancel_count) >= %s
+"""
+
+# 후보 사용자별 대표 예매 ID (취소한 예매 중 가장 작은 res_id, 예전 화면과 같음)
+REPRESENTATIVE_RES_SQL = """
+    SELECT user_id, MIN(res_id)
+    FROM cancel_log
+    WHERE user_id IN ({})
+    GROUP BY user_id
+"""
+
+
+# 관리자 화면 응답 형식 (candidates 가 돌려주는 튜플 순서)
+CANDIDATE_LAYOUT = RowLayout([
+    ("user_id", INT),
+    ("res_id", INT),
+    ("cancel_count", INT),
+    ("events", JSON),
+    ("last_detected", DATETIME),
+])
+
+
+def candidates(since, cancel_limit):
+    """
+    관리자 화면용 이상 예매 후보 (CANDIDATE_LAYOUT 순서의 튜플 목록).
+    since 이후 abuse_log 기록 + 누적 취소 cancel_limit 회 이상 사용자
+    res_id 는 후보 사용자가 취소한 예매 중 대표 1건 (취소가 없으면 None)
+    """
+    cancel_counts = {}
+    events = {}
+    last_detected = {}
+    res_ids = {}
+
+    with routers.read_connection().cursor() as cursor:
+        cursor.execute(CANCEL_CANDIDATES_SQL, [cancel_limit])
+        for user_id, cancel_count in cursor.fetchall():
+            cancel_counts[user_id] = int(cancel_count)
+
+        cursor.execute(CANDIDATES_SQL, [since])
+        for user_id, match_id, event_type, count, last in cursor.fetchall():
+            events.setdefault(user_id, []).append(
+                {"match_id": match_id, "event_type": event_type, "count": count}
+            )
+            if last is not None and (user_id not in last_detected or last > last_detected[user_id]):
+                last_detected[user_id] = last
+
+        user_ids = list({**cancel_counts, **events})
+        if user_ids:
+            cursor.execute(
+                REPRESENTATIVE_RES_SQL.format(", ".join(["%s"] * len(user_ids))), user_ids
+            )
+            res_ids = dict(cursor.fetchall())
+
+    rows = [
+        (
+            user_id,
+            res_ids.get(user_id),
+            cancel_counts.get(user_id, 0),
+            events.get(user_id, []),
+            last_detected.get(user_id),
+        )
+        for user_id in {**cancel_counts, **events}
+    ]
+    rows.sort(key=lambda row: (row[2], len(row[3])), reverse=True)
+    return rows
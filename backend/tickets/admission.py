@@ -0,0 +1,249 @@
+"""
+대기열(가상 대기실) / 입장 제어
+
+- 인기 경기 오픈 시 좌석 조회/예매 전에 대기표를 발급받게 함
+- 경기마다 초당 WAITING_ROOM_RATE 명씩 입장 (GCRA)
+  → 새 대기표의 입장 시각 = max(지금, 직전 대기표 입장 시각 + 1/RATE)
+  한동안 조용했으면 최대 WAITING_ROOM_BURST 명까지는 바로 입장 (쌓이는 여유는 BURST 명이 상한)
+- 대기표는 서명된 토큰(입장 시각 포함)이라 저장소에는 경기별 발급 수/시작 시각/마지막 입장 시각만 둔다
+- 선점(hold) 전환 예매처럼 body 에 match_id 가 없으면 대기표의 경기로 검사하고
+  (hold 의 경기는 DB 를 읽어야 알 수 있으므로) 뷰가 hold 의 경기와 대조한다 (request.queue_match_id)
+- 입장 전 요청은 ORM 을 건드리기 전에 429 + 순번/예상 대기시간으로 돌려보냄
+
+저장소: WAITING_ROOM_STORE = "memory"(프로세스 단위) 또는 SQLite 파일 경로(노드 단위 공유)
+워커가 여러 개면 다른 워커가 발급한 대기표를 검증할 수 없으므로 SQLite 를 써야 한다 (tickets.E002)
+"""
+import json
+import math
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core import signing
+from django.http import JsonResponse
+
+SALT = "tickets.waiting-room"
+
+
+def _conf(name, default):
+    return getattr(settings, f"WAITING_ROOM_{name}", default)
+
+
+def _next_admit(last_admit, now, rate, burst):
+    """
+    GCRA: 직전 대기표 입장 시각(last_admit) 다음 차례의 입장 시각
+    now - BURST/RATE 보다 앞으로는 당기지 않으므로 바로 입장할 수 있는 여유는 BURST 명까지만 쌓인다
+    (반환값이 now 보다 작으면 바로 입장)
+    """
+    interval = 1.0 / rate
+    floor = now - burst * interval
+    if last_admit is None or last_admit < floor:
+        last_admit = floor
+    # 부동소수 오차가 쌓여 BURST 번째가 now 보다 살짝 늦어지지 않게 마이크로초 단위로
+    return round(last_admit + interval, 6)
+
+
+class MemoryStore:
+    """프로세스 메모리 저장소 (워커 1개일 때)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}  # match_id -> [issued, started_at, last_admit]
+
+    def issue(self, match_id, now, rate, burst):
+        """(순번, 시작 시각, 입장 시각)"""
+        with self._lock:
+            state = self._state.setdefault(match_id, [0, now, None])
+            state[0] += 1
+            state[2] = _next_admit(state[2], now, rate, burst)
+            return state[0], state[1], max(now, state[2])
+
+    def started_at(self, match_id):
+        with self._lock:
+            state = self._state.get(match_id)
+            return state[1] if state else None
+
+
+class SQLiteStore:
+    """같은 노드의 워커들이 공유하는 SQLite 저장소"""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS queue_state (
+                    match_id INTEGER PRIMARY KEY,
+                    issued INTEGER NOT NULL,
+                    started_at REAL NOT NULL,
+                    last_admit REAL
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(queue_state)")}
+            if "last_admit" not in columns:
+                # 예전 형식의 저장소 파일
+                conn.execute("ALTER TABLE queue_state ADD COLUMN last_admit REAL")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def issue(self, match_id, now, rate, burst):
+        """(순번, 시작 시각, 입장 시각)"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR IGNORE INTO queue_state (match_id, issued, started_at) VALUES (?, 0, ?)",
+                (match_id, now),
+            )
+            issued, started_at, last_admit = conn.execute(
+                "SELECT issued, started_at, last_admit FROM queue_state WHERE match_id = ?", (match_id,)
+            ).fetchone()
+            last_admit = _next_admit(last_admit, now, rate, burst)
+            conn.execute(
+                "UPDATE queue_state SET issued = ?, last_admit = ? WHERE match_id = ?",
+                (issued + 1, last_admit, match_id),
+            )
+            conn.execute("COMMIT")
+            return issued + 1, started_at, max(now, last_admit)
+        finally:
+            conn.close()
+
+    def started_at(self, match_id):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT started_at FROM queue_state WHERE match_id = ?", (match_id,)
+            ).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                target = _conf("STORE", "memory")
+                _store = MemoryStore() if target == "memory" else SQLiteStore(target)
+    return _store
+
+
+def is_enabled(match_id):
+    if not _conf("ENABLED", False):
+        return False
+    matches = _conf("MATCHES", None)
+    return matches is None or int(match_id) in matches
+
+
+def issue_ticket(match_id):
+    now = round(time.time(), 6)  # 입장 시각과 같은 단위
+    seq, started_at, admit_at = get_store().issue(
+        int(match_id), now, _conf("RATE", 20), _conf("BURST", 100)
+    )
+    token = signing.dumps({"m": int(match_id), "n": seq, "s": started_at, "a": admit_at}, salt=SALT)
+    return token, ticket_status(admit_at, now)
+
+
+def ticket_status(admit_at, now=None):
+    now = time.time() if now is None else now
+    rate = _conf("RATE", 20)
+    if admit_at <= now:
+        return {"admitted": True, "position": 0, "eta_seconds": 0}
+    return {
+        "admitted": False,
+        "position": max(1, math.ceil((admit_at - now) * rate)),
+        "eta_seconds": math.ceil(admit_at - now),
+    }
+
+
+def read_ticket(token):
+    """
+    대기표 검증. (match_id, admit_at) 또는 None
+    입장 후 WAITING_ROOM_PASS_TTL 초가 지난 대기표는 만료
+    """
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=SALT)
+        match_id, started_at, admit_at = data["m"], data["s"], data["a"]
+    except (signing.BadSignature, KeyError):
+        return None
+    # 대기열이 초기화됐으면(저장소 재시작 등) 예전 대기표는 무효
+    if get_store().started_at(match_id) != started_at:
+        return None
+    if time.time() > admit_at + _conf("PASS_TTL", 600):
+        return None
+    return match_id, admit_at
+
+
+def _request_match_id(request, kwargs):
+    """
+    (match_id, match_id 없이 hold_id 만 보낸 요청인지)
+    URL 의 match_id, 없으면 JSON body 의 match_id
+    """
+    match_id = kwargs.get("match_id")
+    held = False
+    if match_id is None and request.method == "POST" and request.content_type == "application/json":
+        try:
+            data = json.loads(request.body.decode("utf-8"))
+            match_id = data.get("match_id")
+            held = match_id is None and bool(data.get("hold_id"))
+        except (ValueError, AttributeError):
+            return None, False
+    try:
+        return int(match_id), False
+    except (TypeError, ValueError):
+        return None, held
+
+
+def _queue_required():
+    return JsonResponse({"error": "대기열 입장이 필요합니다.", "code": "QUEUE_REQUIRED"}, status=429)
+
+
+def admission_required(view):
+    """
+    대기열이 켜진 경기라면 입장한 대기표(X-Queue-Ticket 헤더 또는 ?queue_ticket=)가 있어야 통과
+    검사한 경기는 request.queue_match_id (hold 전환은 뷰가 hold 의 경기와 같은지 확인)
+    match_id 없이 hold_id 만 보낸 요청은 대기표가 있어야 함 (없으면 match_id 를 같이 보내야 함)
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _conf("ENABLED", False):
+            return view(request, *args, **kwargs)
+        token = request.headers.get("X-Queue-Ticket") or request.GET.get("queue_ticket")
+        ticket = None
+        match_id, held = _request_match_id(request, kwargs)
+        if held:
+            ticket = read_ticket(token)
+            if ticket is None:
+                return _queue_required()
+            match_id = ticket[0]
+        request.queue_match_id = match_id
+        if match_id is None or not is_enabled(match_id):
+            return view(request, *args, **kwargs)
+
+        ticket = ticket or read_ticket(token)
+        if ticket is None or ticket[0] != match_id:
+            return _queue_required()
+
+        status = ticket_status(ticket[1])
+        if not status["admitted"]:
+            response = JsonResponse(
+                {"error": "아직 입장 순서가 아닙니다.", "code": "NOT_ADMITTED", **status},
+                status=429,
+            )
+            response["Retry-After"] = str(status["eta_seconds"])
+            return response
+
+        return view(request, *args, **kwargs)
+
+    return wrapper
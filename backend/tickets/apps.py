@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class TicketsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tickets"
+
+    def ready(self):
+        # checks 는 import 하면 시스템 체크(tickets.E001)가 등록됨
+        from . import checks, matchlist  # noqa: F401
+        from .models import Match, Team
+
+        # 경기/팀 정보가 바뀌면 경기 목록 캐시 무효화
+        for model in (Match, Team):
+            post_save.connect(matchlist.invalidate, sender=model, dispatch_uid=f"match_list:{model.__name__}:save")
+            post_delete.connect(matchlist.invalidate, sender=model, dispatch_uid=f"match_list:{model.__name__}:delete")
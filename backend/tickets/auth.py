@@ -0,0 +1,131 @@
+"""
+서명된 접근 토큰 (서버에 세션을 저장하지 않음)
+
+- 로그인하면 {"u": user_id, "r": role} 을 서명한 토큰을 발급 (AUTH_TOKEN_MAX_AGE 초 유효)
+- TokenAuthMiddleware 가 "Authorization: Bearer <토큰>" 을 검증해서
+  request.auth_user_id / request.auth_role 을 채운다 (DB 조회 없음)
+  토큰이 없으면 None, 잘못됐거나 만료됐으면 request.auth_error 에 사유
+- 사용자 정보(이름/이메일/전화번호)가 필요하면 get_user 로 프로세스 LRU 캐시에서 꺼냄
+  (로그인 때 채워 두므로 보통은 DB 를 읽지 않음, AUTH_USER_CACHE_TTL 초 뒤 다시 읽음)
+
+기존 클라이언트 호환: 토큰 없이 user_id 를 직접 보내는 요청도 받는다.
+AUTH_REQUIRE_TOKEN = True 로 두면 사용자별 API 는 토큰이 있어야 한다 (resolve_user_id).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core import signing
+from django.http import JsonResponse
+
+from .models import User
+
+SALT = "tickets.access-token"
+
+
+def _conf(name, default):
+    return getattr(settings, f"AUTH_{name}", default)
+
+
+def issue_token(user):
+    """(토큰, 유효 시간(초))"""
+    token = signing.dumps({"u": user.user_id, "r": user.role}, salt=SALT)
+    return token, _conf("TOKEN_MAX_AGE", 86400)
+
+
+def read_token(token):
+    """(user_id, role). 잘못됐거나 만료됐으면 signing.BadSignature"""
+    data = signing.loads(token, salt=SALT, max_age=_conf("TOKEN_MAX_AGE", 86400))
+    return int(data["u"]), data["r"]
+
+
+# ── 사용자 캐시 ─────────────────────────────────────────────────────────────
+
+class UserCache:
+    """user_id -> 사용자 정보 dict (LRU + TTL, 프로세스 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # user_id -> (저장 시각, dict)
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._items.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > _conf("USER_CACHE_TTL", 300):
+                del self._items[user_id]
+                return None
+            self._items.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user):
+        info = {
+            "user_id": user.user_id,
+            "name": user.name,
+            "email": user.email,
+            "phone": user.phone,
+            "role": user.role,
+        }
+        with self._lock:
+            self._items[user.user_id] = (time.monotonic(), info)
+            self._items.move_to_end(user.user_id)
+            while len(self._items) > _conf("USER_CACHE_SIZE", 10000):
+                self._items.popitem(last=False)
+        return info
+
+
+users = UserCache()
+
+
+def get_user(user_id):
+    """사용자 정보 dict. 캐시에 없으면 DB 에서 읽어 채움, 없는 사용자면 None"""
+    info = users.get(user_id)
+    if info is None:
+        try:
+            info = users.put(User.objects.get(pk=user_id))
+        except User.DoesNotExist:
+            return None
+    return info
+
+
+# ── 요청 처리 ───────────────────────────────────────────────────────────────
+
+class TokenAuthMiddleware:
+    """settings.MIDDLEWARE 에 등록"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.auth_user_id = None
+        request.auth_role = None
+        request.auth_error = None
+
+        header = request.headers.get("Authorization", "")
+        if header.startswith("Bearer "):
+            try:
+                request.auth_user_id, request.auth_role = read_token(header[7:].strip())
+            except signing.SignatureExpired:
+                request.auth_error = "토큰이 만료되었습니다. 다시 로그인해주세요."
+            except (signing.BadSignature, KeyError, TypeError, ValueError):
+                request.auth_error = "유효하지 않은 토큰입니다."
+        return self.get_response(request)
+
+
+def resolve_user_id(request, claimed=None):
+    """
+    요청한 사용자 (user_id, 오류 응답)
+    - 토큰이 있으면 토큰의 사용자. claimed(body/query 의 user_id)가 다르면 403
+    - 토큰이 없으면 claimed 를 그대로 씀 (AUTH_REQUIRE_TOKEN 이면 401)
+    """
+    if getattr(request, "auth_error", None):
+        return None, JsonResponse({"error": request.auth_error, "code": "INVALID_TOKEN"}, status=401)
+    if getattr(request, "auth_user_id", None) is not None:
+        if claimed not in (None, "") and str(claimed) != str(request.auth_user_id):
+            return None, JsonResponse({"error": "다른 사용자의 요청입니다.", "code": "FORBIDDEN"}, status=403)
+        return request.auth_user_id, None
+    if _conf("REQUIRE_TOKEN", False):
+        return None, JsonResponse({"error": "로그인이 필요합니다.", "code": "LOGIN_REQUIRED"}, status=401)
+    return claimed, None
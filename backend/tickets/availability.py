@@ -0,0 +1,250 @@
+"""
+잔여 좌석 요약 (seat_availability 증분 갱신)
+
+seat_availability 테이블(migration 0004)에 (경기, 등급, 블록) 별
+전체/빈 좌석 수와 가격 범위를 두고, 좌석이 잡히거나 풀릴 때 변화량만 반영한다.
+경기 목록/좌석 화면은 seats 를 세지 않고 이 테이블 한 번만 읽는다.
+
+- seatmap 이 커밋된 좌석 변경마다 record 를 호출
+- seat_id → (등급, 블록) 은 경기별로 한 번 읽어 프로세스 메모리에 둠 (좌석 배치는 거의 안 바뀜)
+- 변화량은 (경기, 등급, 블록) 별로 합산해서 SEAT_AVAILABILITY_FLUSH_INTERVAL 초마다 UPDATE
+  (SEAT_AVAILABILITY_ASYNC = False 면 바로 UPDATE, 버퍼와 세대는 match_stats 와 같은 tickets.deltas)
+- 정합성 확인/복구: python manage.py rebuild_seat_availability
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from . import deltas, routers
+from .models import Seat
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["match_id", "grade", "block", "total_seats", "free_seats", "min_price", "max_price"]
+
+# seats 에서 새로 집계 (rebuild 용)
+AGGREGATE_SQL = """
+    SELECT
+        match_id,
+        grade,
+        block,
+        COUNT(*),
+        SUM(CASE WHEN is_reserved = 0 THEN 1 ELSE 0 END),
+        MIN(price),
+        MAX(price)
+    FROM seats
+"""
+
+APPLY_SQL = """
+    UPDATE seat_availability
+    SET free_seats = free_seats + %s
+    WHERE match_id = %s AND grade = %s AND block = %s
+"""
+
+
+def _conf(name, default):
+    return getattr(settings, f"SEAT_AVAILABILITY_{name}", default)
+
+
+# ── seat_id → (grade, block) ───────────────────────────────────────────────
+
+_seat_keys = {}  # match_id -> {seat_id: (grade, block)}
+_seat_keys_lock = threading.Lock()
+
+
+def _seat_key(match_id, seat_id):
+    with _seat_keys_lock:
+        keys = _seat_keys.get(match_id)
+    if keys is None or seat_id not in keys:
+        # 처음이거나 새로 추가된 좌석
+        keys = {
+            sid: (grade, block)
+            for sid, grade, block in Seat.objects.filter(match_id=match_id).values_list(
+                "seat_id", "grade", "block"
+            )
+        }
+        with _seat_keys_lock:
+            _seat_keys[match_id] = keys
+    return keys.get(seat_id)
+
+
+# ── 증분 반영 ───────────────────────────────────────────────────────────────
+
+_epochs = deltas.Epochs("seat_availability")
+epochs = _epochs.get
+
+
+class AvailabilityBuffer(deltas.DeltaBuffer):
+    """(match_id, grade, block) -> [빈 좌석 변화량, epoch]"""
+    name = "seat-availability-writer"
+    logger = logger
+
+    def __init__(self):
+        super().__init__(_epochs)
+
+    @property
+    def flush_interval(self):
+        return _conf("FLUSH_INTERVAL", 1.0)
+
+    def match_id(self, key):
+        return key[0]
+
+    def apply(self, key, delta):
+        return apply_delta(key, delta)
+
+
+def apply_delta(key, delta):
+    """변화량 반영. 요약 행이 없어서 경기를 새로 집계했으면 True"""
+    match_id, grade, block = key
+    with connection.cursor() as cursor:
+        cursor.execute(APPLY_SQL, [delta, match_id, grade, block])
+        updated = cursor.rowcount
+    if not updated:
+        # 요약 행이 아직 없는 경기/구역은 seats 에서 새로 집계
+        # (이 변화량도 집계에 들어 있고, 버퍼에 남은 같은 경기 변화량은 세대가 바뀌어 버려짐)
+        rebuild([match_id])
+        return True
+    return False
+
+
+buffer = AvailabilityBuffer()
+atexit.register(buffer.flush)
+
+
+def record(match_id, seat_id, is_reserved):
+    """
+    커밋된 좌석 상태 변경 반영 (seatmap 에서 호출)
+    is_reserved=True 면 빈 좌석 -1, False 면 +1
+    """
+    try:
+        key = _seat_key(match_id, seat_id)
+        if key is None:
+            return
+        key = (match_id, *key)
+        delta = -1 if is_reserved else 1
+        if _conf("ASYNC", True):
+            buffer.add(key, delta)
+        else:
+            apply_delta(key, delta)
+    except DatabaseError:
+        logger.exception("seat_availability 갱신 실패 (match_id=%s, seat_id=%s)", match_id, seat_id)
+
+
+# ── 조회 ────────────────────────────────────────────────────────────────────
+
+def _group(total, free, min_price, max_price):
+    return {"total": total, "free": free, "min_price": min_price, "max_price": max_price}
+
+
+def _merge(group, total, free, min_price, max_price):
+    group["total"] += total
+    group["free"] += free
+    group["min_price"] = min(group["min_price"], min_price)
+    group["max_price"] = max(group["max_price"], max_price)
+
+
+def summary(match_ids=None):
+    """
+    [{"match_id", "total", "free", "min_price", "max_price",
+      "grades": [{"grade", ..., "blocks": [{"block", ...}]}]}, ...]
+    """
+    sql = "SELECT %s FROM seat_availability" % ", ".join(COLUMNS)
+    params = []
+    if match_ids:
+        sql += " WHERE match_id IN (%s)" % ", ".join(["%s"] * len(match_ids))
+        params = list(match_ids)
+    sql += " ORDER BY match_id, grade, block"
+
+    with routers.read_connection().cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    matches = {}
+    for match_id, grade, block, total, free, min_price, max_price in rows:
+        values = (int(total), int(free), min_price, max_price)
+        match = matches.get(match_id)
+        if match is None:
+            match = matches[match_id] = {"match_id": match_id, **_group(*values), "grades": {}}
+        else:
+            _merge(match, *values)
+        grade_item = match["grades"].get(grade)
+        if grade_item is None:
+            grade_item = match["grades"][grade] = {"grade": grade, **_group(*values), "blocks": []}
+        else:
+            _merge(grade_item, *values)
+        grade_item["blocks"].append({"block": block, **_group(*values)})
+
+    result = []
+    for match in matches.values():
+        match["grades"] = list(match["grades"].values())
+        result.append(match)
+    return result
+
+
+# ── 재집계 ──────────────────────────────────────────────────────────────────
+
+def compute(match_ids=None):
+    """seats 에서 새로 집계 {(match_id, grade, block): row}"""
+    sql = AGGREGATE_SQL
+    params = []
+    if match_ids:
+        sql += " WHERE match_id IN (%s)" % ", ".join(["%s"] * len(match_ids))
+        params = list(match_ids)
+    sql += " GROUP BY match_id, grade, block"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {tuple(row[:3]): row for row in cursor.fetchall()}
+
+
+def current(match_ids=None):
+    """seat_availability 의 현재 값 {(match_id, grade, block): row}"""
+    sql = "SELECT %s FROM seat_availability" % ", ".join(COLUMNS)
+    params = []
+    if match_ids:
+        sql += " WHERE match_id IN (%s)" % ", ".join(["%s"] * len(match_ids))
+        params = list(match_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {tuple(row[:3]): row for row in cursor.fetchall()}
+
+
+def _mismatched(fresh, old):
+    keys = set(fresh) | set(old)
+    return sorted({k[0] for k in keys if tuple(fresh.get(k) or ()) != tuple(old.get(k) or ())})
+
+
+def check(match_ids=None):
+    """증분 값과 새 집계가 다른 match_id 목록 (테이블은 그대로)"""
+    return _mismatched(compute(match_ids), current(match_ids))
+
+
+def rebuild(match_ids=None):
+    """
+    seat_availability 를 seats 에서 다시 집계해서 덮어씀.
+    반환: 기존 값과 달랐던 match_id 목록
+    집계 전에 세대를 올려서 이미 커밋돼 버퍼에 남은 변화량이 다시 더해지지 않게 한다.
+    """
+    _epochs.bump(match_ids)
+    with transaction.atomic():
+        fresh = compute(match_ids)
+        mismatched = _mismatched(fresh, current(match_ids))
+
+        with connection.cursor() as cursor:
+            if match_ids:
+                cursor.execute(
+                    "DELETE FROM seat_availability WHERE match_id IN (%s)"
+                    % ", ".join(["%s"] * len(match_ids)),
+                    list(match_ids),
+                )
+            else:
+                cursor.execute("DELETE FROM seat_availability")
+            if fresh:
+                cursor.executemany(
+                    "INSERT INTO seat_availability (%s) VALUES (%s)"
+                    % (", ".join(COLUMNS), ", ".join(["%s"] * len(COLUMNS))),
+                    list(fresh.values()),
+                )
+    return mismatched
@@ -0,0 +1,645 @@
+"""
+티켓 오픈(ticket rush) 부하 측정
+
+python manage.py bench_ticket_rush --settings=config.settings_bench
+
+1. 빈 DB 에 운영과 같은 테이블 + 트리거(같은 규칙)를 만들고 migrate
+2. 경기/좌석(구장 규모)/사용자 데이터 생성
+3. 가상 사용자 스레드들이 좌석 조회 → 예매 → (일부) 취소를 반복
+4. API 별 처리량, p50/p95/p99 지연, 락 대기/데드락 수, 초과 판매 여부 출력
+"""
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.core.signals import got_request_exception
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.utils import timezone
+
+from . import abuse, availability, requestlog, reservations, stats
+
+# ── 스키마 (운영 DB 와 같은 테이블 / 트리거 규칙) ────────────────────────────
+# 운영 트리거처럼 seats.is_reserved = 1 인 좌석의 예매 INSERT 는 거부하고,
+# INSERT 후 트리거가 is_reserved = 1 로 바꾼다 (취소 시 0)
+
+SQLITE_SCHEMA = [
+    "PRAGMA journal_mode = WAL",
+    """
+    CREATE TABLE users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(50) NOT NULL,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        phone VARCHAR(20),
+        role VARCHAR(10) NOT NULL DEFAULT 'user'
+    )
+    """,
+    """
+    CREATE TABLE teams (
+        team_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        team_name VARCHAR(100) NOT NULL UNIQUE,
+        league VARCHAR(50),
+        city VARCHAR(50)
+    )
+    """,
+    """
+    CREATE TABLE matches (
+        match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        home_team_id INT NOT NULL REFERENCES teams (team_id),
+        away_team_id INT NOT NULL REFERENCES teams (team_id),
+        match_date DATETIME NOT NULL,
+        stadium VARCHAR(100) NOT NULL,
+        total_seats INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE seats (
+        seat_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        match_id INT NOT NULL REFERENCES matches (match_id),
+        block VARCHAR(10) NOT NULL,
+        row_no VARCHAR(10) NOT NULL,
+        seat_number VARCHAR(10) NOT NULL,
+        grade VARCHAR(20) NOT NULL,
+        price INT NOT NULL,
+        is_reserved BOOL NOT NULL DEFAULT 0,
+        UNIQUE (match_id, block, row_no, seat_number)
+    )
+    """,
+    """
+    CREATE TABLE reservations (
+        res_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INT NOT NULL REFERENCES users (user_id),
+        match_id INT NOT NULL REFERENCES matches (match_id),
+        seat_id INT NOT NULL REFERENCES seats (seat_id),
+        res_date DATETIME NOT NULL,
+        status VARCHAR(10) NOT NULL
+    )
+    """,
+    "CREATE INDEX idx_res_user_match ON reservations (user_id, match_id, status)",
+    "CREATE INDEX idx_res_seat ON reservations (seat_id, status)",
+    """
+    CREATE TABLE payments (
+        pay_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        res_id INT NOT NULL UNIQUE REFERENCES reservations (res_id),
+        amount INT NOT NULL,
+        method VARCHAR(20) NOT NULL,
+        pay_date DATETIME NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE cancel_log (
+        cancel_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        res_id INT NOT NULL,
+        user_id INT NOT NULL,
+        cancel_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        reason VARCHAR(255)
+    )
+    """,
+    """
+    CREATE TABLE abuse_log (
+        abuse_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INT NOT NULL,
+        match_id INT NOT NULL,
+        event_type VARCHAR(50) NOT NULL,
+        detected_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE request_log (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INT,
+        match_id INT,
+        seat_id INT,
+        action VARCHAR(50),
+        success SMALLINT,
+        fail_reason VARCHAR(255),
+        ip VARCHAR(45),
+        user_agent VARCHAR(255),
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TRIGGER trg_reservation_before_insert BEFORE INSERT ON reservations
+    BEGIN
+        SELECT RAISE(ABORT, '예약 경기와 좌석의 경기가 일치하지 않습니다.')
+        WHERE (SELECT match_id FROM seats WHERE seat_id = NEW.seat_id) != NEW.match_id;
+        SELECT RAISE(ABORT, '이미 예약된 좌석입니다.')
+        WHERE (SELECT is_reserved FROM seats WHERE seat_id = NEW.seat_id) = 1;
+        SELECT RAISE(ABORT, '한 경기당 최대 4좌석까지 예매 가능합니다.')
+        WHERE (SELECT COUNT(*) FROM reservations
+               WHERE user_id = NEW.user_id AND match_id = NEW.match_id AND status = 'active') >= 4;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_reservation_after_insert AFTER INSERT ON reservations
+    BEGIN
+        UPDATE seats SET is_reserved = 1 WHERE seat_id = NEW.seat_id;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_reservation_after_update_cancel AFTER UPDATE OF status ON reservations
+    WHEN NEW.status = 'cancelled' AND OLD.status = 'active'
+    BEGIN
+        INSERT INTO cancel_log (res_id, user_id, reason) VALUES (NEW.res_id, NEW.user_id, 'user cancel');
+        UPDATE seats SET is_reserved = 0 WHERE seat_id = NEW.seat_id;
+    END
+    """,
+]
+
+MYSQL_SCHEMA = [
+    """
+    CREATE TABLE users (
+        user_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(50) NOT NULL,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        phone VARCHAR(20),
+        role VARCHAR(10) NOT NULL DEFAULT 'user'
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE teams (
+        team_id INT AUTO_INCREMENT PRIMARY KEY,
+        team_name VARCHAR(100) NOT NULL UNIQUE,
+        league VARCHAR(50),
+        city VARCHAR(50)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE matches (
+        match_id INT AUTO_INCREMENT PRIMARY KEY,
+        home_team_id INT NOT NULL,
+        away_team_id INT NOT NULL,
+        match_date DATETIME NOT NULL,
+        stadium VARCHAR(100) NOT NULL,
+        total_seats INT NOT NULL,
+        FOREIGN KEY (home_team_id) REFERENCES teams (team_id),
+        FOREIGN KEY (away_team_id) REFERENCES teams (team_id)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE seats (
+        seat_id INT AUTO_INCREMENT PRIMARY KEY,
+        match_id INT NOT NULL,
+        block VARCHAR(10) NOT NULL,
+        row_no VARCHAR(10) NOT NULL,
+        seat_number VARCHAR(10) NOT NULL,
+        grade VARCHAR(20) NOT NULL,
+        price INT NOT NULL,
+        is_reserved TINYINT(1) NOT NULL DEFAULT 0,
+        UNIQUE KEY uq_seat (match_id, block, row_no, seat_number),
+        FOREIGN KEY (match_id) REFERENCES matches (match_id)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE reservations (
+        res_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        match_id INT NOT NULL,
+        seat_id INT NOT NULL,
+        res_date DATETIME NOT NULL,
+        status VARCHAR(10) NOT NULL,
+        KEY idx_res_user_match (user_id, match_id, status),
+        KEY idx_res_seat (seat_id, status),
+        FOREIGN KEY (user_id) REFERENCES users (user_id),
+        FOREIGN KEY (match_id) REFERENCES matches (match_id),
+        FOREIGN KEY (seat_id) REFERENCES seats (seat_id)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE payments (
+        pay_id INT AUTO_INCREMENT PRIMARY KEY,
+        res_id INT NOT NULL UNIQUE,
+        amount INT NOT NULL,
+        method VARCHAR(20) NOT NULL,
+        pay_date DATETIME NOT NULL,
+        FOREIGN KEY (res_id) REFERENCES reservations (res_id)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE cancel_log (
+        cancel_id INT AUTO_INCREMENT PRIMARY KEY,
+        res_id INT NOT NULL,
+        user_id INT NOT NULL,
+        cancel_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        reason VARCHAR(255)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE abuse_log (
+        abuse_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        match_id INT NOT NULL,
+        event_type VARCHAR(50) NOT NULL,
+        detected_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE request_log (
+        log_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT,
+        match_id INT,
+        seat_id INT,
+        action VARCHAR(50),
+        success TINYINT(1),
+        fail_reason VARCHAR(255),
+        ip VARCHAR(45),
+        user_agent VARCHAR(255),
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TRIGGER trg_reservation_before_insert BEFORE INSERT ON reservations
+    FOR EACH ROW
+    BEGIN
+        IF (SELECT match_id FROM seats WHERE seat_id = NEW.seat_id) <> NEW.match_id THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = '예약 경기와 좌석의 경기가 일치하지 않습니다.';
+        END IF;
+        IF (SELECT is_reserved FROM seats WHERE seat_id = NEW.seat_id) = 1 THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = '이미 예약된 좌석입니다.';
+        END IF;
+        IF (SELECT COUNT(*) FROM reservations
+            WHERE user_id = NEW.user_id AND match_id = NEW.match_id AND status = 'active') >= 4 THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = '한 경기당 최대 4좌석까지 예매 가능합니다.';
+        END IF;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_reservation_after_insert AFTER INSERT ON reservations
+    FOR EACH ROW
+    UPDATE seats SET is_reserved = 1 WHERE seat_id = NEW.seat_id
+    """,
+    """
+    CREATE TRIGGER trg_reservation_after_update_cancel AFTER UPDATE ON reservations
+    FOR EACH ROW
+    BEGIN
+        IF NEW.status = 'cancelled' AND OLD.status = 'active' THEN
+            INSERT INTO cancel_log (res_id, user_id, reason) VALUES (NEW.res_id, NEW.user_id, 'user cancel');
+            UPDATE seats SET is_reserved = 0 WHERE seat_id = NEW.seat_id;
+        END IF;
+    END
+    """,
+]
+
+# 블록 앞쪽부터 등급 배정 (비율, 등급, 가격)
+GRADES = [
+    (0.05, "VIP", 120000),
+    (0.20, "R", 70000),
+    (0.35, "S", 50000),
+    (0.40, "A", 30000),
+]
+ROWS_PER_BLOCK = 20
+SEATS_PER_ROW = 25
+
+STADIUMS = ["잠실", "고척", "문학", "사직", "대구", "광주", "수원", "창원", "대전"]
+
+
+def has_schema():
+    return "matches" in connection.introspection.table_names()
+
+
+def create_base_tables(conn=connection):
+    """운영 DB 에만 있는 테이블(managed=False)과 트리거 생성 (테스트 DB 에서도 사용)"""
+    statements = MYSQL_SCHEMA if conn.vendor == "mysql" else SQLITE_SCHEMA
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def build_schema():
+    """기본 테이블/트리거 생성 후 migrate (seat_holds, match_stats, cancel_counters, seat_availability)"""
+    create_base_tables()
+    call_command("migrate", verbosity=0)
+
+
+def _grade(block_index, block_count):
+    position = block_index / block_count
+    total = 0
+    for ratio, grade, price in GRADES:
+        total += ratio
+        if position < total:
+            return grade, price
+    return GRADES[-1][1], GRADES[-1][2]
+
+
+def seed(match_count, seats_per_match, user_count, chunk_size=5000):
+    """경기/좌석/사용자 생성. 경기 id 목록 반환"""
+    per_block = ROWS_PER_BLOCK * SEATS_PER_ROW
+    block_count = math.ceil(seats_per_match / per_block)
+    match_date = timezone.now() + timedelta(days=7)
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO teams (team_name, league, city) VALUES (%s, %s, %s)",
+            [("홈팀", "KBO", "서울"), ("원정팀", "KBO", "부산")],
+        )
+        cursor.execute("SELECT MIN(team_id), MAX(team_id) FROM teams")
+        home_id, away_id = cursor.fetchone()
+
+        match_ids = []
+        for i in range(match_count):
+            cursor.execute(
+                """
+                INSERT INTO matches (home_team_id, away_team_id, match_date, stadium, total_seats)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                [home_id, away_id, match_date + timedelta(days=i),
+                 STADIUMS[i % len(STADIUMS)], seats_per_match],
+            )
+            match_ids.append(cursor.lastrowid)
+
+        for match_id in match_ids:
+            rows = []
+            for n in range(seats_per_match):
+                block_index, rest = divmod(n, per_block)
+                row_no, seat_number = divmod(rest, SEATS_PER_ROW)
+                grade, price = _grade(block_index, block_count)
+                rows.append((match_id, f"{block_index + 1:03d}", str(row_no + 1),
+                             str(seat_number + 1), grade, price))
+                if len(rows) >= chunk_size:
+                    _insert_seats(cursor, rows)
+                    rows = []
+            _insert_seats(cursor, rows)
+
+        users = [(f"bench{i}", f"bench{i}@example.com", "user") for i in range(user_count)]
+        for start in range(0, len(users), chunk_size):
+            cursor.executemany(
+                "INSERT INTO users (name, email, role) VALUES (%s, %s, %s)",
+                users[start:start + chunk_size],
+            )
+
+    stats.rebuild(match_ids)
+    availability.rebuild(match_ids)
+    return match_ids
+
+
+def _insert_seats(cursor, rows):
+    if rows:
+        cursor.executemany(
+            """
+            INSERT INTO seats (match_id, block, row_no, seat_number, grade, price, is_reserved)
+            VALUES (%s, %s, %s, %s, %s, %s, 0)
+            """,
+            rows,
+        )
+
+
+def load_targets():
+    """기존 벤치마크 DB 의 경기 id / 사용자 id 목록"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT match_id FROM matches ORDER BY match_id")
+        match_ids = [r[0] for r in cursor.fetchall()]
+        cursor.execute("SELECT user_id FROM users WHERE role = 'user'")
+        user_ids = [r[0] for r in cursor.fetchall()]
+    return match_ids, user_ids
+
+
+# ── 부하 발생 ────────────────────────────────────────────────────────────────
+
+def _is_lock_error(exc):
+    text = str(exc).lower()
+    return reservations.is_retryable(exc) or "locked" in text or "deadlock" in text
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)   # api -> [ms, ...]
+        self.statuses = defaultdict(Counter)  # api -> {status: n}
+        self.codes = Counter()               # 실패 code (SEAT_TAKEN 등)
+        self.lock_errors = 0                 # DEADLOCK 응답 + 처리되지 않은 락 예외
+        self.exceptions = Counter()          # 500 이 된 예외 종류
+
+    def add(self, api, ms, status, code=None):
+        with self._lock:
+            self.latencies[api].append(ms)
+            self.statuses[api][status] += 1
+            if code:
+                self.codes[code] += 1
+                if code == reservations.DEADLOCK:
+                    self.lock_errors += 1
+
+    def on_exception(self, sender, **kwargs):
+        """got_request_exception 수신 (예외가 난 요청 스레드에서 호출됨)"""
+        exc = sys.exc_info()[1]
+        if exc is None:
+            return
+        with self._lock:
+            self.exceptions[type(exc).__name__] += 1
+            if _is_lock_error(exc):
+                self.lock_errors += 1
+
+
+class VirtualUser(threading.Thread):
+    """좌석 조회 → 빈 좌석 예매 → cancel_ratio 확률로 취소 를 반복"""
+
+    def __init__(self, recorder, deadline, match_ids, user_ids, hot_ratio, cancel_ratio, seed):
+        super().__init__(daemon=True)
+        self.recorder = recorder
+        self.deadline = deadline
+        self.match_ids = match_ids
+        self.user_ids = user_ids
+        self.hot_ratio = hot_ratio
+        self.cancel_ratio = cancel_ratio
+        self.random = random.Random(seed)
+        # 예외는 500 응답으로 받고, 원인은 Recorder.on_exception 에서 집계
+        self.client = Client(raise_request_exception=False)
+        self.views = {}  # match_id -> [version, {seat_id: is_reserved}]
+
+    def _call(self, api, method, url, body=None):
+        start = time.perf_counter()
+        if method == "GET":
+            response = self.client.get(url)
+        else:
+            response = self.client.post(url, json.dumps(body or {}), content_type="application/json")
+        ms = (time.perf_counter() - start) * 1000
+        if response.status_code >= 500 and response.get("Content-Type") != "application/json":
+            self.recorder.add(api, ms, response.status_code)
+            return None
+        data = json.loads(response.content) if response.content else {}
+        code = data.get("code") if isinstance(data, dict) else None
+        self.recorder.add(api, ms, response.status_code, code)
+        return response, data
+
+    def _pick_match(self):
+        if len(self.match_ids) == 1 or self.random.random() < self.hot_ratio:
+            return self.match_ids[0]
+        return self.random.choice(self.match_ids[1:])
+
+    def _refresh(self, match_id):
+        view = self.views.get(match_id)
+        url = f"/api/matches/{match_id}/seats/"
+        if view is not None:
+            url += f"?since={view[0]}"
+        result = self._call("match_seat_list", "GET", url)
+        if result is None or result[0].status_code != 200:
+            return None
+        response, data = result
+        if isinstance(data, list):
+            # 첫 조회는 전체 목록, 버전은 헤더로 받음
+            view = [int(response["X-Seat-Version"]), {s["seat_id"]: s["is_reserved"] for s in data}]
+        elif data.get("full"):
+            view = [data["version"], {s["seat_id"]: s["is_reserved"] for s in data["seats"]}]
+        else:
+            view[0] = data["version"]
+            for change in data["changes"]:
+                view[1][change["seat_id"]] = change["is_reserved"]
+        self.views[match_id] = view
+        return view
+
+    def run(self):
+        try:
+            while time.monotonic() < self.deadline:
+                self._step()
+        finally:
+            close_old_connections()
+
+    def _step(self):
+        match_id = self._pick_match()
+        view = self._refresh(match_id)
+        if view is None:
+            return
+        free = [seat_id for seat_id, reserved in view[1].items() if not reserved]
+        if not free:
+            return
+
+        seat_id = self.random.choice(free)
+        user_id = self.random.choice(self.user_ids)
+        result = self._call("create_reservation", "POST", "/api/reservations/", {
+            "user_id": user_id,
+            "match_id": match_id,
+            "seat_id": seat_id,
+            "amount": 50000,
+            "method": "card",
+        })
+        if result is None:
+            return
+        response, data = result
+        view[1][seat_id] = True  # 성공이든 이미 예약이든 이 좌석은 다시 고르지 않음
+        if response.status_code == 201 and self.random.random() < self.cancel_ratio:
+            self._call("cancel_reservation", "POST", f"/api/reservations/{data['reservation_id']}/cancel/")
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def run_load(match_ids, user_ids, concurrency, duration, hot_ratio=0.8, cancel_ratio=0.1, seed=0):
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+    workers = [
+        VirtualUser(recorder, deadline, match_ids, user_ids, hot_ratio, cancel_ratio, seed + i)
+        for i in range(concurrency)
+    ]
+    # 처리되지 않은 예외는 결과에 집계하므로 요청별 traceback 로그는 끔
+    request_logger = logging.getLogger("django.request")
+    level = request_logger.level
+    request_logger.setLevel(logging.CRITICAL)
+    got_request_exception.connect(recorder.on_exception)
+
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+    request_logger.setLevel(level)
+    got_request_exception.disconnect(recorder.on_exception)
+
+    # 비동기로 쌓아 둔 통계/로그를 모두 반영한 뒤 검사
+    stats.buffer.flush()
+    availability.buffer.flush()
+    requestlog.writer.drain()
+    abuse.detector.drain()
+    return recorder, elapsed
+
+
+# ── 결과 / 정합성 검사 ───────────────────────────────────────────────────────
+
+CONSISTENCY_CHECKS = {
+    # 같은 좌석에 active 예매가 2건 이상 (초과 판매)
+    "double_booked": """
+        SELECT COUNT(*) FROM (
+            SELECT seat_id FROM reservations WHERE status = 'active'
+            GROUP BY seat_id HAVING COUNT(*) > 1
+        ) t
+    """,
+    # 한 경기 4좌석 초과
+    "over_seat_limit": """
+        SELECT COUNT(*) FROM (
+            SELECT user_id, match_id FROM reservations WHERE status = 'active'
+            GROUP BY user_id, match_id HAVING COUNT(*) > 4
+        ) t
+    """,
+    # 예매 경기와 좌석 경기가 다름
+    "match_mismatch": """
+        SELECT COUNT(*) FROM reservations r JOIN seats s ON s.seat_id = r.seat_id
+        WHERE r.match_id <> s.match_id
+    """,
+    # active 예매인데 좌석이 비어 있음
+    "reserved_flag_missing": """
+        SELECT COUNT(*) FROM reservations r JOIN seats s ON s.seat_id = r.seat_id
+        WHERE r.status = 'active' AND s.is_reserved = 0
+    """,
+    # 좌석은 잡혀 있는데 active 예매도 hold 도 없음
+    "orphan_reserved_seat": """
+        SELECT COUNT(*) FROM seats s
+        WHERE s.is_reserved = 1
+          AND NOT EXISTS (SELECT 1 FROM reservations r WHERE r.seat_id = s.seat_id AND r.status = 'active')
+          AND NOT EXISTS (SELECT 1 FROM seat_holds h WHERE h.seat_id = s.seat_id)
+    """,
+    # 결제 없는 active 예매
+    "missing_payment": """
+        SELECT COUNT(*) FROM reservations r
+        WHERE r.status = 'active' AND NOT EXISTS (SELECT 1 FROM payments p WHERE p.res_id = r.res_id)
+    """,
+}
+
+
+def check_consistency(match_ids):
+    """{검사 이름: 위반 건수}. match_stats / seat_availability 는 새 집계와 다른 경기 수"""
+    result = {}
+    with connection.cursor() as cursor:
+        for name, sql in CONSISTENCY_CHECKS.items():
+            cursor.execute(sql)
+            result[name] = cursor.fetchone()[0]
+    result["match_stats_mismatch"] = len(stats.check(match_ids))
+    result["seat_availability_mismatch"] = len(availability.check(match_ids))
+    return result
+
+
+def summarize(recorder, elapsed, consistency):
+    apis = {}
+    total = 0
+    for api, values in sorted(recorder.latencies.items()):
+        total += len(values)
+        apis[api] = {
+            "requests": len(values),
+            "rps": round(len(values) / elapsed, 1) if elapsed else 0,
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(max(values), 2),
+            "status": {str(k): v for k, v in sorted(recorder.statuses[api].items(), key=str)},
+        }
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "rps": round(total / elapsed, 1) if elapsed else 0,
+        "apis": apis,
+        "codes": dict(recorder.codes),
+        "lock_errors": recorder.lock_errors,
+        "exceptions": dict(recorder.exceptions),
+        "consistency": consistency,
+        "ok": not any(consistency.values()),
+    }
@@ -0,0 +1,187 @@
+"""
+연석(붙어 있는 빈 좌석) 추천
+
+경기마다 열(block, row_no) 단위 색인을 프로세스 메모리에 두고,
+각 열의 "비어 있고 번호가 이어지는 좌석 구간(free run)" 목록을 길이 순으로 미리 계산해 둔다.
+
+- 처음 조회할 때 seats 를 한 번 읽어 색인을 만든다
+- 이후에는 조회 때마다 seatmap 변경 로그(changes_since)로 바뀐 좌석의 열만 다시 계산
+  변경 로그로 따라갈 수 없으면 색인을 다시 만든다
+- 색인은 워커마다 따로 있다. 다른 워커의 예매/취소는 seatmap 버전/변경 로그를 통해서만
+  알 수 있으므로 공유 캐시(CACHE_URL)가 아니면 이 워커에서 커밋된 변경만 반영된다
+- 열은 좌석 최고 가격 순으로 보고, 열 안에서는 count 이상인 구간만 본다.
+  limit 개를 찾은 뒤 남은 열의 최대 합계가 limit 번째 후보보다 작으면 멈춘다
+  (좌석 전체를 훑지 않음)
+
+순위: 가격(좋은 등급)이 높은 순 → 열 중앙에 가까운 순 → 블록/열 순서
+추천은 예약을 보장하지 않는다 (선점 API 로 잡아야 함).
+"""
+import heapq
+import threading
+
+from . import seatmap
+from .models import Seat
+from .seatlayout import natural_key
+
+DEFAULT_SUGGESTIONS = 5
+MAX_SUGGESTIONS = 20
+
+
+class _Row:
+    __slots__ = ("block", "row_no", "order", "max_price", "seats", "free", "runs", "longest")
+
+    def __init__(self, block, row_no):
+        self.block = block
+        self.row_no = row_no
+        self.order = 0  # 블록/열 순서
+        self.max_price = 0
+        self.seats = []  # [(seat_id, seat_number, grade, price)] 좌석 번호 순
+        self.free = []
+        self.runs = []  # [(시작 인덱스, 길이)] 긴 구간부터
+        self.longest = 0
+
+    def _adjacent(self, i):
+        """i-1 번째와 i 번째 좌석이 붙어 있는지 (번호가 숫자면 1 차이)"""
+        a, b = self.seats[i - 1][1], self.seats[i][1]
+        try:
+            return int(b) - int(a) == 1
+        except ValueError:
+            return True
+
+    def rebuild_runs(self):
+        runs = []
+        start = None
+        for i, is_free in enumerate(self.free):
+            if is_free and start is not None and self._adjacent(i):
+                continue
+            if start is not None:
+                runs.append((start, i - start))
+                start = None
+            if is_free:
+                start = i
+        if start is not None:
+            runs.append((start, len(self.free) - start))
+        runs.sort(key=lambda r: (-r[1], r[0]))
+        self.runs = runs
+        self.longest = runs[0][1] if runs else 0
+
+    def windows(self, count, grade, max_price):
+        """조건에 맞는 count 석 연속 구간 [(-합계, 중앙과의 거리, 열 순서, 시작 인덱스, 열, 좌석들)]"""
+        center = (len(self.seats) - 1) / 2
+        found = []
+        for start, length in self.runs:
+            if length < count:
+                break  # 나머지 구간은 더 짧음
+            for i in range(start, start + length - count + 1):
+                window = self.seats[i:i + count]
+                if grade is not None and any(s[2] != grade for s in window):
+                    continue
+                if max_price is not None and any(s[3] > max_price for s in window):
+                    continue
+                total = sum(s[3] for s in window)
+                offset = abs(i + (count - 1) / 2 - center)
+                found.append((-total, offset, self.order, i, self, window))
+        return found
+
+
+class _Index:
+    def __init__(self, match_id):
+        self.match_id = match_id
+        self.lock = threading.Lock()
+        self.version = None
+        self.rows = []  # 블록/열 순서
+        self.by_price = []  # 좌석 최고 가격이 높은 열부터
+        self.position = {}  # seat_id -> (_Row, 좌석 인덱스)
+
+    def build(self, version):
+        rows = {}
+        for seat_id, block, row_no, seat_number, grade, price, is_reserved in (
+            Seat.objects.filter(match_id=self.match_id).values_list(
+                "seat_id", "block", "row_no", "seat_number", "grade", "price", "is_reserved"
+            )
+        ):
+            row = rows.get((block, row_no))
+            if row is None:
+                row = rows[(block, row_no)] = _Row(block, row_no)
+            row.seats.append((seat_id, seat_number, grade, price, not is_reserved))
+
+        self.rows = [rows[key] for key in sorted(rows, key=lambda k: (natural_key(k[0]), natural_key(k[1])))]
+        self.position = {}
+        for order, row in enumerate(self.rows):
+            row.order = order
+            row.seats.sort(key=lambda s: natural_key(s[1]))
+            row.max_price = max(s[3] for s in row.seats)
+            row.free = [s[4] for s in row.seats]
+            row.seats = [s[:4] for s in row.seats]
+            for i, seat in enumerate(row.seats):
+                self.position[seat[0]] = (row, i)
+            row.rebuild_runs()
+        self.by_price = sorted(self.rows, key=lambda r: (-r.max_price, r.order))
+        self.version = version
+
+    def refresh(self):
+        """현재 버전까지 반영 (변경된 열만 다시 계산)"""
+        version = seatmap.current_version(self.match_id)
+        if self.version == version:
+            return
+        changes = None
+        if self.version is not None:
+            changes = seatmap.changes_since(self.match_id, self.version, version)
+        if changes is None:
+            self.build(version)
+            return
+
+        dirty = {}
+        for change in changes:
+            pos = self.position.get(change["seat_id"])
+            if pos is None:
+                # 색인에 없는 좌석 (좌석 추가 등)
+                self.build(version)
+                return
+            row, i = pos
+            row.free[i] = not change["is_reserved"]
+            dirty[id(row)] = row
+        for row in dirty.values():
+            row.rebuild_runs()
+        self.version = version
+
+    def find(self, count, grade=None, block=None, max_price=None, limit=DEFAULT_SUGGESTIONS):
+        best = []
+        for row in self.by_price:
+            # 이 열부터는 합계가 row.max_price * count 를 넘을 수 없음 (max_price 조건이 있으면 그 값까지)
+            bound = count * (row.max_price if max_price is None else min(row.max_price, max_price))
+            if len(best) == limit and bound < -best[-1][0]:
+                break
+            if row.longest < count or (block is not None and row.block != block):
+                continue
+            found = row.windows(count, grade, max_price)
+            if found:
+                best = heapq.nsmallest(limit, best + found, key=lambda c: c[:4])
+
+        return [
+            {
+                "block": row.block,
+                "row_no": row.row_no,
+                "total_price": -neg_total,
+                "seats": [
+                    {"seat_id": seat_id, "seat_number": number, "grade": g, "price": price}
+                    for seat_id, number, g, price in window
+                ],
+            }
+            for neg_total, _, _, _, row, window in best
+        ]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def find(match_id, count, grade=None, block=None, max_price=None, limit=DEFAULT_SUGGESTIONS):
+    """(seatmap 버전, 추천 목록)"""
+    with _indexes_lock:
+        index = _indexes.get(match_id)
+        if index is None:
+            index = _indexes[match_id] = _Index(match_id)
+    with index.lock:
+        index.refresh()
+        return index.version, index.find(count, grade, block, max_price, limit)
@@ -0,0 +1,112 @@
+"""
+사용자별 경기 취소 횟수 (취소 한도 확인용)
+
+cancel_log 를 매번 COUNT(*) 하지 않고 cancel_counters 테이블(migration 0003)에
+(user_id, match_id) 별 취소 횟수를 유지한다.
+
+- 취소가 반영될 때 같은 트랜잭션에서 +1
+- 한도 확인은 PK 조회 1번
+- 한도를 넘은 뒤 처음 막힌 요청에서만 abuse_log 에 기록 (flagged)
+- 정합성 복구: python manage.py rebuild_cancel_counters
+"""
+from django.conf import settings
+from django.db import connection, transaction
+
+CANCEL_LIMIT = getattr(settings, "CANCEL_LIMIT", 3)
+
+INCREMENT_SQL = {
+    "mysql": """
+        INSERT INTO cancel_counters (user_id, match_id, cancel_count, flagged)
+        VALUES (%s, %s, 1, 0)
+        ON DUPLICATE KEY UPDATE cancel_count = cancel_count + 1
+    """,
+    # SQLite / PostgreSQL
+    "default": """
+        INSERT INTO cancel_counters (user_id, match_id, cancel_count, flagged)
+        VALUES (%s, %s, 1, 0)
+        ON CONFLICT (user_id, match_id) DO UPDATE SET cancel_count = cancel_count + 1
+    """,
+}
+
+# 기준 테이블에서 새로 집계 (rebuild 용)
+AGGREGATE_SQL = """
+    SELECT
+        c.user_id,
+        r.match_id,
+        COUNT(*),
+        CASE WHEN EXISTS (
+            SELECT 1 FROM abuse_log a
+            WHERE a.user_id = c.user_id
+              AND a.match_id = r.match_id
+              AND a.event_type = 'too_many_cancels'
+        ) THEN 1 ELSE 0 END
+    FROM cancel_log c
+    JOIN reservations r ON c.res_id = r.res_id
+    GROUP BY c.user_id, r.match_id
+"""
+
+
+def record_cancel(user_id, match_id):
+    """취소 1건 반영. 취소 처리와 같은 트랜잭션 안에서 호출"""
+    sql = INCREMENT_SQL.get(connection.vendor, INCREMENT_SQL["default"])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [user_id, match_id])
+
+
+def cancel_count(user_id, match_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT cancel_count FROM cancel_counters WHERE user_id = %s AND match_id = %s",
+            [user_id, match_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def check_limit(user_id, match_id):
+    """
+    취소 가능하면 True.
+    한도를 넘은 경우 처음 한 번만 abuse_log 에 기록한다.
+    """
+    if cancel_count(user_id, match_id) < CANCEL_LIMIT:
+        return True
+
+    with connection.cursor() as cursor:
+        # flagged 를 먼저 세운 요청만 기록 (동시에 막혀도 1건)
+        cursor.execute(
+            """
+            UPDATE cancel_counters
+            SET flagged = 1
+            WHERE user_id = %s AND match_id = %s AND flagged = 0
+            """,
+            [user_id, match_id],
+        )
+        if cursor.rowcount == 1:
+            cursor.execute(
+                """
+                INSERT INTO abuse_log (user_id, match_id, event_type)
+                VALUES (%s, %s, %s)
+                """,
+                [user_id, match_id, "too_many_cancels"],
+            )
+    return False
+
+
+def rebuild():
+    """
+    cancel_counters 를 cancel_log 에서 다시 계산해서 덮어씀. 반영한 행 수 반환
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(AGGREGATE_SQL)
+            rows = cursor.fetchall()
+            cursor.execute("DELETE FROM cancel_counters")
+            if rows:
+                cursor.executemany(
+                    """
+                    INSERT INTO cancel_counters (user_id, match_id, cancel_count, flagged)
+                    VALUES (%s, %s, %s, %s)
+                    """,
+                    rows,
+                )
+    return len(rows)
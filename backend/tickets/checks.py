@@ -0,0 +1,71 @@
+"""
+배포 설정 검사 (python manage.py check, runserver/migrate 시 자동 실행)
+
+좌석 맵 버전/변경 로그(seatmap), 경기 목록(matchlist), 좌석 배치(seatlayout),
+내 예매(myreservations), replica 고정(routers), 판매 오픈 예열(onsale)은
+모두 Django 캐시를 워커 사이의 공유 상태로 쓴다.
+캐시가 프로세스별(LocMem/Dummy)이면 워커마다 값이 달라서
+?since 가 다른 워커에서 틀리고, 무효화/예열이 그 프로세스에만 적용된다.
+
+대기열(admission)은 캐시가 아니라 WAITING_ROOM_STORE 를 쓴다.
+"memory" 저장소는 워커마다 따로라 다른 워커가 발급한 대기표를 거절한다 (tickets.E002).
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .routers import replica_enabled
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def shared_cache_required():
+    """캐시를 여러 프로세스가 나눠 써야 하는 설정이면 그 이유 목록"""
+    reasons = []
+    if getattr(settings, "WEB_CONCURRENCY", 1) > 1:
+        reasons.append(f"WEB_CONCURRENCY={settings.WEB_CONCURRENCY}")
+    if replica_enabled():
+        reasons.append("replica DB 사용")
+    if getattr(settings, "SEAT_SHM_DIR", None):
+        reasons.append("SEAT_SHM_DIR 사용(노드 공유 비트맵)")
+    return reasons
+
+
+def cache_is_shared():
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    reasons = shared_cache_required()
+    if not reasons or cache_is_shared():
+        return []
+    return [
+        Error(
+            "기본 캐시가 프로세스별 백엔드입니다 ({}). 워커 사이에 좌석 맵 버전/캐시 무효화가 "
+            "공유되지 않습니다.".format(settings.CACHES["default"]["BACKEND"]),
+            hint="CACHE_URL 로 Redis 같은 공유 캐시를 지정하세요. 필요한 이유: " + ", ".join(reasons),
+            id="tickets.E001",
+        )
+    ]
+
+
+@register()
+def check_waiting_room_store(app_configs, **kwargs):
+    workers = getattr(settings, "WEB_CONCURRENCY", 1)
+    if (
+        not getattr(settings, "WAITING_ROOM_ENABLED", False)
+        or getattr(settings, "WAITING_ROOM_STORE", "memory") != "memory"
+        or workers <= 1
+    ):
+        return []
+    return [
+        Error(
+            f"대기열 저장소가 프로세스 메모리(WAITING_ROOM_STORE=\"memory\")인데 WEB_CONCURRENCY={workers} 입니다. "
+            "다른 워커가 발급한 대기표를 검증하지 못해 QUEUE_REQUIRED 로 거절됩니다.",
+            hint="WAITING_ROOM_STORE 에 워커들이 함께 쓰는 SQLite 파일 경로를 지정하세요.",
+            id="tickets.E002",
+        )
+    ]
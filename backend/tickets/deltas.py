@@ -0,0 +1,104 @@
+"""
+증분 집계 테이블 공용: 세대(epoch)와 변화량 버퍼 (match_stats, seat_availability)
+
+- 커밋된 변화량을 메모리에 키별로 합산하고, 백그라운드 스레드가 flush_interval 초마다 반영
+- 다시 집계(rebuild)하면 공유 캐시의 경기별 세대(epoch)를 올린다.
+  그 전에 버퍼에 쌓인 변화량은 이미 집계에 들어가 있으므로 어느 워커에서든 버림 (이중 반영 방지)
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+
+class Epochs:
+    """공유 캐시의 세대 키 (<prefix>:epoch, <prefix>:<match_id>:epoch)"""
+
+    def __init__(self, prefix):
+        self.all_key = f"{prefix}:epoch"
+        self.prefix = prefix
+
+    def key(self, match_id):
+        return f"{self.prefix}:{match_id}:epoch"
+
+    def get(self, match_ids):
+        """{match_id: (전체 세대, 경기 세대)} — rebuild 할 때마다 올라감"""
+        keys = [self.all_key] + [self.key(m) for m in match_ids]
+        found = cache.get_many(keys)
+        base = found.get(self.all_key, 0)
+        return {m: (base, found.get(self.key(m), 0)) for m in match_ids}
+
+    def bump(self, match_ids=None):
+        """rebuild 할 경기들의 세대를 올림 (match_ids 가 없으면 전체)"""
+        for key in [self.key(m) for m in match_ids] if match_ids else [self.all_key]:
+            cache.add(key, 0, timeout=None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+
+
+class DeltaBuffer:
+    """
+    키별 변화량 합산 버퍼. 하위 클래스가 정의:
+      name / logger    : 스레드 이름, 오류 기록
+      flush_interval   : 반영 주기(초)
+      match_id(key)    : 키의 경기 (기본은 키 자체)
+      apply(key, *values) : 변화량 반영. 경기를 새로 집계했으면 True
+    """
+    name = "delta-writer"
+    logger = None
+
+    def __init__(self, epochs):
+        self.epochs = epochs
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> [변화량..., epoch]
+        self._thread = None
+
+    def match_id(self, key):
+        return key
+
+    def apply(self, key, *values):
+        raise NotImplementedError
+
+    def add(self, key, *values):
+        match_id = self.match_id(key)
+        epoch = self.epochs.get([match_id])[match_id]
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None or entry[-1] != epoch:
+                # 처음이거나 그 사이 다시 집계됨 → 예전 변화량은 집계에 포함돼 있음
+                entry = self._pending[key] = [0] * len(values) + [epoch]
+            for i, value in enumerate(values):
+                entry[i] += value
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                self.logger.exception("%s 스레드 오류", self.name)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        current = self.epochs.get(list({self.match_id(key) for key in pending}))
+        for key, (*values, epoch) in pending.items():
+            match_id = self.match_id(key)
+            if not any(values) or epoch != current[match_id]:
+                # 모으는 동안 다시 집계됨 (다른 프로세스의 rebuild 명령 포함)
+                continue
+            try:
+                if self.apply(key, *values):
+                    # 이 경기를 새로 집계함 → 같은 경기의 남은 변화량도 이미 들어 있음
+                    current.update(self.epochs.get([match_id]))
+            except Exception:
+                self.logger.exception("%s 반영 실패 (%s)", self.name, key)
@@ -0,0 +1,225 @@
+"""
+좌석 임시 선점(hold)
+
+- 좌석을 고르면 HOLD_MINUTES 동안 선점 (seats.is_reserved = 1 + seat_holds 행)
+  → 경쟁은 가벼운 hold 단계에서 끝나고, 결제 단계는 충돌 없이 진행
+- 결제(create_reservation 에 hold_id 전달) 시 hold 를 예매로 전환
+- 만료된 hold 는 sweeper 가 배치 단위로 한꺼번에 해제
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from . import reservations, seatmap, sequencer, stats
+from .models import Payment, Reservation, Seat, SeatHold
+from .reservations import ReservationError
+
+logger = logging.getLogger(__name__)
+
+HOLD_MINUTES = getattr(settings, "HOLD_MINUTES", 5)
+SWEEP_INTERVAL = getattr(settings, "HOLD_SWEEP_INTERVAL", 10)  # 초
+SWEEP_BATCH_SIZE = getattr(settings, "HOLD_SWEEP_BATCH_SIZE", 500)
+
+
+class _PartialClaim(Exception):
+    """일부 좌석을 선점하지 못함 (원인은 롤백 후 판별)"""
+
+
+def _create_holds_once(user_id, match_id, seat_ids):
+    now = timezone.now()
+
+    if reservations.owned_count(user_id, match_id) + len(seat_ids) > reservations.MAX_SEATS_PER_USER:
+        raise ReservationError(reservations.SEAT_LIMIT)
+
+    # 비어 있는 좌석만 한 번에 선점 (PK 순서로 잠기므로 요청끼리 데드락 없음)
+    claimed = Seat.objects.filter(
+        pk__in=seat_ids, match_id=match_id, is_reserved=False
+    ).update(is_reserved=True)
+    if claimed != len(seat_ids):
+        # 롤백되므로 일부만 잡힌 좌석도 풀림
+        raise _PartialClaim()
+
+    expires_at = now + timedelta(minutes=HOLD_MINUTES)
+    try:
+        with transaction.atomic():
+            SeatHold.objects.bulk_create([
+                SeatHold(
+                    seat_id=seat_id,
+                    user_id=user_id,
+                    match_id=match_id,
+                    created_at=now,
+                    expires_at=expires_at,
+                )
+                for seat_id in seat_ids
+            ])
+    except IntegrityError:
+        # 아직 sweeper 가 치우지 못한 hold 가 남아 있는 경우
+        raise ReservationError(reservations.SEAT_TAKEN)
+
+    for seat_id in seat_ids:
+        seatmap.record_change(match_id, seat_id, True)
+    stats.record(match_id, seats=len(seat_ids))
+
+    # MySQL 은 bulk_create 후 PK 를 돌려주지 않으므로 다시 조회
+    return list(
+        SeatHold.objects.filter(seat_id__in=seat_ids, user_id=user_id)
+        .order_by("seat_id")
+        .values("hold_id", "seat_id", "expires_at")
+    )
+
+
+def create_holds(user_id, match_id, seat_ids):
+    """
+    좌석들을 HOLD_MINUTES 동안 선점. [{hold_id, seat_id, expires_at}, ...]
+    하나라도 안 되면 모두 실패 (ReservationError)
+    """
+    if not seat_ids or len(seat_ids) > reservations.MAX_SEATS_PER_USER \
+            or len(set(seat_ids)) != len(seat_ids):
+        raise ReservationError(reservations.INVALID_REQUEST)
+
+    ensure_sweeper()
+    try:
+        return reservations.with_retry(_create_holds_once, user_id, match_id, seat_ids)
+    except _PartialClaim:
+        # 원인은 첫 번째 실패 좌석 기준
+        for seat_id in seat_ids:
+            code = reservations.diagnose_claim(user_id, match_id, seat_id)
+            if code != reservations.RESERVE_FAILED:
+                raise ReservationError(code)
+        raise ReservationError(reservations.SEAT_TAKEN)
+    except ReservationError:
+        raise
+    except DatabaseError as e:
+        raise ReservationError(reservations.RESERVE_FAILED) from e
+
+
+def _convert_hold_once(user_id, hold_id, amount, method, match_id):
+    hold = SeatHold.objects.select_for_update().filter(pk=hold_id).first()
+    if hold is None or hold.user_id != user_id:
+        raise ReservationError(reservations.HOLD_NOT_FOUND)
+    if match_id is not None and hold.match_id != match_id:
+        raise ReservationError(reservations.MATCH_MISMATCH)
+    now = timezone.now()
+    if hold.expires_at <= now:
+        raise ReservationError(reservations.HOLD_EXPIRED)
+
+    # hold 때 is_reserved = 1 로 바꿔 두었으므로 (트리거가 INSERT 를 거부함)
+    # 잠근 좌석을 0 으로 되돌린 뒤 예매 → INSERT 후 트리거가 다시 1 로 설정
+    Seat.objects.filter(pk=hold.seat_id).update(is_reserved=False)
+    reservation = Reservation.objects.create(
+        user_id=user_id,
+        match_id=hold.match_id,
+        seat_id=hold.seat_id,
+        res_date=now,
+        status="active",
+    )
+    Payment.objects.create(
+        res=reservation,
+        amount=amount,
+        method=method,
+        pay_date=now,
+    )
+    hold.delete()
+    stats.record(hold.match_id, reservations=1, sales=amount)
+    return reservation
+
+
+def convert_hold(user_id, hold_id, amount, method, match_id=None):
+    """
+    hold → 예매 + 결제. 실패하면 ReservationError
+    match_id 를 주면 hold 가 그 경기의 것이어야 함 (대기열에서 검사한 경기)
+    """
+    try:
+        return reservations.with_retry(_convert_hold_once, user_id, hold_id, amount, method, match_id)
+    except ReservationError:
+        raise
+    except DatabaseError as e:
+        raise ReservationError(reservations.RESERVE_FAILED) from e
+
+
+def _release(rows):
+    """rows = [(hold_id, seat_id, match_id), ...] 의 좌석을 풀고 hold 삭제"""
+    hold_ids = [r[0] for r in rows]
+    seat_ids = [r[1] for r in rows]
+    Seat.objects.filter(pk__in=seat_ids).update(is_reserved=False)
+    SeatHold.objects.filter(pk__in=hold_ids).delete()
+    released = {}
+    for _, seat_id, match_id in rows:
+        seatmap.record_change(match_id, seat_id, False)
+        released[match_id] = released.get(match_id, 0) + 1
+    for match_id, count in released.items():
+        stats.record(match_id, seats=-count)
+
+    def notify():
+        for _, seat_id, match_id in rows:
+            sequencer.seat_released(match_id, None, seat_id)
+
+    # 이 프로세스의 sequencer 가 빈 좌석으로 다시 받도록 (커밋된 뒤에만)
+    transaction.on_commit(notify)
+
+
+def release_hold(user_id, hold_id):
+    """사용자가 직접 hold 해제. 해제했으면 True"""
+    with transaction.atomic():
+        rows = list(
+            SeatHold.objects.select_for_update()
+            .filter(pk=hold_id, user_id=user_id)
+            .values_list("hold_id", "seat_id", "match_id")
+        )
+        if rows:
+            _release(rows)
+    return bool(rows)
+
+
+def sweep_expired(batch_size=SWEEP_BATCH_SIZE):
+    """
+    만료된 hold 를 batch_size 개씩 한꺼번에 해제. 해제한 개수 반환
+    (다른 sweeper 가 잡고 있는 행은 건너뜀)
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                SeatHold.objects.select_for_update(skip_locked=True)
+                .filter(expires_at__lte=timezone.now())
+                .order_by("expires_at")
+                .values_list("hold_id", "seat_id", "match_id")[:batch_size]
+            )
+            if rows:
+                _release(rows)
+        total += len(rows)
+        if len(rows) < batch_size:
+            return total
+
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+
+def _sweep_loop():
+    while True:
+        time.sleep(SWEEP_INTERVAL)
+        close_old_connections()
+        try:
+            released = sweep_expired()
+            if released:
+                logger.info("만료된 좌석 hold %d건 해제", released)
+        except Exception:
+            # 스레드가 끝나면 만료 hold 가 계속 좌석을 잡고 있으므로 기록하고 계속
+            logger.exception("좌석 hold 정리 실패")
+
+
+def ensure_sweeper():
+    """프로세스당 sweeper 스레드 1개를 (처음 hold 가 생길 때) 띄움"""
+    global _sweeper
+    if (_sweeper is not None and _sweeper.is_alive()) or not getattr(settings, "HOLD_SWEEPER_THREAD", True):
+        return
+    with _sweeper_lock:
+        if _sweeper is None or not _sweeper.is_alive():
+            _sweeper = threading.Thread(target=_sweep_loop, name="hold-sweeper", daemon=True)
+            _sweeper.start()
@@ -0,0 +1,81 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets import bench
+
+
+class Command(BaseCommand):
+    help = (
+        "티켓 오픈 상황의 예매/취소/좌석 조회 부하를 주고 처리량, 지연, 초과 판매 여부를 측정합니다. "
+        "빈 벤치마크 DB 에서 실행하세요 (--settings=config.settings_bench)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--matches", type=int, default=3, help="생성할 경기 수 (첫 경기가 인기 경기)")
+        parser.add_argument("--seats", type=int, default=20000, help="경기당 좌석 수")
+        parser.add_argument("--users", type=int, default=5000, help="생성할 사용자 수")
+        parser.add_argument("--concurrency", type=int, default=32, help="동시 가상 사용자 수")
+        parser.add_argument("--duration", type=float, default=30, help="부하 시간(초)")
+        parser.add_argument("--hot-ratio", type=float, default=0.8, help="인기 경기로 가는 요청 비율")
+        parser.add_argument("--cancel-ratio", type=float, default=0.1, help="예매 성공 후 바로 취소하는 비율")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--reuse", action="store_true",
+            help="이미 만들어 둔 벤치마크 DB 를 그대로 사용 (스키마/데이터 생성 생략)",
+        )
+        parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+
+    def handle(self, *args, **options):
+        if options["reuse"]:
+            if not bench.has_schema():
+                raise CommandError("벤치마크 스키마가 없습니다. --reuse 없이 실행하세요.")
+            match_ids, user_ids = bench.load_targets()
+        else:
+            if bench.has_schema():
+                raise CommandError(
+                    "이미 테이블이 있는 DB 입니다. 빈 벤치마크 DB(--settings=config.settings_bench)를 "
+                    "쓰거나 --reuse 로 실행하세요."
+                )
+            self.stderr.write("스키마 생성 / 데이터 준비 중...")
+            bench.build_schema()
+            match_ids = bench.seed(options["matches"], options["seats"], options["users"])
+            _, user_ids = bench.load_targets()
+
+        self.stderr.write(
+            f"부하 시작: 가상 사용자 {options['concurrency']}명, {options['duration']}초"
+        )
+        recorder, elapsed = bench.run_load(
+            match_ids,
+            user_ids,
+            options["concurrency"],
+            options["duration"],
+            hot_ratio=options["hot_ratio"],
+            cancel_ratio=options["cancel_ratio"],
+            seed=options["seed"],
+        )
+        result = bench.summarize(recorder, elapsed, bench.check_consistency(match_ids))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, ensure_ascii=False, indent=2))
+        else:
+            self._print(result)
+
+        if not result["ok"]:
+            raise CommandError("정합성 검사 실패: " + json.dumps(result["consistency"], ensure_ascii=False))
+
+    def _print(self, result):
+        self.stdout.write(
+            f"전체: {result['requests']}건 / {result['elapsed_s']}초 = {result['rps']} req/s"
+        )
+        self.stdout.write(f"{'API':<22}{'요청':>8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  상태")
+        for api, row in result["apis"].items():
+            self.stdout.write(
+                f"{api:<22}{row['requests']:>8}{row['rps']:>9}{row['p50_ms']:>9}"
+                f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}  {row['status']}"
+            )
+        self.stdout.write(f"실패 코드: {result['codes']}")
+        self.stdout.write(f"락 대기/데드락: {result['lock_errors']}  예외: {result['exceptions']}")
+        for name, count in result["consistency"].items():
+            mark = "OK" if not count else "FAIL"
+            self.stdout.write(f"  [{mark}] {name}: {count}")
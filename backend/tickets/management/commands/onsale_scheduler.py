@@ -0,0 +1,102 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tickets import checks, onsale
+from tickets.models import Match
+from tickets.serializers import format_datetime
+
+
+class Command(BaseCommand):
+    help = "판매 오픈이 가까운 경기의 캐시/DB 연결을 미리 예열합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--open", nargs=2, metavar=("MATCH_ID", "DATETIME"),
+            help="판매 오픈 시각 등록/변경 (예: --open 3 2025-05-01T10:00:00)",
+        )
+        parser.add_argument("--list", action="store_true", help="다가오는 판매 일정 출력")
+        parser.add_argument(
+            "--match", type=int, action="append", default=[],
+            help="일정과 관계없이 지금 예열할 경기 (여러 번 지정 가능)",
+        )
+        parser.add_argument("--lead", type=float, help="오픈 몇 초 전부터 예열할지 (기본 ONSALE_WARM_LEAD)")
+        parser.add_argument("--probe-url", help="실제 서버 주소 (기본 ONSALE_PROBE_URL)")
+        parser.add_argument(
+            "--loop", type=float, default=0,
+            help="지정하면 N초마다 반복 실행 (0 이면 한 번만)",
+        )
+
+    def handle(self, *args, **options):
+        if options["open"]:
+            self.set_open(*options["open"])
+            return
+        if options["list"]:
+            for match_id, sale_open, warmed_at in onsale.schedule():
+                warmed = format_datetime(warmed_at) if warmed_at else "-"
+                self.stdout.write(f"match_id={match_id} 오픈 {format_datetime(sale_open)} 예열 {warmed}")
+            return
+
+        while True:
+            self.run_once(options)
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
+
+    def set_open(self, match_id, value):
+        try:
+            match_id = int(match_id)
+            sale_open = parse_datetime(value)
+        except ValueError:
+            sale_open = None
+        if sale_open is None:
+            raise CommandError("MATCH_ID 는 정수, DATETIME 은 ISO 일시(예: 2025-05-01T10:00:00)여야 합니다.")
+        if timezone.is_naive(sale_open):
+            sale_open = timezone.make_aware(sale_open)
+        if not Match.objects.filter(match_id=match_id).exists():
+            raise CommandError(f"없는 경기입니다: {match_id}")
+        onsale.set_sale_open(match_id, sale_open)
+        self.stdout.write(f"match_id={match_id} 판매 오픈 {format_datetime(sale_open)}")
+
+    def run_once(self, options):
+        probe_url = options["probe_url"] or getattr(settings, "ONSALE_PROBE_URL", None)
+        if not probe_url and not checks.cache_is_shared():
+            # 프로세스별 캐시는 이 프로세스에만 채워지므로 워커에 직접 요청해야 예열이 됨
+            raise CommandError(
+                "기본 캐시가 프로세스별 백엔드라 캐시 예열이 서버 워커에 반영되지 않습니다. "
+                "--probe-url (또는 ONSALE_PROBE_URL) 로 서버 주소를 지정하거나 공유 캐시를 설정하세요."
+            )
+
+        scheduled = onsale.due(timezone.now(), options["lead"])
+        match_ids = sorted(set(options["match"]) | set(scheduled))
+        if not match_ids:
+            self.stdout.write("예열할 경기 없음")
+            return
+
+        for alias, ms, error in onsale.check_connections():
+            if error:
+                self.stderr.write(f"DB {alias}: 연결 실패 ({error})")
+            else:
+                self.stdout.write(f"DB {alias}: {ms:.1f}ms")
+
+        stadiums = set(
+            Match.objects.filter(match_id__in=match_ids).values_list("stadium", flat=True)
+        )
+        onsale.warm_match_list(sorted(stadiums))
+
+        for match_id in match_ids:
+            timings = onsale.warm_match(match_id)
+            probes = " ".join(
+                f"{name}={status}/{ms:.1f}ms" for name, status, ms in onsale.probe_local(match_id)
+            )
+            steps = " ".join(f"{name}={ms}ms" for name, ms in timings.items())
+            self.stdout.write(f"match_id={match_id}: {steps} | {probes}")
+            if match_id in scheduled:
+                onsale.mark_warmed(match_id)
+
+        if probe_url:
+            for path, (ok, failed, max_ms) in onsale.probe_remote(probe_url, match_ids).items():
+                self.stdout.write(f"  {path}: 성공 {ok} 실패 {failed} 최대 {max_ms:.1f}ms")
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets import checks, provisioning
+from tickets.models import Match
+
+
+class Command(BaseCommand):
+    help = "경기장 배치 템플릿(JSON)으로 경기 좌석을 일괄 생성합니다. 이미 있는 좌석은 건너뜁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("template", help="배치 템플릿 파일 (형식은 tickets/provisioning.py 참고)")
+        parser.add_argument("match_ids", nargs="*", type=int)
+        parser.add_argument(
+            "--stadium", action="store_true",
+            help="템플릿의 stadium 과 같은 경기장의 경기 전체",
+        )
+        parser.add_argument("--chunk-size", type=int, default=provisioning.DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            template = provisioning.load_template(options["template"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        match_ids = list(options["match_ids"])
+        if options["stadium"]:
+            if not template.get("stadium"):
+                raise CommandError("템플릿에 stadium 이 없습니다.")
+            match_ids += Match.objects.filter(stadium=template["stadium"]).values_list(
+                "match_id", flat=True
+            )
+        match_ids = sorted(set(match_ids))
+        if not match_ids:
+            raise CommandError("match_id 를 지정하거나 --stadium 을 사용하세요.")
+
+        missing = set(match_ids) - set(
+            Match.objects.filter(match_id__in=match_ids).values_list("match_id", flat=True)
+        )
+        if missing:
+            raise CommandError(f"없는 경기입니다: {sorted(missing)}")
+
+        started = time.monotonic()
+        total = 0
+        for match_id in match_ids:
+            match_started = time.monotonic()
+
+            def progress(done, pending):
+                rate = done / max(time.monotonic() - match_started, 1e-6)
+                self.stdout.write(f"  match_id={match_id}: {done}/{pending} ({rate:,.0f} rows/s)")
+
+            inserted, skipped = provisioning.provision(
+                match_id, template, options["chunk_size"], progress
+            )
+            total += inserted
+            self.stdout.write(f"match_id={match_id}: 생성 {inserted}석, 기존 {skipped}석")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write("통계/잔여 좌석/좌석 맵 갱신 중...")
+        provisioning.finish(match_ids)
+        if not checks.cache_is_shared():
+            # 좌석 맵 버전/배치 캐시 초기화가 이 프로세스에만 적용됨
+            self.stderr.write(
+                "경고: 기본 캐시가 프로세스별 백엔드라 좌석 맵/배치 캐시 갱신이 서버 워커에 "
+                "반영되지 않습니다. 워커를 재시작하세요."
+            )
+        self.stdout.write(
+            f"완료: {len(match_ids)}경기 {total}석, {elapsed:.1f}초 "
+            f"({total / max(elapsed, 1e-6):,.0f} rows/s)"
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tickets import cancels
+
+
+class Command(BaseCommand):
+    help = "cancel_counters 테이블을 cancel_log 에서 다시 집계합니다."
+
+    def handle(self, *args, **options):
+        count = cancels.rebuild()
+        self.stdout.write(f"완료: {count}건")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from tickets import stats
+
+
+class Command(BaseCommand):
+    help = "match_stats 테이블을 seats/reservations/payments 에서 다시 집계합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("match_ids", nargs="*", type=int, help="지정하지 않으면 전체 경기")
+        parser.add_argument(
+            "--check", action="store_true",
+            help="테이블을 고치지 않고 증분 값과 새 집계가 다른 경기만 출력",
+        )
+
+    def handle(self, *args, **options):
+        match_ids = options["match_ids"] or None
+
+        if options["check"]:
+            mismatched = stats.check(match_ids)
+        else:
+            mismatched = stats.rebuild(match_ids)
+
+        for match_id in mismatched:
+            self.stdout.write(f"불일치: match_id={match_id}")
+        self.stdout.write(f"완료: 불일치 {len(mismatched)}건")
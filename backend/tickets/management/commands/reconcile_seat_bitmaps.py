@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets import seatshm
+from tickets.models import Match
+
+
+class Command(BaseCommand):
+    help = "노드 공유 좌석 비트맵(SEAT_SHM_DIR)을 seats.is_reserved 와 대조해서 다시 씁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--match", type=int, action="append", help="대상 경기 (여러 번 지정 가능, 없으면 전체)")
+        parser.add_argument(
+            "--loop", type=float, default=0,
+            help="지정하면 N초마다 반복 실행 (0 이면 한 번만)",
+        )
+
+    def handle(self, *args, **options):
+        if not seatshm.enabled():
+            raise CommandError("SEAT_SHM_DIR 이 설정되지 않았습니다.")
+        if options["match"]:
+            found = set(Match.objects.filter(match_id__in=options["match"]).values_list("match_id", flat=True))
+            missing = sorted(set(options["match"]) - found)
+            if missing:
+                raise CommandError("없는 경기입니다: " + ", ".join(map(str, missing)))
+
+        while True:
+            match_ids = options["match"] or list(Match.objects.values_list("match_id", flat=True))
+            fixed = 0
+            for match_id in match_ids:
+                fixed += seatshm.reconcile(match_id)
+            self.stdout.write(f"대조한 경기: {len(match_ids)}개, 불일치 수정: {fixed}석")
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
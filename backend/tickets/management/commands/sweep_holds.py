@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets import holds
+
+
+class Command(BaseCommand):
+    help = "만료된 좌석 임시 선점(hold)을 배치 단위로 해제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=holds.SWEEP_BATCH_SIZE)
+        parser.add_argument(
+            "--loop", type=float, default=0,
+            help="지정하면 N초마다 반복 실행 (0 이면 한 번만)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            released = holds.sweep_expired(options["batch_size"])
+            self.stdout.write(f"해제된 hold: {released}건")
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
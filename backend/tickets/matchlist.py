@@ -0,0 +1,105 @@
+"""
+경기 목록 캐시
+
+- 직렬화된 JSON(bytes)을 조회 조건별로 캐시
+- Match / Team 이 저장·삭제되면 버전을 올려 전체 무효화 (apps.ready 에서 시그널 연결)
+  DB 를 직접 고친 경우를 위해 MATCH_LIST_CACHE_TTL 초가 지나면 다시 만든다
+- ETag = 본문 해시, Last-Modified = 캐시를 만든 시각
+  (TTL 로 다시 만들 때 내용이 바뀌었을 수 있으므로 버전 시각이 아니라 생성 시각을 씀)
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.http import http_date
+
+from . import pagination
+from .models import Match
+from .serializers import DATETIME, INT, STR, RowLayout
+
+VERSION_KEY = "match_list:version"
+
+LAYOUT = RowLayout([
+    ("match_id", INT),
+    ("match_date", DATETIME),
+    ("stadium", STR),
+    ("total_seats", INT),
+    ("home_team", STR),
+    ("away_team", STR),
+])
+
+
+def cache_ttl():
+    return getattr(settings, "MATCH_LIST_CACHE_TTL", 60)
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = int(time.time() * 1000)
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def invalidate(**kwargs):
+    """Match / Team 변경 시그널 수신"""
+    cache.set(VERSION_KEY, int(time.time() * 1000), None)
+
+
+def _cache_key(version, params):
+    raw = json.dumps(params, sort_keys=True, default=str)
+    return f"match_list:{version}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def build(params):
+    """
+    params: date_from, date_to(datetime), team(team_id), stadium, limit, cursor((datetime, id))
+    경기일 오름차순. 반환: JSON bytes
+    """
+    qs = Match.objects.all()
+    if params.get("date_from"):
+        qs = qs.filter(match_date__gte=params["date_from"])
+    if params.get("date_to"):
+        qs = qs.filter(match_date__lt=params["date_to"])
+    if params.get("team"):
+        qs = qs.filter(Q(home_team_id=params["team"]) | Q(away_team_id=params["team"]))
+    if params.get("stadium"):
+        qs = qs.filter(stadium=params["stadium"])
+    if params.get("cursor"):
+        match_date, match_id = params["cursor"]
+        qs = qs.filter(Q(match_date__gt=match_date) | Q(match_date=match_date, match_id__gt=match_id))
+
+    limit = params["limit"]
+    rows = list(
+        qs.order_by("match_date", "match_id").values_list(
+            "match_id", "match_date", "stadium", "total_seats",
+            "home_team__team_name", "away_team__team_name",
+        )[:limit + 1]
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = pagination.encode_cursor(rows[-1][1], rows[-1][0])
+
+    body = '{"results":%s,"next_cursor":%s}' % (LAYOUT.dumps(rows), json.dumps(next_cursor))
+    return body.encode("utf-8")
+
+
+def get(params):
+    """
+    (body, etag, last_modified) — 같은 버전/조건이면 캐시된 값을 그대로 씀
+    """
+    version = current_version()
+    key = _cache_key(version, params)
+    entry = cache.get(key)
+    if entry is None:
+        body = build(params)
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        entry = (body, etag, http_date(time.time()))
+        cache.set(key, entry, cache_ttl())
+    return entry
@@ -0,0 +1,180 @@
+"""
+API 별 지연 / SQL 수 / DB 시간 측정
+
+- RequestMetricsMiddleware 가 요청마다 URL name 기준으로 집계
+  (응답 시간 히스토그램, 요청 수, SQL 수, DB 시간, 락 대기/데드락 오류 수)
+- GET /api/metrics/ 에서 Prometheus 텍스트 형식으로 노출 (registry.render)
+- METRICS_SLOW_REQUEST_MS 보다 느린 요청은 실행한 SQL 과 함께 로그에 남김
+  (같은 SQL 이 반복되면 N+1 을 바로 알 수 있음)
+
+값은 프로세스 단위 (워커가 여러 개면 워커별로 수집됨).
+"""
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from . import abuse, requestlog, reservations
+
+logger = logging.getLogger(__name__)
+
+# 응답 시간 버킷(초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _conf(name, default):
+    return getattr(settings, f"METRICS_{name}", default)
+
+
+class _Endpoint:
+    __slots__ = ("buckets", "count", "seconds", "queries", "db_seconds", "lock_errors", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.lock_errors = 0
+        self.statuses = {}
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}  # (view, method) -> _Endpoint
+
+    def observe(self, view, method, status, seconds, queries, db_seconds, lock_errors):
+        with self._lock:
+            e = self._endpoints.get((view, method))
+            if e is None:
+                e = self._endpoints[(view, method)] = _Endpoint()
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    e.buckets[i] += 1
+            e.count += 1
+            e.seconds += seconds
+            e.queries += queries
+            e.db_seconds += db_seconds
+            e.lock_errors += lock_errors
+            e.statuses[status] = e.statuses.get(status, 0) + 1
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            lines = [
+                "# HELP http_request_duration_seconds 요청 처리 시간",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (view, method), e in items:
+                labels = f'view="{view}",method="{method}"'
+                for bound, count in zip(BUCKETS, e.buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {e.count}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {e.seconds:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {e.count}")
+
+            lines += [
+                "# HELP http_requests_total 응답 상태별 요청 수",
+                "# TYPE http_requests_total counter",
+            ]
+            for (view, method), e in items:
+                for status, count in sorted(e.statuses.items()):
+                    lines.append(
+                        f'http_requests_total{{view="{view}",method="{method}",status="{status}"}} {count}'
+                    )
+
+            for name, attr, help_text, fmt in (
+                ("db_queries_total", "queries", "실행한 SQL 수", "{}"),
+                ("db_query_duration_seconds_total", "db_seconds", "SQL 실행 시간 합", "{:.6f}"),
+                ("db_lock_errors_total", "lock_errors", "락 대기 타임아웃/데드락 오류 수 (재시도 포함)", "{}"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (view, method), e in items:
+                    value = fmt.format(getattr(e, attr))
+                    lines.append(f'{name}{{view="{view}",method="{method}"}} {value}')
+
+        # 백그라운드 기록기 상태
+        lines += ["# HELP background_queue 백그라운드 기록기 상태", "# TYPE background_queue gauge"]
+        for worker, values in (("request_log", requestlog.writer.stats()),
+                               ("abuse_detector", abuse.detector.stats())):
+            for key, value in sorted(values.items()):
+                lines.append(f'background_queue{{worker="{worker}",field="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper 로 요청 중 실행한 SQL 을 기록"""
+
+    def __init__(self, keep_sql):
+        self.keep_sql = keep_sql
+        self.count = 0
+        self.seconds = 0.0
+        self.lock_errors = 0
+        self.statements = []  # [(ms, alias, sql), ...]
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except DatabaseError as e:
+            if reservations.is_retryable(e):
+                self.lock_errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.seconds += elapsed
+            if self.keep_sql and len(self.statements) < _conf("SLOW_SQL_LIMIT", 50):
+                self.statements.append((elapsed * 1000, context["connection"].alias, sql))
+
+
+class RequestMetricsMiddleware:
+    """settings.MIDDLEWARE 에 등록"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        slow_ms = _conf("SLOW_REQUEST_MS", 500)
+        recorder = _QueryRecorder(keep_sql=slow_ms is not None)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            response = self.get_response(request)
+        seconds = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else "unmatched"
+        registry.observe(
+            view,
+            request.method,
+            response.status_code,
+            seconds,
+            recorder.count,
+            recorder.seconds,
+            recorder.lock_errors,
+        )
+
+        if slow_ms is not None and seconds * 1000 >= slow_ms:
+            logger.warning(
+                "느린 요청 %s %s (%s): %.1fms, SQL %d회 %.1fms\n%s",
+                request.method,
+                request.get_full_path(),
+                view,
+                seconds * 1000,
+                recorder.count,
+                recorder.seconds * 1000,
+                "\n".join(f"  [{alias}] {ms:.1f}ms {sql}" for ms, alias, sql in recorder.statements),
+            )
+        return response
+
@@ -0,0 +1,152 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AbuseLog',
+            fields=[
+                ('abuse_id', models.AutoField(primary_key=True, serialize=False)),
+                ('event_type', models.CharField(max_length=50)),
+                ('detected_time', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'abuse_log',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CancelLog',
+            fields=[
+                ('cancel_id', models.AutoField(primary_key=True, serialize=False)),
+                ('cancel_date', models.DateTimeField()),
+                ('reason', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                'db_table': 'cancel_log',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Match',
+            fields=[
+                ('match_id', models.AutoField(primary_key=True, serialize=False)),
+                ('match_date', models.DateTimeField()),
+                ('stadium', models.CharField(max_length=100)),
+                ('total_seats', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'matches',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='MatchStats',
+            fields=[
+                ('match_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('match_date', models.DateTimeField()),
+                ('stadium', models.CharField(max_length=100)),
+                ('total_seats', models.IntegerField()),
+                ('seat_count', models.IntegerField()),
+                ('reserved_seats', models.IntegerField()),
+                ('occupancy_rate', models.FloatField()),
+                ('total_sales', models.FloatField()),
+                ('reservation_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'match_stats',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Payment',
+            fields=[
+                ('pay_id', models.AutoField(primary_key=True, serialize=False)),
+                ('amount', models.IntegerField()),
+                ('method', models.CharField(max_length=20)),
+                ('pay_date', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'payments',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Reservation',
+            fields=[
+                ('res_id', models.AutoField(primary_key=True, serialize=False)),
+                ('res_date', models.DateTimeField()),
+                ('status', models.CharField(max_length=10)),
+            ],
+            options={
+                'db_table': 'reservations',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Seat',
+            fields=[
+                ('seat_id', models.AutoField(primary_key=True, serialize=False)),
+                ('block', models.CharField(max_length=10)),
+                ('row_no', models.CharField(max_length=10)),
+                ('seat_number', models.CharField(max_length=10)),
+                ('grade', models.CharField(max_length=20)),
+                ('price', models.IntegerField()),
+                ('is_reserved', models.BooleanField()),
+            ],
+            options={
+                'db_table': 'seats',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('team_id', models.AutoField(primary_key=True, serialize=False)),
+                ('team_name', models.CharField(max_length=100, unique=True)),
+                ('league', models.CharField(blank=True, max_length=50, null=True)),
+                ('city', models.CharField(blank=True, max_length=50, null=True)),
+            ],
+            options={
+                'db_table': 'teams',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('user_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50)),
+                ('email', models.CharField(max_length=100, unique=True)),
+                ('phone', models.CharField(blank=True, max_length=20, null=True)),
+                ('role', models.CharField(max_length=10)),
+            ],
+            options={
+                'db_table': 'users',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SeatHold',
+            fields=[
+                ('hold_id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('match', models.ForeignKey(db_column='match_id', on_delete=django.db.models.deletion.DO_NOTHING, to='tickets.match')),
+                ('seat', models.OneToOneField(db_column='seat_id', on_delete=django.db.models.deletion.DO_NOTHING, to='tickets.seat')),
+                ('user', models.ForeignKey(db_column='user_id', on_delete=django.db.models.deletion.DO_NOTHING, to='tickets.user')),
+            ],
+            options={
+                'db_table': 'seat_holds',
+            },
+        ),
+    ]
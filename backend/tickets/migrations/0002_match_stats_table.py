@@ -0,0 +1,61 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    match_stats 를 집계 뷰에서 증분 갱신 테이블로 변경.
+    적용 후 python manage.py rebuild_match_stats 로 초기 값을 채운다.
+    """
+
+    dependencies = [
+        ("tickets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                "DROP VIEW IF EXISTS match_stats",
+                """
+                CREATE TABLE match_stats (
+                    match_id INT NOT NULL PRIMARY KEY,
+                    match_date DATETIME NOT NULL,
+                    stadium VARCHAR(100) NOT NULL,
+                    total_seats INT NOT NULL,
+                    seat_count INT NOT NULL DEFAULT 0,
+                    reserved_seats INT NOT NULL DEFAULT 0,
+                    occupancy_rate DOUBLE NOT NULL DEFAULT 0,
+                    total_sales DOUBLE NOT NULL DEFAULT 0,
+                    reservation_count INT NOT NULL DEFAULT 0
+                )
+                """,
+            ],
+            reverse_sql=[
+                "DROP TABLE IF EXISTS match_stats",
+                # 예전 집계 뷰 (컬럼 정의는 tickets.stats 와 같음)
+                """
+                CREATE VIEW match_stats AS
+                SELECT
+                    m.match_id,
+                    m.match_date,
+                    m.stadium,
+                    m.total_seats,
+                    (SELECT COUNT(*) FROM seats s
+                     WHERE s.match_id = m.match_id) AS seat_count,
+                    (SELECT COUNT(*) FROM seats s
+                     WHERE s.match_id = m.match_id AND s.is_reserved = 1) AS reserved_seats,
+                    CASE WHEN m.total_seats > 0
+                         THEN ROUND((SELECT COUNT(*) FROM seats s
+                                     WHERE s.match_id = m.match_id AND s.is_reserved = 1)
+                                    * 100.0 / m.total_seats, 2)
+                         ELSE 0 END AS occupancy_rate,
+                    (SELECT COALESCE(SUM(p.amount), 0)
+                     FROM reservations r
+                     JOIN payments p ON p.res_id = r.res_id
+                     WHERE r.match_id = m.match_id AND r.status = 'active') AS total_sales,
+                    (SELECT COUNT(*) FROM reservations r
+                     WHERE r.match_id = m.match_id AND r.status = 'active') AS reservation_count
+                FROM matches m
+                """,
+            ],
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    (user_id, match_id) 별 취소 횟수 테이블.
+    기존 cancel_log 로 초기 값을 채운다 (python manage.py rebuild_cancel_counters 와 같은 집계).
+    """
+
+    dependencies = [
+        ("tickets", "0002_match_stats_table"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE TABLE cancel_counters (
+                    user_id INT NOT NULL,
+                    match_id INT NOT NULL,
+                    cancel_count INT NOT NULL DEFAULT 0,
+                    flagged SMALLINT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, match_id)
+                )
+                """,
+                """
+                INSERT INTO cancel_counters (user_id, match_id, cancel_count, flagged)
+                SELECT
+                    c.user_id,
+                    r.match_id,
+                    COUNT(*),
+                    CASE WHEN EXISTS (
+                        SELECT 1 FROM abuse_log a
+                        WHERE a.user_id = c.user_id
+                          AND a.match_id = r.match_id
+                          AND a.event_type = 'too_many_cancels'
+                    ) THEN 1 ELSE 0 END
+                FROM cancel_log c
+                JOIN reservations r ON c.res_id = r.res_id
+                GROUP BY c.user_id, r.match_id
+                """,
+            ],
+            reverse_sql=["DROP TABLE IF EXISTS cancel_counters"],
+        ),
+    ]
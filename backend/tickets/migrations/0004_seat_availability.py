@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    (경기, 등급, 블록) 별 전체/빈 좌석 수, 가격 범위 테이블.
+    seats 로 초기 값을 채운다 (python manage.py rebuild_seat_availability 와 같은 집계).
+    """
+
+    dependencies = [
+        ("tickets", "0003_cancel_counters"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE TABLE seat_availability (
+                    match_id INT NOT NULL,
+                    grade VARCHAR(20) NOT NULL,
+                    block VARCHAR(10) NOT NULL,
+                    total_seats INT NOT NULL DEFAULT 0,
+                    free_seats INT NOT NULL DEFAULT 0,
+                    min_price INT NOT NULL DEFAULT 0,
+                    max_price INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (match_id, grade, block)
+                )
+                """,
+                """
+                INSERT INTO seat_availability
+                    (match_id, grade, block, total_seats, free_seats, min_price, max_price)
+                SELECT
+                    match_id,
+                    grade,
+                    block,
+                    COUNT(*),
+                    SUM(CASE WHEN is_reserved = 0 THEN 1 ELSE 0 END),
+                    MIN(price),
+                    MAX(price)
+                FROM seats
+                GROUP BY match_id, grade, block
+                """,
+            ],
+            reverse_sql=["DROP TABLE IF EXISTS seat_availability"],
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    경기별 판매 오픈 시각 (onsale_scheduler 가 오픈 전에 캐시 예열)
+    warmed_at: 예열을 마친 시각 (NULL 이면 아직)
+    """
+
+    dependencies = [
+        ("tickets", "0004_seat_availability"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE TABLE match_sales (
+                    match_id INT NOT NULL PRIMARY KEY,
+                    sale_open DATETIME NOT NULL,
+                    warmed_at DATETIME NULL
+                )
+                """,
+                "CREATE INDEX idx_match_sales_open ON match_sales (sale_open)",
+            ],
+            reverse_sql=["DROP TABLE IF EXISTS match_sales"],
+        ),
+    ]
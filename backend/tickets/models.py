@@ -140,3 +140,25 @@ class MatchStats(models.Model):
         managed = False
         db_table = 'match_stats'
 
+
+
+class SeatHold(models.Model):
+    """
+    결제 전 임시 좌석 선점 (만료 시각이 지나면 sweeper 가 해제)
+    좌석당 하나만 존재 (seat_id UNIQUE)
+    """
+    hold_id = models.AutoField(primary_key=True)
+    seat = models.OneToOneField(
+        Seat, db_column='seat_id', on_delete=models.DO_NOTHING
+    )
+    user = models.ForeignKey(
+        User, db_column='user_id', on_delete=models.DO_NOTHING
+    )
+    match = models.ForeignKey(
+        Match, db_column='match_id', on_delete=models.DO_NOTHING
+    )
+    created_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'seat_holds'
@@ -0,0 +1,140 @@
+"""
+내 예매 내역 (마이페이지)
+
+- 경기/팀/좌석/결제를 한 번에 JOIN 해서 res_date 최신순으로 한 페이지씩 (keyset)
+- 응답 JSON(bytes)을 사용자별로 캐시. 그 사용자의 예매/취소가 커밋되면
+  사용자 버전을 올려 캐시 전체를 무효화 (views 에서 invalidate 호출)
+  → 취소 후 목록을 다시 불러와도 바뀐 사용자만 다시 조회
+- MY_RESERVATIONS_CACHE_TTL 초가 지나면 다시 만든다 (DB 를 직접 고친 경우 대비)
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import pagination, routers
+from .serializers import DATETIME, INT, STR, RowLayout
+
+STATUSES = ("active", "cancelled")
+
+LAYOUT = RowLayout([
+    ("res_id", INT),
+    ("res_date", DATETIME),
+    ("status", STR),
+    ("match_id", INT),
+    ("match_date", DATETIME),
+    ("stadium", STR),
+    ("home_team", STR),
+    ("away_team", STR),
+    ("seat_id", INT),
+    ("block", STR),
+    ("row_no", STR),
+    ("seat_number", STR),
+    ("grade", STR),
+    ("price", INT),
+    ("pay_id", INT),
+    ("amount", INT),
+    ("method", STR),
+    ("pay_date", DATETIME),
+])
+
+SQL = """
+    SELECT
+        r.res_id,
+        r.res_date,
+        r.status,
+        m.match_id,
+        m.match_date,
+        m.stadium,
+        ht.team_name AS home_team,
+        at.team_name AS away_team,
+        s.seat_id,
+        s.block,
+        s.row_no,
+        s.seat_number,
+        s.grade,
+        s.price,
+        p.pay_id,
+        p.amount,
+        p.method,
+        p.pay_date
+    FROM reservations r
+    JOIN matches m ON r.match_id = m.match_id
+    JOIN teams   ht ON m.home_team_id = ht.team_id
+    JOIN teams   at ON m.away_team_id = at.team_id
+    JOIN seats   s  ON r.seat_id = s.seat_id
+    LEFT JOIN payments p ON r.res_id = p.res_id
+"""
+
+
+def cache_ttl():
+    return getattr(settings, "MY_RESERVATIONS_CACHE_TTL", 60)
+
+
+def _version_key(user_id):
+    return f"my_reservations:{user_id}:version"
+
+
+def current_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = int(time.time() * 1000)
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def invalidate(user_id):
+    """사용자의 예매/취소 후 호출. 트랜잭션 안이면 커밋된 뒤에 무효화"""
+    user_id = int(user_id)
+    transaction.on_commit(
+        lambda: cache.set(_version_key(user_id), int(time.time() * 1000), None)
+    )
+
+
+def build(user_id, status=None, limit=pagination.DEFAULT_LIMIT, cursor=None):
+    """
+    cursor: (res_date, res_id) — 이전 페이지 마지막 예매
+    반환: {"results": [...], "next_cursor": ...} JSON bytes
+    """
+    where = ["r.user_id = %s"]
+    params = [user_id]
+    if status:
+        where.append("r.status = %s")
+        params.append(status)
+    if cursor:
+        res_date, res_id = cursor
+        where.append(pagination.keyset_condition("r.res_date", "r.res_id"))
+        params += [res_date, res_date, res_id]
+
+    sql = SQL + " WHERE " + " AND ".join(where) + " ORDER BY r.res_date DESC, r.res_id DESC LIMIT %s"
+    with routers.read_connection().cursor() as cur:
+        cur.execute(sql, params + [limit + 1])
+        rows = cur.fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = pagination.encode_cursor(rows[-1][1], rows[-1][0])
+
+    body = '{"results":%s,"next_cursor":%s}' % (LAYOUT.dumps(rows), json.dumps(next_cursor))
+    return body.encode("utf-8")
+
+
+def get(user_id, status=None, limit=pagination.DEFAULT_LIMIT, cursor=None):
+    """같은 사용자 버전/조건이면 캐시된 응답을 그대로 씀"""
+    raw = json.dumps([status, limit, cursor], default=str)
+    key = "my_reservations:%s:%s:%s" % (
+        user_id,
+        current_version(user_id),
+        hashlib.md5(raw.encode("utf-8")).hexdigest(),
+    )
+    body = cache.get(key)
+    if body is None:
+        body = build(user_id, status, limit, cursor)
+        cache.set(key, body, cache_ttl())
+    return body
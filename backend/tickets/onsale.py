@@ -0,0 +1,215 @@
+"""
+판매 오픈 전 예열 (cache pre-warming)
+
+판매가 열리는 순간 캐시와 DB 연결이 비어 있으면 첫 몇 분의 요청이 가장 느리다.
+match_sales 테이블(migration 0005)에 경기별 판매 오픈 시각을 두고,
+오픈 ONSALE_WARM_LEAD 초 전부터 아래를 미리 해 둔다 (python manage.py onsale_scheduler).
+
+- 좌석 배치(layout) / 현재 버전의 비트맵 / 전체 좌석 스냅샷을 공유 캐시에 생성
+- 공유 좌석 비트맵(seatshm)을 seats 와 대조
+- match_stats / seat_availability 가 seats 와 다르면 다시 집계 (없는 행도 채움)
+- 경기 목록(match_list) 첫 페이지 응답 캐시
+- DB 연결(default/replica)을 열고 SELECT 1 로 확인
+- match_seat_list 를 이 프로세스에서 직접 호출해 응답 경로 확인 (대기열 검사는 건너뜀)
+- ONSALE_PROBE_URL 을 지정하면 실제 서버에 좌석/경기 목록 요청을 보내
+  워커들도 DB 연결과 import 를 미리 해 두게 함 (CONN_MAX_AGE 동안 연결 유지)
+  대기열이 켜진 경기의 좌석 요청은 429 가 정상
+  캐시가 프로세스별(LocMem)이면 위의 캐시 예열은 스케줄러 프로세스에만 남으므로
+  워커 캐시를 채우는 방법이 이것뿐이라 반드시 지정해야 한다 (checks.cache_is_shared)
+
+예열은 경기마다 한 번 (warmed_at). 오픈 시각을 바꾸면 다시 예열한다.
+"""
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+from django.test import RequestFactory
+from django.utils import timezone
+
+from . import availability, matchlist, pagination, seatlayout, seatmap, seatshm, stats
+
+
+def _conf(name, default):
+    return getattr(settings, f"ONSALE_{name}", default)
+
+
+def _db_datetime(value):
+    return connection.ops.adapt_datetimefield_value(value)
+
+
+# ── 판매 일정 ───────────────────────────────────────────────────────────────
+
+# 등록/변경을 한 문장으로 (동시에 등록해도 PRIMARY KEY 충돌 없이 마지막 값이 남음)
+UPSERT_SQL = {
+    "mysql": """
+        INSERT INTO match_sales (match_id, sale_open, warmed_at)
+        VALUES (%s, %s, NULL)
+        ON DUPLICATE KEY UPDATE sale_open = VALUES(sale_open), warmed_at = NULL
+    """,
+    # SQLite / PostgreSQL
+    "default": """
+        INSERT INTO match_sales (match_id, sale_open, warmed_at)
+        VALUES (%s, %s, NULL)
+        ON CONFLICT (match_id) DO UPDATE SET sale_open = excluded.sale_open, warmed_at = NULL
+    """,
+}
+
+
+def set_sale_open(match_id, sale_open):
+    """판매 오픈 시각 등록/변경 (다시 예열하도록 warmed_at 을 비움)"""
+    sql = UPSERT_SQL.get(connection.vendor, UPSERT_SQL["default"])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match_id, _db_datetime(sale_open)])
+
+
+def schedule(upcoming_only=True):
+    """[(match_id, sale_open, warmed_at)] 오픈 시각 순"""
+    sql = "SELECT match_id, sale_open, warmed_at FROM match_sales"
+    params = []
+    if upcoming_only:
+        sql += " WHERE sale_open >= %s"
+        params.append(_db_datetime(timezone.now() - timedelta(seconds=_conf("WARM_LEAD", 300))))
+    sql += " ORDER BY sale_open, match_id"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def due(now=None, lead=None):
+    """
+    지금 예열할 match_id 목록
+    오픈 lead 초 전 ~ 오픈 후 lead 초 사이이고 아직 예열하지 않은 경기
+    (스케줄러가 늦게 떴어도 막 열린 경기는 예열)
+    """
+    now = now or timezone.now()
+    lead = timedelta(seconds=_conf("WARM_LEAD", 300) if lead is None else lead)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT match_id FROM match_sales"
+            " WHERE warmed_at IS NULL AND sale_open > %s AND sale_open <= %s"
+            " ORDER BY sale_open",
+            [_db_datetime(now - lead), _db_datetime(now + lead)],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def mark_warmed(match_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE match_sales SET warmed_at = %s WHERE match_id = %s",
+            [_db_datetime(timezone.now()), match_id],
+        )
+
+
+# ── 예열 ────────────────────────────────────────────────────────────────────
+
+def check_connections():
+    """[(alias, ms, 오류 또는 None)] — 설정된 DB 마다 연결을 열고 SELECT 1"""
+    result = []
+    for alias in settings.DATABASES:
+        conn = connections[alias]
+        started = time.monotonic()
+        try:
+            conn.close_if_unusable_or_obsolete()
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            error = None
+        except DatabaseError as e:
+            error = str(e)
+        result.append((alias, (time.monotonic() - started) * 1000, error))
+    return result
+
+
+def warm_match_list(stadiums=()):
+    """경기 목록 첫 페이지 (조건 없음 + 구장별) 응답 캐시"""
+    for stadium in [None, *stadiums]:
+        matchlist.get({
+            "date_from": None,
+            "date_to": None,
+            "team": None,
+            "stadium": stadium,
+            "limit": pagination.parse_limit(None),
+            "cursor": None,
+        })
+
+
+def warm_match(match_id):
+    """
+    경기 하나의 좌석 맵/요약 예열. 반환: 단계별 소요 시간(ms) dict
+    """
+    timings = {}
+
+    def step(name, fn, *args):
+        started = time.monotonic()
+        value = fn(*args)
+        timings[name] = round((time.monotonic() - started) * 1000, 1)
+        return value
+
+    step("layout", seatlayout.get_layout, match_id, True)
+    version = seatmap.current_version(match_id)
+    step("bitmap", seatlayout.get_bitmap, match_id, version)
+    step("snapshot", seatmap.seat_snapshot, match_id, version)
+    if seatshm.enabled():
+        step("shm", seatshm.reconcile, match_id)
+    if step("availability", availability.check, [match_id]):
+        availability.rebuild([match_id])
+    if step("stats", stats.check, [match_id]):
+        stats.rebuild([match_id])
+    return timings
+
+
+def probe_local(match_id):
+    """match_seat_list 를 이 프로세스에서 호출 (대기열 검사 없이). [(형식, 상태 코드, ms)]"""
+    from . import views
+
+    view = getattr(views.match_seat_list, "__wrapped__", views.match_seat_list)
+    factory = RequestFactory()
+    result = []
+    for query in ("format=layout", "format=bitmap", ""):
+        started = time.monotonic()
+        response = view(factory.get(f"/api/matches/{match_id}/seats/?{query}"), match_id)
+        result.append((query or "full", response.status_code, (time.monotonic() - started) * 1000))
+    return result
+
+
+def probe_remote(base_url, match_ids, requests=None, concurrency=None):
+    """
+    실제 서버에 예열 요청. {경로: (성공 수, 실패 수, 최대 ms)}
+    성공은 2xx/304/429 (429 는 대기열 검사까지 도달한 것)
+    """
+    requests = requests or _conf("PROBE_REQUESTS", 20)
+    concurrency = concurrency or _conf("PROBE_CONCURRENCY", 4)
+    base_url = base_url.rstrip("/")
+
+    paths = ["/api/matches/"]
+    paths.append("/api/matches/availability/?" + "&".join(f"match_id={m}" for m in match_ids))
+    for match_id in match_ids:
+        paths.append(f"/api/matches/{match_id}/seats/?format=layout")
+        paths.append(f"/api/matches/{match_id}/seats/?format=bitmap")
+
+    def fetch(path):
+        started = time.monotonic()
+        try:
+            with urllib.request.urlopen(base_url + path, timeout=10) as response:
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except OSError:
+            status = None
+        return path, status, (time.monotonic() - started) * 1000
+
+    result = {path: [0, 0, 0.0] for path in paths}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for path, status, ms in pool.map(fetch, paths * requests):
+            entry = result[path]
+            if status is not None and (200 <= status < 300 or status in (304, 429)):
+                entry[0] += 1
+            else:
+                entry[1] += 1
+            entry[2] = max(entry[2], ms)
+    return {path: tuple(entry) for path, entry in result.items()}
@@ -0,0 +1,46 @@
+"""
+키셋(커서) 페이지네이션 공통 함수
+
+OFFSET 대신 마지막으로 본 행의 (정렬 일시, id) 를 커서로 넘겨
+다음 페이지를 "그보다 이전" 조건으로 조회한다. 로그가 쌓여도 페이지 비용이 일정하다.
+"""
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(when, pk):
+    raw = json.dumps([when.isoformat(), pk]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """encode_cursor 의 역. (datetime, pk)"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        when, pk = json.loads(raw)
+        return datetime.fromisoformat(when), int(pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+
+
+def parse_limit(value):
+    """?limit= 값. 없으면 기본값, 최대 MAX_LIMIT"""
+    if value in (None, ""):
+        return DEFAULT_LIMIT
+    return max(1, min(int(value), MAX_LIMIT))
+
+
+def keyset_condition(date_column, pk_column):
+    """
+    (date, pk) 내림차순 정렬에서 커서 다음 행들을 고르는 WHERE 조건.
+    파라미터는 [date, date, pk] 순서.
+    """
+    return f"({date_column} < %s OR ({date_column} = %s AND {pk_column} < %s))"
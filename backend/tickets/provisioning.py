@@ -0,0 +1,172 @@
+"""
+경기장 배치 템플릿으로 경기 좌석(seats) 일괄 생성
+
+템플릿(JSON)
+    {
+      "stadium": "잠실야구장",                  # --stadium 으로 이 경기장의 경기 전체에 생성
+      "prices": {"VIP": 70000, "R": 50000, "S": 30000},   # 등급 → 가격
+      "blocks": [
+        {"block": "A", "grade": "VIP", "rows": "1-5", "seats": "1-20"},
+        {"block": "B", "grade": "R", "rows": ["1", "2", "3"], "seats": "1-24",
+         "row_seats": {"3": "1-18"},            # 열마다 좌석 범위가 다르면
+         "row_grades": {"1": "VIP"}}            # 열마다 등급이 다르면
+      ]
+    }
+  범위는 "1-20"(숫자), "A-F"(한 글자), "7" 또는 이들의 목록
+
+- (match, block, row_no, seat_number) 가 이미 있는 좌석은 건너뛴다
+  → 중간에 끊겨도 같은 명령을 다시 실행하면 이어서 만든다
+  미리 읽은 목록 뒤에 다른 실행이 같은 좌석을 넣어도 INSERT 가 무시하므로
+  (UNIQUE uq_seat) 두 실행이 겹쳐도 오류 없이 끝난다
+- chunk_size 개씩 executemany(INSERT) 로 넣고 chunk 마다 커밋
+  (트랜잭션과 잠금을 짧게 유지, MySQL 에서는 다중 행 INSERT 한 번으로 전송됨)
+- 끝나면 matches.total_seats 를 실제 좌석 수로 맞추고
+  통계/잔여 좌석 요약/좌석 맵 캐시를 새 좌석 기준으로 다시 만든다 (finish)
+  좌석 맵 버전/배치 캐시는 공유 캐시에 있어야 서버 워커에도 반영된다.
+  캐시가 프로세스별(LocMem)이면 명령을 실행한 프로세스에만 적용되므로
+  워커를 재시작해야 한다 (provision_seats 가 경고를 출력)
+"""
+import json
+
+from django.db import connection, transaction
+
+from . import availability, matchlist, seatlayout, seatmap, seatshm, stats
+from .models import Seat
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# 이미 있는 좌석(uq_seat)은 무시 — 겹쳐 실행한 다른 provision 이 먼저 넣은 경우
+INSERT_SQL = {
+    "mysql": """
+        INSERT IGNORE INTO seats (match_id, block, row_no, seat_number, grade, price, is_reserved)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """,
+    # SQLite / PostgreSQL
+    "default": """
+        INSERT INTO seats (match_id, block, row_no, seat_number, grade, price, is_reserved)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (match_id, block, row_no, seat_number) DO NOTHING
+    """,
+}
+
+
+# ── 템플릿 ──────────────────────────────────────────────────────────────────
+
+def _expand(spec):
+    """범위 표기 → 라벨 목록"""
+    if isinstance(spec, list):
+        labels = []
+        for item in spec:
+            labels += _expand(item)
+        return labels
+    spec = str(spec).strip()
+    start, sep, end = spec.partition("-")
+    if not sep:
+        return [spec]
+    start, end = start.strip(), end.strip()
+    if start.isdigit() and end.isdigit() and int(start) <= int(end):
+        return [str(n) for n in range(int(start), int(end) + 1)]
+    if len(start) == 1 and len(end) == 1 and start.isalpha() and start <= end:
+        return [chr(c) for c in range(ord(start), ord(end) + 1)]
+    raise ValueError(f"범위 형식이 올바르지 않습니다: {spec!r}")
+
+
+def iter_seats(template):
+    """(block, row_no, seat_number, grade, price) — 템플릿 순서대로"""
+    prices = template.get("prices") or {}
+    for block in template.get("blocks") or []:
+        name = str(block["block"])
+        row_seats = block.get("row_seats") or {}
+        row_grades = block.get("row_grades") or {}
+        for row_no in _expand(block["rows"]):
+            grade = row_grades.get(row_no, block.get("grade"))
+            if grade not in prices:
+                raise ValueError(f"가격이 없는 등급입니다: block={name}, row={row_no}, grade={grade!r}")
+            for seat_number in _expand(row_seats.get(row_no, block["seats"])):
+                yield name, row_no, seat_number, grade, int(prices[grade])
+
+
+def load_template(path):
+    """템플릿 파일을 읽고 검사. 잘못됐으면 ValueError"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            template = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"템플릿을 읽을 수 없습니다: {e}")
+
+    if not template.get("blocks"):
+        raise ValueError("blocks 가 비어 있습니다.")
+
+    seen = set()
+    try:
+        for seat in iter_seats(template):
+            key = seat[:3]
+            if key in seen:
+                raise ValueError("중복된 좌석입니다: block={}, row={}, seat={}".format(*key))
+            seen.add(key)
+    except KeyError as e:
+        raise ValueError(f"블록에 {e.args[0]} 가 없습니다.")
+    return template
+
+
+# ── 생성 ────────────────────────────────────────────────────────────────────
+
+def existing_keys(match_id):
+    return set(
+        Seat.objects.filter(match_id=match_id).values_list("block", "row_no", "seat_number")
+    )
+
+
+def provision(match_id, template, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    경기 하나에 좌석 생성. 반환: (새로 넣은 수, 이미 있어서 건너뛴 수)
+    progress(처리한 수, 넣을 수) 는 chunk 를 커밋할 때마다 호출
+    """
+    existing = existing_keys(match_id)
+    pending = [
+        (match_id, *seat, False)
+        for seat in iter_seats(template)
+        if seat[:3] not in existing
+    ]
+    skipped = len(existing)
+
+    sql = INSERT_SQL.get(connection.vendor, INSERT_SQL["default"])
+    inserted = done = 0
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, chunk)
+            # 무시된 행(그 사이 다른 실행이 넣은 좌석)은 rowcount 에 들어가지 않음
+            count = cursor.rowcount if cursor.rowcount >= 0 else len(chunk)
+        inserted += count
+        skipped += len(chunk) - count
+        done += len(chunk)
+        if progress:
+            progress(done, len(pending))
+    return inserted, skipped
+
+
+def finish(match_ids):
+    """
+    좌석을 만든 경기들의 파생 데이터 갱신
+    - matches.total_seats = 실제 좌석 수 (경기 목록 캐시 무효화)
+    - match_stats / seat_availability 재집계
+    - 좌석 맵 버전을 새로 시작하고 배치/공유 비트맵을 다시 만듦
+      (공유 캐시일 때만 서버 워커에 반영됨, checks.cache_is_shared)
+    """
+    match_ids = list(match_ids)
+    with connection.cursor() as cursor:
+        for match_id in match_ids:
+            cursor.execute(
+                "UPDATE matches SET total_seats = (SELECT COUNT(*) FROM seats WHERE match_id = %s)"
+                " WHERE match_id = %s",
+                [match_id, match_id],
+            )
+    matchlist.invalidate()
+    stats.rebuild(match_ids)
+    availability.rebuild(match_ids)
+    for match_id in match_ids:
+        seatmap.reset(match_id)
+        seatlayout.get_layout(match_id, rebuild=True)
+        if seatshm.enabled():
+            seatshm.reconcile(match_id)
@@ -0,0 +1,171 @@
+"""
+좌석 상태 실시간 전송 (ASGI + Server-Sent Events)
+
+GET /api/matches/<match_id>/seats/events/ 로 연결하면 좌석이 예약/해제될 때마다
+  event: seats
+  data: {"version": 12, "changes": [{"seat_id": 1, "is_reserved": true}, ...]}
+를 보낸다. 연결 직후에는 현재 버전만 담은 빈 changes 를 한 번 보낸다.
+
+- 예매/취소/선점이 커밋되면 seatmap 이 publish 를 호출 (어느 스레드에서든 가능)
+- 구독자마다 "보낼 좌석 상태" dict 하나와 asyncio.Event 만 두고,
+  첫 변경 뒤 PUSH_COALESCE_MS 동안 모인 변경을 한 프레임으로 보낸다
+  (같은 좌석이 여러 번 바뀌면 마지막 상태만) → 유휴 구독자는 대기 중인 코루틴 하나
+- PUSH_HEARTBEAT 초마다 주석 줄을 보내 프록시가 연결을 끊지 않게 함
+
+브로커는 PUSH_BROKER(점 경로)로 바꿀 수 있다. 기본값 InProcessBroker 는 프로세스 안에서만
+전달하므로 워커가 여럿이면 redis pub/sub 등으로 Broker 를 구현해서 지정한다.
+WSGI 로 실행하면 스트림을 유지할 수 없으므로 이 API 는 ASGI 서버에서만 동작한다.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def _conf(name, default):
+    return getattr(settings, f"PUSH_{name}", default)
+
+
+class Subscriber:
+    """SSE 연결 하나. 이벤트 루프 스레드에서만 건드림"""
+
+    __slots__ = ("match_id", "loop", "pending", "version", "wakeup")
+
+    def __init__(self, match_id, loop):
+        self.match_id = match_id
+        self.loop = loop
+        self.pending = {}  # seat_id -> is_reserved
+        self.version = None
+        self.wakeup = asyncio.Event()
+
+    def offer(self, version, seat_id, is_reserved):
+        self.pending.pop(seat_id, None)
+        self.pending[seat_id] = is_reserved
+        if self.version is None or version > self.version:
+            self.version = version
+        self.wakeup.set()
+
+    def take(self):
+        changes = [
+            {"seat_id": seat_id, "is_reserved": is_reserved}
+            for seat_id, is_reserved in self.pending.items()
+        ]
+        self.pending.clear()
+        self.wakeup.clear()
+        return changes
+
+
+class Broker:
+    """
+    브로커 인터페이스
+      publish(match_id, version, seat_id, is_reserved) : 어느 스레드에서든 호출
+      subscribe(subscriber) / unsubscribe(subscriber)  : 이벤트 루프에서 호출
+    수신한 변경은 subscriber.loop 에서 subscriber.offer(...) 로 넘긴다.
+    """
+
+    def publish(self, match_id, version, seat_id, is_reserved):
+        raise NotImplementedError
+
+    def subscribe(self, subscriber):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscriber):
+        raise NotImplementedError
+
+
+class InProcessBroker(Broker):
+    """프로세스 안 전달 (단일 노드 / 워커 1개)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}  # match_id -> {loop: set(subscriber)}
+
+    def subscribe(self, subscriber):
+        with self._lock:
+            loops = self._channels.setdefault(subscriber.match_id, {})
+            loops.setdefault(subscriber.loop, set()).add(subscriber)
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            loops = self._channels.get(subscriber.match_id, {})
+            subs = loops.get(subscriber.loop)
+            if subs is not None:
+                subs.discard(subscriber)
+                if not subs:
+                    del loops[subscriber.loop]
+            if not loops:
+                self._channels.pop(subscriber.match_id, None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subs) for loops in self._channels.values() for subs in loops.values())
+
+    def publish(self, match_id, version, seat_id, is_reserved):
+        with self._lock:
+            targets = [(loop, list(subs)) for loop, subs in self._channels.get(match_id, {}).items()]
+        # 루프마다 한 번만 깨워서 그 루프의 구독자에게 나눠 줌
+        for loop, subs in targets:
+            try:
+                loop.call_soon_threadsafe(_deliver, subs, version, seat_id, is_reserved)
+            except RuntimeError:
+                # 루프가 이미 닫힘
+                pass
+
+
+def _deliver(subs, version, seat_id, is_reserved):
+    for sub in subs:
+        sub.offer(version, seat_id, is_reserved)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(_conf("BROKER", "tickets.push.InProcessBroker"))()
+    return _broker
+
+
+def publish(match_id, version, seat_id, is_reserved):
+    """커밋된 좌석 상태 변경 전송 (seatmap 에서 호출). 실패해도 예매 흐름은 막지 않음"""
+    try:
+        get_broker().publish(match_id, version, seat_id, is_reserved)
+    except Exception:
+        logger.exception("좌석 변경 전송 실패 (match_id=%s, seat_id=%s)", match_id, seat_id)
+
+
+def _frame(version, changes):
+    data = json.dumps({"version": version, "changes": changes}, separators=(",", ":"))
+    return f"event: seats\ndata: {data}\n\n"
+
+
+async def stream(match_id, version):
+    """SSE 본문 (async generator). 연결이 끊기면 구독 해제"""
+    broker = get_broker()
+    sub = Subscriber(match_id, asyncio.get_running_loop())
+    sub.version = version
+    broker.subscribe(sub)
+    coalesce = _conf("COALESCE_MS", 200) / 1000
+    heartbeat = _conf("HEARTBEAT", 15)
+    try:
+        yield "retry: 3000\n" + _frame(version, [])
+        while True:
+            try:
+                await asyncio.wait_for(sub.wakeup.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if coalesce:
+                await asyncio.sleep(coalesce)
+            yield _frame(sub.version, sub.take())
+    finally:
+        broker.unsubscribe(sub)
@@ -0,0 +1,147 @@
+"""
+request_log 비동기 버퍼 기록기
+
+- log_request 는 큐에 넣기만 하고 바로 반환 (예매 트랜잭션이 로그 INSERT 를 기다리지 않음)
+- 백그라운드 스레드가 REQUEST_LOG_BATCH_SIZE 개가 모이거나
+  REQUEST_LOG_FLUSH_INTERVAL 초가 지나면 multi-row INSERT 로 한 번에 기록
+- 큐가 가득 차면 버리고 dropped 카운트만 올림 (예매 처리를 막지 않는 것이 우선)
+- 프로세스 종료 시(atexit) 남은 로그를 모두 기록
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = "(user_id, match_id, seat_id, action, success, fail_reason, ip, user_agent)"
+PLACEHOLDER = "(%s, %s, %s, %s, %s, %s, %s, %s)"
+
+
+def write_rows(rows):
+    """request_log 에 여러 행을 INSERT 한 번으로 기록"""
+    if not rows:
+        return
+    values = ", ".join([PLACEHOLDER] * len(rows))
+    params = [v for row in rows for v in row]
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO request_log {COLUMNS} VALUES {values}", params)
+
+
+class RequestLogWriter:
+    def __init__(self, max_queue=10000, batch_size=200, flush_interval=1.0):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if (self._thread is None or not self._thread.is_alive()) and not self._stopping.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="request-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def put(self, row):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _take_batch(self):
+        """batch_size 개가 모이거나 flush_interval 이 지날 때까지 모음"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        try:
+            write_rows(batch)
+            with self._lock:
+                self.written += len(batch)
+        except Exception:
+            logger.exception("request_log 기록 실패 (%d건)", len(batch))
+            with self._lock:
+                self.failed += len(batch)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            # 예외로 스레드가 끝나면 이후 로그가 큐에만 쌓이므로 기록하고 계속
+            try:
+                batch = self._take_batch()
+                if batch:
+                    close_old_connections()
+                    self._flush(batch)
+            except Exception:
+                logger.exception("request_log 기록 스레드 오류")
+
+    def drain(self):
+        """큐에 남은 로그를 호출한 스레드에서 모두 기록"""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._flush(batch)
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.drain()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self.queue.qsize(),
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
+writer = RequestLogWriter(
+    max_queue=getattr(settings, "REQUEST_LOG_QUEUE_SIZE", 10000),
+    batch_size=getattr(settings, "REQUEST_LOG_BATCH_SIZE", 200),
+    flush_interval=getattr(settings, "REQUEST_LOG_FLUSH_INTERVAL", 1.0),
+)
+atexit.register(writer.stop)
+
+
+def enqueue(row):
+    """
+    row = (user_id, match_id, seat_id, action, success, fail_reason, ip, user_agent)
+    REQUEST_LOG_ASYNC = False 면 예전처럼 바로 INSERT
+    """
+    if getattr(settings, "REQUEST_LOG_ASYNC", True):
+        writer.put(row)
+    else:
+        write_rows([row])
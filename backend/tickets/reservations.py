@@ -0,0 +1,330 @@
+"""
+예매 처리 (좌석 선점 + 예매/결제 생성)
+
+- 좌석은 UPDATE 한 번으로 잠그고 조건을 확인한다.
+  "아직 비어 있고, 그 경기의 좌석이고, 사용자가 4좌석 미만일 때만" 1행이 걸림
+  (4좌석에는 active 예매와 만료되지 않은 hold 를 모두 셈)
+  → 경쟁에서 진 요청은 트리거 예외 없이 바로 실패
+- is_reserved = 1 은 예매 INSERT 후 트리거가 설정한다
+  (운영 트리거는 is_reserved = 1 인 좌석의 INSERT 를 거부하므로 미리 1 로 바꾸면 안 됨)
+- 데드락/락 대기 타임아웃은 짧게 재시도 (지수 백오프)
+- 실패 사유는 한국어 메시지 대신 code 로 구분
+- DB 트리거는 그대로 두고 최종 안전장치로 사용
+"""
+import random
+import time
+
+from django.db import connection, transaction, DatabaseError, OperationalError
+from django.utils import timezone
+
+from . import seatmap, stats
+from .models import Reservation, Payment, Seat
+
+MAX_SEATS_PER_USER = 4
+
+# 데드락 재시도 설정
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.02  # 초
+BACKOFF_MAX = 0.2
+
+# MySQL: 1213 = deadlock, 1205 = lock wait timeout
+RETRYABLE_MYSQL_ERRORS = (1213, 1205)
+
+# 실패 코드
+INVALID_REQUEST = "INVALID_REQUEST"
+SEAT_NOT_FOUND = "SEAT_NOT_FOUND"
+MATCH_MISMATCH = "MATCH_MISMATCH"
+SEAT_TAKEN = "SEAT_TAKEN"
+SEAT_LIMIT = "SEAT_LIMIT"
+DEADLOCK = "DEADLOCK"
+RESERVE_FAILED = "RESERVE_FAILED"
+BATCH_ABORTED = "BATCH_ABORTED"
+HOLD_NOT_FOUND = "HOLD_NOT_FOUND"
+HOLD_EXPIRED = "HOLD_EXPIRED"
+
+ERROR_MESSAGES = {
+    INVALID_REQUEST: "요청 값이 올바르지 않습니다.",
+    SEAT_NOT_FOUND: "존재하지 않는 좌석입니다.",
+    MATCH_MISMATCH: "예약 경기와 좌석의 경기가 일치하지 않습니다.",
+    SEAT_TAKEN: "이미 예약된 좌석입니다.",
+    SEAT_LIMIT: "한 경기당 최대 4좌석까지 예매 가능합니다.",
+    DEADLOCK: "요청이 몰려 처리하지 못했습니다. 잠시 후 다시 시도해주세요.",
+    RESERVE_FAILED: "예매 처리 중 오류가 발생했습니다.",
+    BATCH_ABORTED: "함께 요청한 다른 좌석을 예매할 수 없어 취소되었습니다.",
+    HOLD_NOT_FOUND: "좌석 선점 정보를 찾을 수 없습니다.",
+    HOLD_EXPIRED: "좌석 선점 시간이 만료되었습니다. 다시 선택해주세요.",
+}
+
+ERROR_STATUS = {
+    SEAT_NOT_FOUND: 404,
+    HOLD_NOT_FOUND: 404,
+    SEAT_TAKEN: 409,
+    DEADLOCK: 503,
+}
+
+
+class ReservationError(Exception):
+    def __init__(self, code):
+        self.code = code
+        self.message = ERROR_MESSAGES[code]
+        self.status = ERROR_STATUS.get(code, 400)
+        super().__init__(self.message)
+
+    def as_dict(self):
+        return {"error": self.message, "code": self.code}
+
+
+class BatchReservationError(ReservationError):
+    """
+    여러 좌석 예매 실패. results 에 좌석별 결과
+    [{"seat_id": 1, "status": "failed", "code": "SEAT_TAKEN"}, ...]
+    """
+    def __init__(self, code, results):
+        super().__init__(code)
+        self.results = results
+
+    def as_dict(self):
+        data = super().as_dict()
+        data["results"] = self.results
+        return data
+
+
+def is_retryable(exc):
+    """데드락/락 대기 타임아웃(또는 SQLite 잠금) 여부"""
+    if not isinstance(exc, OperationalError) or not exc.args:
+        return False
+    code = exc.args[0]
+    if isinstance(code, int):
+        return code in RETRYABLE_MYSQL_ERRORS
+    return "locked" in str(code)
+
+
+def with_retry(func, *args, **kwargs):
+    """
+    func 를 트랜잭션 안에서 실행하고, 데드락이면 백오프 후 재시도.
+    재시도를 다 써도 실패하면 ReservationError(DEADLOCK)
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return func(*args, **kwargs)
+        except OperationalError as e:
+            if not is_retryable(e):
+                raise
+            if attempt == MAX_ATTEMPTS - 1:
+                raise ReservationError(DEADLOCK) from e
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+
+
+# 사용자가 그 경기에서 가진 좌석 수 (active 예매 + 만료되지 않은 hold)
+# 파라미터: user_id, match_id, user_id, match_id, 현재 시각
+OWNED_COUNT_SQL = """
+    (SELECT COUNT(*)
+     FROM reservations
+     WHERE user_id = %s
+       AND match_id = %s
+       AND status = 'active')
+    + (SELECT COUNT(*)
+       FROM seat_holds
+       WHERE user_id = %s
+         AND match_id = %s
+         AND expires_at > %s)
+"""
+
+
+def _owned_count_params(user_id, match_id):
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    return [user_id, match_id, user_id, match_id, now]
+
+
+def owned_count(user_id, match_id):
+    """active 예매 + 만료되지 않은 hold 수"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT " + OWNED_COUNT_SQL, _owned_count_params(user_id, match_id))
+        return cursor.fetchone()[0]
+
+
+def claim_seat(user_id, match_id, seat_id):
+    """
+    좌석 선점 (UPDATE 1회). 성공하면 True
+    값은 바꾸지 않고 행만 잠금 → 같은 트랜잭션의 예매 INSERT 때 트리거가 is_reserved = 1
+    (MySQL 도 Django 가 CLIENT.FOUND_ROWS 로 연결하므로 rowcount 는 조건에 맞은 행 수)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE seats
+            SET is_reserved = 0
+            WHERE seat_id = %s
+              AND match_id = %s
+              AND is_reserved = 0
+              AND ({owned}) < %s
+            """.format(owned=OWNED_COUNT_SQL),
+            [seat_id, match_id, *_owned_count_params(user_id, match_id), MAX_SEATS_PER_USER],
+        )
+        return cursor.rowcount == 1
+
+
+def diagnose_claim(user_id, match_id, seat_id):
+    """
+    선점 실패 원인 코드 (실패한 경우에만 조회)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                s.match_id,
+                s.is_reserved,
+                ({owned}) AS active_count
+            FROM seats s
+            WHERE s.seat_id = %s
+            """.format(owned=OWNED_COUNT_SQL),
+            [*_owned_count_params(user_id, match_id), seat_id],
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return SEAT_NOT_FOUND
+    seat_match_id, is_reserved, active_count = row
+    if seat_match_id != match_id:
+        return MATCH_MISMATCH
+    if is_reserved:
+        return SEAT_TAKEN
+    if active_count >= MAX_SEATS_PER_USER:
+        return SEAT_LIMIT
+    return RESERVE_FAILED
+
+
+def _reserve_once(user_id, match_id, seat_id, amount, method):
+    if not claim_seat(user_id, match_id, seat_id):
+        raise ReservationError(diagnose_claim(user_id, match_id, seat_id))
+
+    now = timezone.now()
+    reservation = Reservation.objects.create(
+        user_id=user_id,
+        match_id=match_id,
+        seat_id=seat_id,
+        res_date=now,
+        status="active",
+    )
+    Payment.objects.create(
+        res=reservation,
+        amount=amount,
+        method=method,
+        pay_date=now,
+    )
+
+    # 좌석 맵 버전 / 경기 통계 갱신 (커밋 후 반영)
+    seatmap.record_change(match_id, seat_id, True)
+    stats.record(match_id, seats=1, reservations=1, sales=amount)
+    return reservation
+
+
+def reserve_seat(user_id, match_id, seat_id, amount, method):
+    """
+    좌석 1개 예매 + 결제 생성. 실패하면 ReservationError
+    """
+    try:
+        return with_retry(_reserve_once, user_id, match_id, seat_id, amount, method)
+    except ReservationError:
+        raise
+    except DatabaseError as e:
+        # 트리거 등에서 막힌 경우: 롤백된 상태에서 원인 다시 판별
+        code = diagnose_claim(user_id, match_id, seat_id)
+        raise ReservationError(code) from e
+
+
+def _reserve_batch_once(user_id, match_id, seat_ids, method):
+    # 항상 seat_id 순서로 잠가서 요청끼리 서로 반대 순서로 기다리는 데드락을 막음
+    seats = {
+        s.seat_id: s
+        for s in Seat.objects.select_for_update().filter(pk__in=seat_ids).order_by("seat_id")
+    }
+
+    codes = {}
+    for seat_id in seat_ids:
+        seat = seats.get(seat_id)
+        if seat is None:
+            codes[seat_id] = SEAT_NOT_FOUND
+        elif seat.match_id != match_id:
+            codes[seat_id] = MATCH_MISMATCH
+        elif seat.is_reserved:
+            codes[seat_id] = SEAT_TAKEN
+
+    if not codes:
+        if owned_count(user_id, match_id) + len(seat_ids) > MAX_SEATS_PER_USER:
+            codes = {seat_id: SEAT_LIMIT for seat_id in seat_ids}
+
+    if codes:
+        results = [
+            {"seat_id": seat_id, "status": "failed", "code": codes.get(seat_id, BATCH_ABORTED)}
+            for seat_id in seat_ids
+        ]
+        first = next(r["code"] for r in results if r["code"] != BATCH_ABORTED)
+        raise BatchReservationError(first, results)
+
+    # 좌석은 위에서 잠갔고, is_reserved = 1 은 INSERT 후 트리거가 설정
+    now = timezone.now()
+    Reservation.objects.bulk_create([
+        Reservation(
+            user_id=user_id,
+            match_id=match_id,
+            seat_id=seat_id,
+            res_date=now,
+            status="active",
+        )
+        for seat_id in seat_ids
+    ])
+    # MySQL 은 bulk_create 후 PK 를 돌려주지 않으므로 다시 조회
+    res_ids = dict(
+        Reservation.objects.filter(
+            user_id=user_id, match_id=match_id, seat_id__in=seat_ids, status="active"
+        ).values_list("seat_id", "res_id")
+    )
+
+    Payment.objects.bulk_create([
+        Payment(
+            res_id=res_ids[seat_id],
+            amount=seats[seat_id].price,
+            method=method,
+            pay_date=now,
+        )
+        for seat_id in seat_ids
+    ])
+
+    for seat_id in seat_ids:
+        seatmap.record_change(match_id, seat_id, True)
+    stats.record(
+        match_id,
+        seats=len(seat_ids),
+        reservations=len(seat_ids),
+        sales=sum(seats[seat_id].price for seat_id in seat_ids),
+    )
+
+    return [
+        {
+            "seat_id": seat_id,
+            "status": "reserved",
+            "reservation_id": res_ids[seat_id],
+            "amount": seats[seat_id].price,
+        }
+        for seat_id in seat_ids
+    ]
+
+
+def reserve_seats(user_id, match_id, seat_ids, method):
+    """
+    여러 좌석을 한 트랜잭션에서 모두 예매하거나 모두 실패.
+    결제 금액은 좌석 가격을 사용한다.
+    성공하면 좌석별 결과 리스트, 실패하면 BatchReservationError
+    """
+    if not seat_ids or len(seat_ids) > MAX_SEATS_PER_USER or len(set(seat_ids)) != len(seat_ids):
+        raise ReservationError(INVALID_REQUEST)
+
+    try:
+        return with_retry(_reserve_batch_once, user_id, match_id, seat_ids, method)
+    except ReservationError:
+        raise
+    except DatabaseError as e:
+        raise ReservationError(RESERVE_FAILED) from e
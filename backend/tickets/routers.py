@@ -0,0 +1,96 @@
+"""
+읽기 전용 복제본(replica) 라우팅
+
+- settings.DATABASES 에 "replica" 가 있을 때만 동작 (없으면 모두 default)
+- @use_replica 를 붙인 조회 전용 뷰에서만 읽기를 replica 로 보냄
+  (예매/취소 등 나머지 뷰와 트랜잭션 안의 조회는 항상 default)
+- 쓰기를 한 사용자는 REPLICA_READ_YOUR_WRITES 초 동안 default 에서 읽음
+  (복제 지연 때문에 방금 한 예매가 안 보이는 문제 방지)
+- raw SQL 은 connection 대신 read_connection() 을 사용
+"""
+import contextvars
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+
+_read_alias = contextvars.ContextVar("tickets_read_alias", default=None)
+
+
+def replica_enabled():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def mark_write(user_id):
+    """user_id 가 방금 쓰기를 함 → 일정 시간 동안 default 에서 읽게 함"""
+    window = getattr(settings, "REPLICA_READ_YOUR_WRITES", 5)
+    if user_id is None or not window or not replica_enabled():
+        return
+    cache.set(_pin_key(user_id), 1, window)
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(_pin_key(user_id)) is not None
+
+
+def read_alias():
+    """지금 읽기에 쓸 DB alias"""
+    alias = _read_alias.get()
+    if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+def read_connection():
+    """raw SQL 조회용 connection (replica 를 쓸 수 없으면 default)"""
+    return connections[read_alias()]
+
+
+def _request_user_id(request):
+    """mark_write 와 같은 사용자로 고정 여부를 봄 (토큰 요청은 ?user_id= 가 없음)"""
+    user_id = getattr(request, "auth_user_id", None)
+    if user_id is None:
+        user_id = request.GET.get("user_id") or None
+    return user_id
+
+
+def use_replica(view):
+    """
+    조회 전용 뷰에 붙이는 데코레이터.
+    요청한 사용자(토큰의 사용자, 없으면 ?user_id=)가 최근에 쓰기를 했다면 default 유지
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not replica_enabled() or is_pinned(_request_user_id(request)):
+            return view(request, *args, **kwargs)
+        token = _read_alias.set(REPLICA_ALIAS)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """settings.DATABASE_ROUTERS 에 등록"""
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replica 는 default 를 복제하므로 마이그레이션하지 않음
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,186 @@
+"""
+대형 경기장용 압축 좌석 맵
+
+좌석 목록을 좌석마다 객체로 보내지 않고 둘로 나눈다.
+
+- 배치(layout): 거의 바뀌지 않는 정보. 오래 캐시해도 됨
+    {
+      "match_id": 1,
+      "layout": "3f2a...",            # 배치 해시 (좌석 구성이 바뀌면 달라짐)
+      "count": 3,                     # 좌석 수 = 비트맵 길이
+      "tiers": [["VIP", 50000], ...], # 등급/가격 표
+      "blocks": [
+        {"block": "A", "rows": [
+          {"row_no": "1",
+           "ids": [[1, 3]],           # [시작 seat_id, 개수] — 1씩 증가하는 구간
+           "numbers": [[1, 3]],       # [시작 좌석 번호, 개수] — 숫자가 아니면 문자열 목록
+           "tiers": [[0, 3]]}         # [tiers 인덱스, 개수]
+        ]}
+      ]
+    }
+  좌석 순번(ordinal)은 block → rows → 좌석 순서대로 0 부터 센다.
+  블록/열/좌석 번호는 자연 정렬 (숫자면 숫자 크기로: "2" < "10", 숫자가 아니면 문자열 순)
+
+- 예약 비트맵(bitmap): 순번 i 좌석이 예약됐으면 i 번째 비트가 1 (바이트 안에서는 상위 비트부터)
+    {"version": 12, "layout": "3f2a...", "count": 3, "bits": "<base64>"}
+  좌석 맵 버전(seatmap)마다 캐시. layout 이 클라이언트가 가진 값과 다르면 배치를 다시 받는다.
+
+배치 캐시는 seatmap.reset (좌석 구성 변경) 때 invalidate 로 지운다.
+"""
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from .models import Seat
+
+# 배치 캐시 시간(초)
+LAYOUT_TTL = 3600
+# 비트맵 캐시 시간(초). 버전별로 캐시하므로 길 필요 없음
+BITMAP_TTL = 30
+
+
+def _layout_key(match_id):
+    return f"seatmap:{match_id}:layout"
+
+
+def _bitmap_key(match_id, version):
+    return f"seatmap:{match_id}:bitmap:{version}"
+
+
+def natural_key(value):
+    """'2' < '10' 처럼 숫자인 값은 숫자 크기로, 나머지는 숫자 뒤에 문자열 순으로"""
+    if value.isdigit():
+        return (0, int(value), value)
+    return (1, 0, value)
+
+
+def ordered_seats(match_id, *fields):
+    """
+    좌석 순번 순서로 조회 [(fields...), ...]
+    DB 의 ORDER BY 는 문자열 순("10" < "2")이므로 읽은 뒤 자연 정렬
+    """
+    rows = Seat.objects.filter(match_id=match_id).values_list(*fields, "block", "row_no", "seat_number")
+    rows = sorted(rows, key=lambda r: (natural_key(r[-3]), natural_key(r[-2]), natural_key(r[-1])))
+    return [r[:len(fields)] for r in rows]
+
+
+def _runs(values, step):
+    """[(시작 값, 개수), ...]. step=1 이면 1씩 증가하는 구간, 0 이면 같은 값 구간"""
+    runs = []
+    for v in values:
+        if runs and runs[-1][0] + runs[-1][1] * step == v:
+            runs[-1][1] += 1
+        else:
+            runs.append([v, 1])
+    return runs
+
+
+def _number_runs(numbers):
+    try:
+        ints = [int(n) for n in numbers]
+    except ValueError:
+        return list(numbers)
+    if [str(n) for n in ints] != list(numbers):
+        # '01' 처럼 숫자로 바꾸면 모양이 달라지는 번호
+        return list(numbers)
+    return _runs(ints, 1)
+
+
+def build_layout(match_id):
+    """(layout JSON 문자열, 배치 해시, seat_id 목록(순번 순서))"""
+    rows = list(ordered_seats(match_id, "seat_id", "block", "row_no", "seat_number", "grade", "price"))
+
+    tiers = {}
+    blocks = []
+    current_row = None
+    for seat_id, block, row_no, seat_number, grade, price in rows:
+        tier = tiers.setdefault((grade, price), len(tiers))
+        if not blocks or blocks[-1]["block"] != block:
+            blocks.append({"block": block, "rows": []})
+            current_row = None
+        if current_row is None or current_row["row_no"] != row_no:
+            current_row = {"row_no": row_no, "ids": [], "numbers": [], "tiers": []}
+            blocks[-1]["rows"].append(current_row)
+        current_row["ids"].append(seat_id)
+        current_row["numbers"].append(seat_number)
+        current_row["tiers"].append(tier)
+
+    for block in blocks:
+        for row in block["rows"]:
+            row["ids"] = _runs(row["ids"], 1)
+            row["numbers"] = _number_runs(row["numbers"])
+            row["tiers"] = _runs(row["tiers"], 0)
+
+    seat_ids = [r[0] for r in rows]
+    layout_hash = hashlib.md5(
+        json.dumps([blocks, list(tiers)], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()[:16]
+
+    body = json.dumps(
+        {
+            "match_id": match_id,
+            "layout": layout_hash,
+            "count": len(rows),
+            "tiers": [list(t) for t in tiers],
+            "blocks": blocks,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return body, layout_hash, seat_ids
+
+
+def invalidate(match_id):
+    """좌석 구성이 바뀌면 배치 캐시 삭제 (seatmap.reset 에서 호출)"""
+    cache.delete(_layout_key(match_id))
+
+
+def get_layout(match_id, rebuild=False):
+    """(layout JSON 문자열, 배치 해시, seat_id 목록)"""
+    key = _layout_key(match_id)
+    entry = None if rebuild else cache.get(key)
+    if entry is None:
+        entry = build_layout(match_id)
+        cache.set(key, entry, LAYOUT_TTL)
+    return entry
+
+
+def pack_bits(flags):
+    """[bool, ...] → bytes (순번 i → i 번째 비트, 상위 비트부터)"""
+    bits = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            bits[i >> 3] |= 0x80 >> (i & 7)
+    return bytes(bits)
+
+
+def bitmap_json(version, layout_hash, count, bits):
+    return '{"version":%d,"layout":"%s","count":%d,"bits":"%s"}' % (
+        version,
+        layout_hash,
+        count,
+        base64.b64encode(bits).decode("ascii"),
+    )
+
+
+def get_bitmap(match_id, version):
+    """
+    DB 에서 읽은 예약 비트맵 JSON 문자열. 같은 버전이면 캐시된 값을 그대로 쓴다.
+    좌석 구성이 캐시된 배치와 다르면(좌석 추가 등) 배치도 다시 만든다.
+    (노드 공유 비트맵은 seatshm.get_bitmap)
+    """
+    key = _bitmap_key(match_id, version)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    rows = list(ordered_seats(match_id, "seat_id", "is_reserved"))
+    _, layout_hash, seat_ids = get_layout(match_id)
+    if seat_ids != [r[0] for r in rows]:
+        _, layout_hash, seat_ids = get_layout(match_id, rebuild=True)
+
+    data = bitmap_json(version, layout_hash, len(rows), pack_bits([r[1] for r in rows]))
+    cache.set(key, data, BITMAP_TTL)
+    return data
@@ -0,0 +1,147 @@
+"""
+경기별 좌석 맵 버전 관리
+
+- 예매/취소가 커밋될 때마다 경기별 버전 카운터를 1 올리고,
+  그 버전에서 바뀐 좌석(seat_id, is_reserved)을 변경 로그로 남긴다.
+- 좌석 목록 API는 버전으로 ETag 를 만들고, ?since=<version> 요청에는
+  변경 로그만 돌려준다.
+- 값은 Django 캐시에 저장하므로 워커가 여러 개면 공유 캐시가 필요하다
+  (settings.CACHE_URL → Redis. 프로세스별 LocMem 이면 시스템 체크 tickets.E001 이 막음)
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from . import availability, push, seatlayout, seatshm
+from .models import Seat
+from .serializers import BOOL, INT, STR, RowLayout
+
+# 변경 로그 보관 시간(초). 이보다 오래된 since 요청은 전체 목록으로 응답
+CHANGE_TTL = 600
+# 전체 좌석 목록 스냅샷 캐시 시간(초)
+SNAPSHOT_TTL = 30
+# 한 번에 돌려줄 최대 변경 건수. 넘으면 전체 목록으로 응답
+MAX_DELTA = 1000
+
+SEAT_LAYOUT = RowLayout([
+    ("seat_id", INT),
+    ("block", STR),
+    ("row_no", STR),
+    ("seat_number", STR),
+    ("grade", STR),
+    ("price", INT),
+    ("is_reserved", BOOL),
+])
+
+
+def _version_key(match_id):
+    return f"seatmap:{match_id}:version"
+
+
+def _change_key(match_id, version):
+    return f"seatmap:{match_id}:change:{version}"
+
+
+def _snapshot_key(match_id, version):
+    return f"seatmap:{match_id}:snapshot:{version}"
+
+
+def current_version(match_id):
+    """
+    경기의 현재 좌석 맵 버전.
+    캐시에 없으면 현재 시각(ms)으로 시작해서, 캐시가 비워진 뒤에도
+    예전 버전 번호와 겹치지 않게 한다.
+    """
+    key = _version_key(match_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def reset(match_id):
+    """
+    좌석 구성이 바뀐 뒤(좌석 추가 등) 호출.
+    변경 로그로 이어 갈 수 없는 새 버전으로 건너뛰어
+    스냅샷/비트맵/추천 색인이 모두 전체를 다시 읽게 한다. (배치 캐시도 삭제)
+    """
+    seatlayout.invalidate(match_id)
+    key = _version_key(match_id)
+    version = max(int(time.time() * 1000), current_version(match_id) + MAX_DELTA + 1)
+    cache.set(key, version, timeout=None)
+    return version
+
+
+def make_etag(match_id, version, kind="seats"):
+    return f'"{kind}-{match_id}-{version}"'
+
+
+def _bump(match_id, seat_id, is_reserved):
+    # 새 버전을 본 조회가 바뀐 비트도 보도록 공유 비트맵을 먼저 갱신
+    seatshm.set_seat(match_id, seat_id, is_reserved)
+    current_version(match_id)
+    try:
+        version = cache.incr(_version_key(match_id))
+    except ValueError:
+        # 그 사이 키가 사라졌으면 새로 시작
+        version = current_version(match_id)
+    cache.set(_change_key(match_id, version), (seat_id, is_reserved), CHANGE_TTL)
+    push.publish(match_id, version, seat_id, is_reserved)
+    availability.record(match_id, seat_id, is_reserved)
+
+
+def record_change(match_id, seat_id, is_reserved):
+    """
+    좌석 상태 변경 기록. 트랜잭션이 커밋된 뒤에만 버전을 올린다.
+    """
+    transaction.on_commit(lambda: _bump(int(match_id), seat_id, bool(is_reserved)))
+
+
+def changes_since(match_id, since, version):
+    """
+    since 이후 바뀐 좌석 목록 [{seat_id, is_reserved}, ...]
+    변경 로그가 빠져 있거나 너무 많으면 None (→ 전체 목록으로 응답)
+    """
+    if since == version:
+        return []
+    if since > version or version - since > MAX_DELTA:
+        return None
+
+    keys = [_change_key(match_id, v) for v in range(since + 1, version + 1)]
+    found = cache.get_many(keys)
+    if len(found) != len(keys):
+        return None
+
+    # 같은 좌석이 여러 번 바뀌었으면 마지막 상태만
+    latest = {}
+    for key in keys:
+        seat_id, is_reserved = found[key]
+        latest.pop(seat_id, None)
+        latest[seat_id] = is_reserved
+
+    return [
+        {"seat_id": seat_id, "is_reserved": is_reserved}
+        for seat_id, is_reserved in latest.items()
+    ]
+
+
+def seat_snapshot(match_id, version):
+    """
+    전체 좌석 목록 (직렬화된 JSON 배열 문자열). 같은 버전이면 캐시된 문자열을 그대로 쓴다.
+    버전을 먼저 읽고 목록을 조회하므로 스냅샷은 항상 그 버전 이상으로 최신이다.
+    """
+    key = _snapshot_key(match_id, version)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    rows = (
+        Seat.objects.filter(match_id=match_id)
+        .order_by("block", "row_no", "seat_number")
+        .values_list(*SEAT_LAYOUT.names)
+    )
+    data = SEAT_LAYOUT.dumps(rows)
+    cache.set(key, data, SNAPSHOT_TTL)
+    return data
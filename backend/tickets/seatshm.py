@@ -0,0 +1,296 @@
+"""
+노드 공유 좌석 예약 비트맵 (mmap)
+
+같은 노드의 워커들이 SEAT_SHM_DIR 아래 경기별 파일 하나를 mmap 으로 같이 쓴다.
+좌석 목록의 format=bitmap 조회는 DB 를 읽지 않고 이 파일에서 바로 응답한다.
+
+- 파일: 헤더(32바이트) + 비트맵. 비트 순서는 seatlayout 의 좌석 순번과 같음
+    magic "SEAT" / 좌석 수(uint32) / 배치 해시(16바이트) / 마지막 대조 시각(float64)
+- 쓰기: 예매/취소/선점이 커밋되면 seatmap 이 set_seat 로 비트를 바꾼다
+  (flock 으로 워커끼리, threading.Lock 으로 스레드끼리 직렬화)
+- 대조(reconcile): seats.is_reserved 를 읽어 비트맵 전체를 다시 쓴다.
+  조회 시 SEAT_SHM_RECONCILE_INTERVAL 초가 지났으면 한 워커가 대신 수행하고,
+  reconcile_seat_bitmaps 명령으로 주기적으로 돌릴 수도 있다.
+  대조 중에는 파일 락을 잡고 있으므로 그 사이 커밋된 변경이 덮어써지지 않는다.
+- 읽기: 공유 락(LOCK_SH)을 잡고 복사하므로 대조 중인 반쯤 쓰인 비트맵을 보지 않는다.
+- 파일은 경기가 있는 것을 확인한 뒤에만 만든다 (없는 match_id 로 파일이 생기지 않게)
+
+SEAT_SHM_DIR 이 없거나 fcntl 을 쓸 수 없는 환경(Windows)에서는 꺼진다.
+파일은 줄이지 않는다 (다른 워커가 mmap 한 영역이 사라지지 않도록).
+"""
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+
+from . import seatlayout
+from .models import Match
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SEAT"
+HEADER = struct.Struct("<4sI16sd")
+
+
+def _conf(name, default):
+    return getattr(settings, f"SEAT_SHM_{name}", default)
+
+
+def enabled():
+    return fcntl is not None and bool(_conf("DIR", None))
+
+
+def _path(match_id):
+    return os.path.join(_conf("DIR", None), f"match-{int(match_id)}.bits")
+
+
+class _SharedBitmap:
+    """경기 하나의 매핑 (프로세스마다 하나)"""
+
+    def __init__(self, match_id):
+        self.match_id = match_id
+        self.lock = threading.Lock()
+        self.fd = None
+        self.mm = None
+        self.ordinals = {}  # seat_id -> 순번
+        self.layout_hash = None
+
+    # --- 파일 ---
+    def open(self, create=False):
+        """파일을 연다 (create 가 아니면 없는 파일은 만들지 않음). 열려 있으면 True"""
+        with self.lock:
+            if self.fd is None:
+                flags = os.O_RDWR
+                if create:
+                    os.makedirs(_conf("DIR", None), exist_ok=True)
+                    flags |= os.O_CREAT
+                try:
+                    self.fd = os.open(_path(self.match_id), flags, 0o644)
+                except FileNotFoundError:
+                    return False
+            return True
+
+    def _header(self):
+        if self.mm is None or len(self.mm) < HEADER.size:
+            return None
+        magic, count, layout_hash, reconciled_at = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            return None
+        return count, layout_hash.decode("ascii"), reconciled_at
+
+    def _remap(self, size):
+        """size 바이트 이상 매핑 (필요하면 파일을 늘림)"""
+        if os.fstat(self.fd).st_size < size:
+            os.ftruncate(self.fd, size)
+        size = os.fstat(self.fd).st_size
+        if self.mm is None or len(self.mm) != size:
+            if self.mm is not None:
+                self.mm.close()
+            self.mm = mmap.mmap(self.fd, size)
+
+    def _ensure_mapped(self):
+        if self.fd is None:
+            return None
+        size = os.fstat(self.fd).st_size
+        if size >= HEADER.size:
+            self._remap(size)
+            header = self._header()
+            if header and len(self.mm) < HEADER.size + (header[0] + 7) // 8:
+                self._remap(HEADER.size + (header[0] + 7) // 8)
+        return self._header()
+
+    # --- 순번 ---
+    def _load_ordinals(self, file_hash):
+        """파일의 배치 해시와 같은 배치로 seat_id -> 순번 표를 맞춤"""
+        if self.layout_hash == file_hash:
+            return True
+        _, layout_hash, seat_ids = seatlayout.get_layout(self.match_id)
+        if layout_hash != file_hash:
+            _, layout_hash, seat_ids = seatlayout.get_layout(self.match_id, rebuild=True)
+        if layout_hash != file_hash:
+            return False
+        self.ordinals = {seat_id: i for i, seat_id in enumerate(seat_ids)}
+        self.layout_hash = layout_hash
+        return True
+
+    # --- 작업 (self.lock + flock 안에서 호출) ---
+    def reconcile(self):
+        """seats 를 읽어 비트맵 전체를 다시 씀. 다르게 기록돼 있던 좌석 수를 반환"""
+        rows = list(seatlayout.ordered_seats(self.match_id, "seat_id", "is_reserved"))
+        _, layout_hash, seat_ids = seatlayout.get_layout(self.match_id)
+        if seat_ids != [r[0] for r in rows]:
+            _, layout_hash, seat_ids = seatlayout.get_layout(self.match_id, rebuild=True)
+
+        bits = seatlayout.pack_bits([r[1] for r in rows])
+        header = self._ensure_mapped()
+        if header is None:
+            mismatches = 0  # 새 파일
+        elif header[1] == layout_hash:
+            old = self.mm[HEADER.size:HEADER.size + len(bits)]
+            mismatches = sum(bin(a ^ b).count("1") for a, b in zip(old, bits))
+        else:
+            mismatches = len(rows)
+
+        self._remap(HEADER.size + len(bits))
+        self.mm[HEADER.size:HEADER.size + len(bits)] = bits
+        HEADER.pack_into(self.mm, 0, MAGIC, len(rows), layout_hash.encode("ascii"), time.time())
+
+        self.ordinals = {seat_id: i for i, seat_id in enumerate(seat_ids)}
+        self.layout_hash = layout_hash
+        return mismatches
+
+    def set_seat(self, seat_id, reserved):
+        header = self._ensure_mapped()
+        if header is None or not self._load_ordinals(header[1]) or seat_id not in self.ordinals:
+            # 파일이 없거나 좌석 구성이 바뀜 → 통째로 다시 (이 변경도 DB 에 이미 커밋됨)
+            self.reconcile()
+            return
+        i = self.ordinals[seat_id]
+        offset = HEADER.size + (i >> 3)
+        mask = 0x80 >> (i & 7)
+        value = self.mm[offset]
+        self.mm[offset] = (value | mask) if reserved else (value & ~mask)
+
+    def read(self):
+        """(배치 해시, 좌석 수, 비트맵 bytes)"""
+        header = self._ensure_mapped()
+        if header is None:
+            return None
+        count, layout_hash, _ = header
+        return layout_hash, count, self.mm[HEADER.size:HEADER.size + (count + 7) // 8]
+
+    def is_stale(self):
+        header = self._ensure_mapped()
+        return header is None or time.time() - header[2] >= _conf("RECONCILE_INTERVAL", 30)
+
+
+_maps = {}
+_maps_lock = threading.Lock()
+
+
+def _get(match_id):
+    match_id = int(match_id)
+    with _maps_lock:
+        shm = _maps.get(match_id)
+        if shm is None:
+            shm = _maps[match_id] = _SharedBitmap(match_id)
+        return shm
+
+
+def _open(shm):
+    """
+    파일을 열고 True. 아직 없으면 경기가 있을 때만 만든다
+    (없는 경기면 False — 조회/대조 요청만으로 파일이 생기지 않게)
+    """
+    if shm.open():
+        return True
+    if not Match.objects.filter(pk=shm.match_id).exists():
+        return False
+    return shm.open(create=True)
+
+
+class _Locked:
+    """
+    스레드 락 + 파일 락. blocking=False 면 못 잡았을 때 acquired=False
+    shared=True 면 읽기용 공유 락 (쓰기/대조와만 배타)
+    """
+
+    def __init__(self, shm, blocking=True, shared=False):
+        self.shm = shm
+        self.blocking = blocking
+        self.mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        self.acquired = False
+
+    def __enter__(self):
+        if not self.shm.lock.acquire(self.blocking):
+            return self
+        try:
+            flags = self.mode if self.blocking else self.mode | fcntl.LOCK_NB
+            fcntl.flock(self.shm.fd, flags)
+        except BlockingIOError:
+            self.shm.lock.release()
+            return self
+        self.acquired = True
+        return self
+
+    def __exit__(self, *exc):
+        if self.acquired:
+            fcntl.flock(self.shm.fd, fcntl.LOCK_UN)
+            self.shm.lock.release()
+
+
+def is_mapped(match_id):
+    """이 노드에 이미 비트맵 파일이 있는지 (있으면 경기가 존재함). 파일을 만들지 않음"""
+    if not enabled():
+        return False
+    shm = _maps.get(int(match_id))
+    return (shm is not None and shm.fd is not None) or os.path.exists(_path(match_id))
+
+
+def set_seat(match_id, seat_id, reserved):
+    """커밋된 좌석 상태 변경 반영 (seatmap 에서 호출)"""
+    if not enabled():
+        return
+    shm = _get(match_id)
+    try:
+        if not _open(shm):
+            return
+        with _Locked(shm):
+            shm.set_seat(seat_id, reserved)
+    except Exception:
+        # 비트맵은 대조로 복구되므로 예매 흐름은 막지 않음
+        logger.exception("좌석 비트맵 갱신 실패 (match_id=%s, seat_id=%s)", match_id, seat_id)
+
+
+def reconcile(match_id):
+    """seats 기준으로 비트맵을 다시 씀. 달랐던 좌석 수 (없는 경기면 0, 파일을 만들지 않음)"""
+    shm = _get(match_id)
+    if not _open(shm):
+        return 0
+    with _Locked(shm):
+        mismatches = shm.reconcile()
+    if mismatches:
+        logger.warning("좌석 비트맵 대조: match_id=%s 에서 %d석 불일치 수정", match_id, mismatches)
+    return mismatches
+
+
+def read(match_id):
+    """
+    (배치 해시, 좌석 수, 비트맵 bytes). 꺼져 있거나 없는 경기면 None
+    처음이거나 대조 주기가 지났으면 먼저 대조 (다른 워커가 하고 있으면 기다리지 않음)
+    """
+    if not enabled():
+        return None
+    shm = _get(match_id)
+    if not _open(shm):
+        return None
+    with shm.lock:
+        stale = shm.is_stale()
+        missing = shm.read() is None
+    if stale:
+        with _Locked(shm, blocking=missing) as locked:
+            if locked.acquired and shm.is_stale():
+                mismatches = shm.reconcile()
+                if mismatches:
+                    logger.warning(
+                        "좌석 비트맵 대조: match_id=%s 에서 %d석 불일치 수정", match_id, mismatches
+                    )
+    with _Locked(shm, shared=True):
+        return shm.read()
+
+
+def get_bitmap(match_id, version):
+    """format=bitmap 응답 (seatlayout.get_bitmap 과 같은 형식). 꺼져 있으면 None"""
+    state = read(match_id)
+    if state is None:
+        return None
+    return seatlayout.bitmap_json(version, *state)
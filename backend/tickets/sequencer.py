@@ -0,0 +1,308 @@
+"""
+경기별 단일 작성자(sequencer) 예매 엔진 (선택 기능)
+
+settings.RESERVATION_ENGINE = "sequencer" 일 때 사용.
+
+- 경기마다 워커 스레드 1개가 그 경기의 모든 좌석 선점 요청을 순서대로 처리
+- 같은 배치에서 이미 잡은 좌석은 메모리 상태로 바로 거절
+- 메모리상 "빈 좌석이 아님" / "사용자 좌석 수 초과"는 힌트일 뿐이라
+  최종 판단은 조건부 UPDATE(claim_seat)가 한다
+  (hold 만료/해제, 다른 프로세스의 취소처럼 이 프로세스가 모르는 해제가 있을 수 있음)
+  힌트와 DB 결과가 다르면 다음 배치에서 상태를 다시 읽음
+- 통과한 요청만 작은 배치로 모아 한 트랜잭션에서 Reservation/Payment 생성
+- 요청 스레드는 Future 로 결과를 기다림
+
+한 경기는 한 프로세스의 sequencer 만 맡는다.
+공유 캐시의 소유 키(sequencer:<match_id>:owner, OWNER_TTL 초마다 갱신)를 먼저 잡은
+프로세스만 큐를 쓰고, 나머지 프로세스는 reservations.reserve_seat(직접 선점)로 처리한다.
+어느 쪽이든 쓰기 단계의 조건부 UPDATE 가 막아 주므로 중복 예매는 생기지 않는다.
+"""
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+
+from . import reservations, seatmap, stats
+from .models import Payment, Reservation, Seat
+from .reservations import ReservationError
+
+# 한 번에 모아서 쓰는 최대 요청 수
+BATCH_SIZE = getattr(settings, "SEQUENCER_BATCH_SIZE", 32)
+# 요청 스레드가 결과를 기다리는 최대 시간(초)
+RESULT_TIMEOUT = getattr(settings, "SEQUENCER_TIMEOUT", 5.0)
+# 경기 소유 키 유지 시간(초). 소유 프로세스가 요청을 받는 동안 계속 갱신
+OWNER_TTL = getattr(settings, "SEQUENCER_OWNER_TTL", 30)
+
+_TOKEN = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class _Claim:
+    def __init__(self, user_id, seat_id, amount, method):
+        self.user_id = user_id
+        self.seat_id = seat_id
+        self.amount = amount
+        self.method = method
+        self.future = Future()
+        self.expected_free = True  # 메모리상 빈 좌석이었는지 (DB 결과와 다르면 다시 읽음)
+        self.expected_limit = False  # 메모리상 사용자 좌석 수가 이미 찼는지 (성공하면 다시 읽음)
+        self.counted = False       # user_seats 에 새로 더했는지 (실패하면 되돌림)
+
+
+class _Release:
+    def __init__(self, user_id, seat_id):
+        self.user_id = user_id
+        self.seat_id = seat_id
+
+
+class MatchSequencer:
+    def __init__(self, match_id):
+        self.match_id = match_id
+        self.queue = queue.Queue()
+        self.seats = set()        # 이 경기의 좌석 id
+        self.free = set()         # 빈 좌석 id
+        self.user_seats = {}      # user_id -> active 예매 좌석 id 집합 (힌트)
+        self.loaded = False
+        self.thread = threading.Thread(
+            target=self._run, name=f"seq-match-{match_id}", daemon=True
+        )
+        self.thread.start()
+
+    # ---------- 요청 스레드 쪽 ----------
+
+    def submit(self, user_id, seat_id, amount, method):
+        claim = _Claim(user_id, seat_id, amount, method)
+        self.queue.put(claim)
+        try:
+            return claim.future.result(timeout=RESULT_TIMEOUT)
+        except FutureTimeout:
+            # 아직 처리 전이면 취소하고 실패 응답, 이미 처리 중이면 결과를 끝까지 기다림
+            if claim.future.cancel():
+                raise ReservationError(reservations.DEADLOCK)
+            return claim.future.result()
+
+    def release(self, user_id, seat_id):
+        self.queue.put(_Release(user_id, seat_id))
+
+    # ---------- 워커 스레드 ----------
+
+    def _load(self):
+        self.seats.clear()
+        self.free.clear()
+        for seat_id, is_reserved in Seat.objects.filter(
+            match_id=self.match_id
+        ).values_list("seat_id", "is_reserved"):
+            self.seats.add(seat_id)
+            if not is_reserved:
+                self.free.add(seat_id)
+
+        self.user_seats = {}
+        for user_id, seat_id in Reservation.objects.filter(
+            match_id=self.match_id, status="active"
+        ).values_list("user_id", "seat_id"):
+            self.user_seats.setdefault(user_id, set()).add(seat_id)
+        self.loaded = True
+
+    def _run(self):
+        while True:
+            items = [self.queue.get()]
+            while len(items) < BATCH_SIZE:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            close_old_connections()
+            try:
+                if not self.loaded:
+                    self._load()
+                self._process(items)
+            except Exception as e:
+                # 상태를 믿을 수 없으니 다음 배치에서 다시 읽음
+                self.loaded = False
+                for item in items:
+                    if isinstance(item, _Claim) and not item.future.done():
+                        item.future.set_exception(e)
+
+    def _decide(self, claim, batch_seats):
+        """
+        메모리 상태로 선점 가능 여부 판단. 실패 코드 or None
+        이 배치에서 잡은 좌석만 바로 거절하고, 빈 좌석 여부/사용자 좌석 수는
+        예상값만 기록해 DB(조건부 UPDATE)가 판단하게 넘긴다.
+        사용자 좌석 수는 다른 프로세스의 취소/hold 만료로 줄어 있을 수 있다.
+        """
+        if claim.seat_id not in self.seats:
+            return reservations.diagnose_claim(claim.user_id, self.match_id, claim.seat_id)
+        if claim.seat_id in batch_seats:
+            return reservations.SEAT_TAKEN
+        claim.expected_free = claim.seat_id in self.free
+        claim.expected_limit = (
+            len(self.user_seats.get(claim.user_id, ())) >= reservations.MAX_SEATS_PER_USER
+        )
+        return None
+
+    def _process(self, items):
+        accepted = []
+        batch_seats = set()
+        for item in items:
+            if isinstance(item, _Release):
+                # 다시 읽은 상태에 이미 반영됐어도 문제없도록 집합 연산만 사용
+                self.free.add(item.seat_id)
+                self.user_seats.get(item.user_id, set()).discard(item.seat_id)
+                continue
+
+            # 요청 쪽에서 이미 타임아웃으로 취소했으면 건너뜀
+            if not item.future.set_running_or_notify_cancel():
+                continue
+
+            code = self._decide(item, batch_seats)
+            if code:
+                item.future.set_exception(ReservationError(code))
+                continue
+
+            batch_seats.add(item.seat_id)
+            self.free.discard(item.seat_id)
+            user_seats = self.user_seats.setdefault(item.user_id, set())
+            item.counted = item.seat_id not in user_seats
+            user_seats.add(item.seat_id)
+            accepted.append(item)
+
+        if accepted:
+            results = reservations.with_retry(self._write, accepted)
+            for claim, result in zip(accepted, results):
+                if isinstance(result, ReservationError):
+                    if claim.counted:
+                        self.user_seats[claim.user_id].discard(claim.seat_id)
+                    # 빈 좌석이라 믿었는데 막혔으면 메모리 상태가 DB 와 어긋난 것 → 다음 배치에서 다시 읽음
+                    # (이미 찬 좌석이라 생각한 좌석이 SEAT_TAKEN 이면 힌트가 맞은 것,
+                    #  SEAT_LIMIT 는 메모리에 없는 hold 때문일 수 있어 다시 읽지 않고 좌석만 되돌림)
+                    if result.code == reservations.SEAT_LIMIT:
+                        if claim.expected_free:
+                            self.free.add(claim.seat_id)
+                    elif claim.expected_free or result.code != reservations.SEAT_TAKEN:
+                        self.loaded = False
+                    claim.future.set_exception(result)
+                else:
+                    # 찼다고 본 한도로 성공했으면 사용자 좌석 수가 실제보다 많았던 것
+                    if claim.expected_limit:
+                        self.loaded = False
+                    claim.future.set_result(result)
+
+    def _write(self, claims):
+        """
+        통과한 요청들을 한 트랜잭션에서 기록.
+        요청마다 savepoint 를 두어 하나가 막혀도 나머지는 커밋된다.
+        """
+        results = []
+        now = timezone.now()
+        for claim in claims:
+            try:
+                with transaction.atomic():
+                    results.append(self._write_one(claim, now))
+            except ReservationError as e:
+                results.append(e)
+            except DatabaseError as e:
+                # 데드락은 배치 전체를 재시도
+                if reservations.is_retryable(e):
+                    raise
+                results.append(ReservationError(reservations.RESERVE_FAILED))
+        return results
+
+    def _write_one(self, claim, now):
+        if not reservations.claim_seat(claim.user_id, self.match_id, claim.seat_id):
+            raise ReservationError(
+                reservations.diagnose_claim(claim.user_id, self.match_id, claim.seat_id)
+            )
+
+        reservation = Reservation.objects.create(
+            user_id=claim.user_id,
+            match_id=self.match_id,
+            seat_id=claim.seat_id,
+            res_date=now,
+            status="active",
+        )
+        Payment.objects.create(
+            res=reservation,
+            amount=claim.amount,
+            method=claim.method,
+            pay_date=now,
+        )
+        seatmap.record_change(self.match_id, claim.seat_id, True)
+        stats.record(self.match_id, seats=1, reservations=1, sales=claim.amount)
+        return reservation
+
+
+_sequencers = {}
+_lock = threading.Lock()
+
+
+def get_sequencer(match_id):
+    with _lock:
+        seq = _sequencers.get(match_id)
+        if seq is None:
+            seq = _sequencers[match_id] = MatchSequencer(match_id)
+        return seq
+
+
+_owned = {}  # match_id -> 소유 키 만료 시각(monotonic)
+
+
+def _owner_key(match_id):
+    return f"sequencer:{match_id}:owner"
+
+
+def acquire(match_id):
+    """
+    이 프로세스가 경기의 sequencer 를 맡을 수 있으면 True.
+    남은 시간이 절반 아래로 내려갈 때만 공유 캐시에 갱신을 요청한다.
+    """
+    now = time.monotonic()
+    deadline = _owned.get(match_id, 0)
+    if deadline - now > OWNER_TTL / 2:
+        return True
+
+    key = _owner_key(match_id)
+    if not cache.add(key, _TOKEN, OWNER_TTL):
+        if cache.get(key) != _TOKEN:
+            _owned.pop(match_id, None)
+            return False
+        cache.touch(key, OWNER_TTL)
+
+    if deadline <= now:
+        # 새로 맡았으면 그 사이 다른 프로세스가 쓴 내용을 다시 읽음
+        seq = _sequencers.get(match_id)
+        if seq is not None:
+            seq.loaded = False
+    _owned[match_id] = now + OWNER_TTL
+    return True
+
+
+def is_enabled():
+    return getattr(settings, "RESERVATION_ENGINE", "direct") == "sequencer"
+
+
+def reserve_seat(user_id, match_id, seat_id, amount, method):
+    """
+    reservations.reserve_seat 와 같은 인터페이스. 실패하면 ReservationError
+    다른 프로세스가 이 경기를 맡고 있으면 큐 없이 직접 선점
+    """
+    if not acquire(match_id):
+        return reservations.reserve_seat(user_id, match_id, seat_id, amount, method)
+    return get_sequencer(match_id).submit(user_id, seat_id, amount, method)
+
+
+def seat_released(match_id, user_id, seat_id):
+    """
+    좌석이 풀린 트랜잭션이 커밋된 뒤 호출 (예매 취소, hold 해제/만료).
+    그 경기의 sequencer 가 이 프로세스에 떠 있을 때만 상태 반영
+    (다른 프로세스에서 풀린 좌석은 _decide 가 DB 에 다시 물어봐서 따라감)
+    """
+    seq = _sequencers.get(match_id)
+    if seq is not None:
+        seq.release(user_id, seat_id)
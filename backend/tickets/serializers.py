@@ -0,0 +1,139 @@
+"""
+목록 API 용 JSON 직렬화 (모델 객체 / dict 를 만들지 않음)
+
+values_list 나 raw cursor 로 읽은 튜플을 미리 만들어 둔 컬럼 배치(RowLayout)에 맞춰
+바로 JSON 문자열로 바꾼다.
+
+    SEAT_LAYOUT = RowLayout([("seat_id", INT), ("block", STR), ("is_reserved", BOOL)])
+    body = SEAT_LAYOUT.dumps(cursor.fetchall())   # '[{"seat_id":1,...},...]'
+    return json_response(body)
+
+일시(DATETIME)는 ISO 8601 (초 단위, 시간대 포함) 로 통일한다.
+DB 에서 시간대 없이 읽힌 값은 USE_TZ 일 때 UTC 로 본다 (Django 가 UTC 로 저장).
+예외: 관리자 취소 이력은 화면/내보내기 호환을 위해 예전 형식 그대로 (DATETIME_TEXT)
+실수(FLOAT)의 NaN/Infinity 는 JSON 에 없는 값이므로 null 로 쓴다.
+"""
+import json
+import math
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.dateparse import parse_datetime
+
+_encode_str = json.encoder.encode_basestring  # ensure_ascii=False 와 같은 C 구현
+
+
+def format_datetime(value):
+    """
+    datetime → '2025-05-01T18:30:00+00:00'
+    문자열(SQLite 의 MAX() 결과 등)은 일시로 읽을 수 있으면 같은 형식으로 바꾸고, 아니면 그대로
+    """
+    if value is None:
+        return value
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            return value
+        value = parsed
+    if isinstance(value, datetime):
+        if value.tzinfo is None and settings.USE_TZ:
+            value = value.replace(tzinfo=dt_timezone.utc)
+        return value.isoformat(timespec="seconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def format_datetime_text(value):
+    """
+    datetime → '2025-05-01 18:30:00' (DB 에 저장된 값 그대로, 시간대 변환 없음)
+    """
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            return value
+        value = parsed
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _int(v):
+    return str(int(v))
+
+
+def _float(v):
+    v = float(v)
+    return repr(v) if math.isfinite(v) else "null"
+
+
+def _bool(v):
+    return "true" if v else "false"
+
+
+def _str(v):
+    return _encode_str(v if isinstance(v, str) else str(v))
+
+
+def _datetime(v):
+    return _encode_str(format_datetime(v))
+
+
+def _datetime_text(v):
+    return _encode_str(format_datetime_text(v))
+
+
+def _json(v):
+    return json.dumps(v, ensure_ascii=False)
+
+
+INT = _int
+FLOAT = _float
+BOOL = _bool
+STR = _str
+DATETIME = _datetime
+DATETIME_TEXT = _datetime_text
+JSON = _json  # 중첩 값(list/dict)은 일반 인코더로
+
+
+class RowLayout:
+    """
+    columns: [(이름, 인코더), ...] — 튜플의 값 순서와 같아야 함.
+    NULL 은 모든 컬럼에서 null 로 쓴다.
+    """
+
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+        self._encoders = [encoder for _, encoder in columns]
+        self._template = "{" + ",".join(
+            f"{_encode_str(name)}:%s" for name in self.names
+        ) + "}"
+
+    def dump(self, row):
+        return self._template % tuple(
+            "null" if v is None else enc(v) for enc, v in zip(self._encoders, row)
+        )
+
+    def dumps(self, rows):
+        """JSON 배열 문자열"""
+        return "[" + ",".join(map(self.dump, rows)) + "]"
+
+    def to_dict(self, row):
+        """JSON 으로 내보낼 때와 같은 값의 dict (일시는 문자열)"""
+        item = dict(zip(self.names, row))
+        for name, enc in zip(self.names, self._encoders):
+            if item[name] is None:
+                continue
+            if enc is DATETIME:
+                item[name] = format_datetime(item[name])
+            elif enc is DATETIME_TEXT:
+                item[name] = format_datetime_text(item[name])
+            elif enc is FLOAT and not math.isfinite(float(item[name])):
+                item[name] = None
+        return item
+
+
+def json_response(body, status=200):
+    """이미 직렬화된 JSON(str/bytes) 응답"""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return HttpResponse(body, status=status, content_type="application/json")
@@ -0,0 +1,201 @@
+"""
+match_stats 증분 갱신
+
+match_stats 는 집계 뷰 대신 실제 테이블(migration 0002)로 두고,
+예매/취소/결제/좌석 선점 경로에서 변화량만 반영한다.
+
+- 트랜잭션 커밋 후 변화량을 메모리에 경기별로 합산
+- 백그라운드 스레드가 MATCH_STATS_FLUSH_INTERVAL 초마다 경기당 UPDATE 1번으로 반영
+  (예매 트랜잭션이 통계 행 잠금을 기다리지 않음, 버퍼와 세대는 tickets.deltas)
+- 정합성 확인/복구: python manage.py rebuild_match_stats
+
+컬럼 정의
+  seat_count        : seats 행 수
+  reserved_seats    : is_reserved = 1 인 좌석 수 (선점 포함)
+  occupancy_rate    : reserved_seats / total_seats * 100 (소수 2자리)
+  reservation_count : status = 'active' 예매 수
+  total_sales       : active 예매의 결제 금액 합
+"""
+import atexit
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from . import deltas
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = getattr(settings, "MATCH_STATS_FLUSH_INTERVAL", 1.0)
+
+COLUMNS = [
+    "match_id",
+    "match_date",
+    "stadium",
+    "total_seats",
+    "seat_count",
+    "reserved_seats",
+    "occupancy_rate",
+    "total_sales",
+    "reservation_count",
+]
+
+# 기준 테이블에서 새로 집계 (rebuild 용)
+AGGREGATE_SQL = """
+    SELECT
+        m.match_id,
+        m.match_date,
+        m.stadium,
+        m.total_seats,
+        COALESCE(s.seat_count, 0),
+        COALESCE(s.reserved_seats, 0),
+        CASE WHEN m.total_seats > 0
+             THEN ROUND(COALESCE(s.reserved_seats, 0) * 100.0 / m.total_seats, 2)
+             ELSE 0 END,
+        COALESCE(r.total_sales, 0),
+        COALESCE(r.reservation_count, 0)
+    FROM matches m
+    LEFT JOIN (
+        SELECT match_id,
+               COUNT(*) AS seat_count,
+               SUM(CASE WHEN is_reserved = 1 THEN 1 ELSE 0 END) AS reserved_seats
+        FROM seats
+        GROUP BY match_id
+    ) s ON s.match_id = m.match_id
+    LEFT JOIN (
+        SELECT r.match_id,
+               COUNT(*) AS reservation_count,
+               SUM(COALESCE(p.amount, 0)) AS total_sales
+        FROM reservations r
+        LEFT JOIN payments p ON p.res_id = r.res_id
+        WHERE r.status = 'active'
+        GROUP BY r.match_id
+    ) r ON r.match_id = m.match_id
+"""
+
+# MySQL 은 SET 을 왼쪽부터 평가하므로 occupancy_rate 를 reserved_seats 보다 먼저 계산
+APPLY_SQL = """
+    UPDATE match_stats
+    SET occupancy_rate = CASE WHEN total_seats > 0
+                              THEN ROUND((reserved_seats + %s) * 100.0 / total_seats, 2)
+                              ELSE 0 END,
+        reserved_seats = reserved_seats + %s,
+        reservation_count = reservation_count + %s,
+        total_sales = total_sales + %s
+    WHERE match_id = %s
+"""
+
+
+_epochs = deltas.Epochs("match_stats")
+epochs = _epochs.get
+
+
+class StatsBuffer(deltas.DeltaBuffer):
+    """match_id -> [seats, reservations, sales, epoch]"""
+    name = "match-stats-writer"
+    logger = logger
+
+    def __init__(self, flush_interval):
+        super().__init__(_epochs)
+        self.flush_interval = flush_interval
+
+    def apply(self, match_id, seats, reservations, sales):
+        return apply_delta(match_id, seats, reservations, sales)
+
+
+def apply_delta(match_id, seats=0, reservations=0, sales=0):
+    """변화량 반영. 통계 행이 없어서 경기를 새로 집계했으면 True"""
+    with connection.cursor() as cursor:
+        cursor.execute(APPLY_SQL, [seats, seats, reservations, sales, match_id])
+        updated = cursor.rowcount
+    if not updated:
+        # 통계 행이 아직 없는 경기는 기준 테이블에서 새로 집계
+        # (이 변화량도 집계에 들어 있고, 버퍼에 남은 같은 경기 변화량은 세대가 바뀌어 버려짐)
+        rebuild([match_id])
+        return True
+    return False
+
+
+buffer = StatsBuffer(FLUSH_INTERVAL)
+atexit.register(buffer.flush)
+
+
+def record(match_id, seats=0, reservations=0, sales=0):
+    """
+    통계 변화량 기록. 트랜잭션이 커밋된 뒤에만 반영된다.
+    MATCH_STATS_ASYNC = False 면 커밋 직후 바로 UPDATE
+    """
+    def _apply():
+        if getattr(settings, "MATCH_STATS_ASYNC", True):
+            buffer.add(int(match_id), seats, reservations, sales)
+        else:
+            apply_delta(int(match_id), seats, reservations, sales)
+
+    transaction.on_commit(_apply)
+
+
+def compute(match_ids=None):
+    """기준 테이블에서 새로 집계한 통계 {match_id: row}"""
+    sql = AGGREGATE_SQL
+    params = []
+    if match_ids:
+        sql += " WHERE m.match_id IN (%s)" % ", ".join(["%s"] * len(match_ids))
+        params = list(match_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0]: row for row in cursor.fetchall()}
+
+
+def current(match_ids=None):
+    """match_stats 테이블의 현재 값 {match_id: row}"""
+    sql = "SELECT %s FROM match_stats" % ", ".join(COLUMNS)
+    params = []
+    if match_ids:
+        sql += " WHERE match_id IN (%s)" % ", ".join(["%s"] * len(match_ids))
+        params = list(match_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0]: row for row in cursor.fetchall()}
+
+
+def check(match_ids=None):
+    """증분 값과 새 집계가 다른 match_id 목록 (테이블은 그대로)"""
+    fresh = compute(match_ids)
+    old = current(match_ids)
+    return [m for m, row in fresh.items() if not _same(old.get(m), row)]
+
+
+def rebuild(match_ids=None):
+    """
+    match_stats 를 기준 테이블에서 다시 계산해서 덮어씀.
+    반환: 기존 값과 달랐던 match_id 목록
+    집계 전에 세대를 올려서 이미 커밋돼 버퍼에 남은 변화량이 다시 더해지지 않게 한다.
+    """
+    _epochs.bump(match_ids)
+    with transaction.atomic():
+        fresh = compute(match_ids)
+        old = current(match_ids)
+        mismatched = [m for m, row in fresh.items() if not _same(old.get(m), row)]
+
+        with connection.cursor() as cursor:
+            if match_ids:
+                cursor.execute(
+                    "DELETE FROM match_stats WHERE match_id IN (%s)" % ", ".join(["%s"] * len(match_ids)),
+                    list(match_ids),
+                )
+            else:
+                cursor.execute("DELETE FROM match_stats")
+            if fresh:
+                cursor.executemany(
+                    "INSERT INTO match_stats (%s) VALUES (%s)"
+                    % (", ".join(COLUMNS), ", ".join(["%s"] * len(COLUMNS))),
+                    list(fresh.values()),
+                )
+    return mismatched
+
+
+def _same(a, b):
+    if a is None:
+        return False
+    # 통계 값(seat_count 이후)만 비교, 실수는 소수 2자리까지
+    return all(round(float(x), 2) == round(float(y), 2) for x, y in zip(a[4:], b[4:]))
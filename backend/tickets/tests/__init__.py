@@ -0,0 +1,8 @@
+"""
+tickets 테스트
+
+운영 DB 에만 있는 테이블(managed=False)과 트리거는 TEST_RUNNER
+(tickets.tests.runner.TicketsTestRunner)가 migrate 전에 bench 스키마로 만든다.
+
+    python manage.py test tickets
+"""
@@ -0,0 +1,93 @@
+"""테스트 공용 설정/데이터 생성"""
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tickets import availability, stats
+from tickets.models import Match, Seat, Team, User
+
+# 백그라운드 스레드/버퍼 없이 커밋 직후 바로 반영되게
+TEST_SETTINGS = {
+    "MATCH_STATS_ASYNC": False,
+    "SEAT_AVAILABILITY_ASYNC": False,
+    "REQUEST_LOG_ASYNC": False,
+    "HOLD_SWEEPER_THREAD": False,
+    "ABUSE_DETECTION_ENABLED": False,
+    "WAITING_ROOM_ENABLED": False,
+    "RESERVATION_ENGINE": "direct",
+    "SEAT_SHM_DIR": None,
+    "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+}
+
+
+def make_teams():
+    home = Team.objects.create(team_name="홈팀", league="KBO", city="서울")
+    away = Team.objects.create(team_name="원정팀", league="KBO", city="부산")
+    return home, away
+
+
+def make_match(home, away, blocks=(("A", "R", 50000),), rows=2, seats=5, days=7, stadium="잠실야구장"):
+    """blocks 마다 rows x seats 좌석을 만든 경기"""
+    match = Match.objects.create(
+        home_team=home,
+        away_team=away,
+        match_date=timezone.now() + timedelta(days=days),
+        stadium=stadium,
+        total_seats=len(blocks) * rows * seats,
+    )
+    Seat.objects.bulk_create(
+        Seat(match=match, block=block, row_no=str(r), seat_number=str(n),
+             grade=grade, price=price, is_reserved=False)
+        for block, grade, price in blocks
+        for r in range(1, rows + 1)
+        for n in range(1, seats + 1)
+    )
+    stats.rebuild([match.match_id])
+    availability.rebuild([match.match_id])
+    return match
+
+
+def make_user(name="user", role="user"):
+    return User.objects.create(name=name, email=f"{name}@example.com", role=role)
+
+
+@override_settings(**TEST_SETTINGS)
+class TicketsTestCase(TestCase):
+    """팀 2개, 경기 1개(A 블록 2열 x 5석, R석 50000원), 사용자 2명"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.home, cls.away = make_teams()
+        cls.match = make_match(cls.home, cls.away)
+        cls.seats = list(Seat.objects.filter(match=cls.match).order_by("seat_id"))
+        cls.user = make_user("user1")
+        cls.other = make_user("user2")
+
+    def setUp(self):
+        cache.clear()
+
+    def post_json(self, url, data, **extra):
+        return self.client.post(url, json.dumps(data), content_type="application/json", **extra)
+
+    def reserve(self, seat, user=None, **extra):
+        """POST /api/reservations/ (커밋 후 콜백까지 실행)"""
+        user = user or self.user
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.post_json("/api/reservations/", {
+                "user_id": user.user_id,
+                "match_id": seat.match_id,
+                "seat_id": seat.seat_id,
+                "amount": seat.price,
+                "method": "card",
+            }, **extra)
+
+    def cancel(self, res_id, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.post_json(f"/api/reservations/{res_id}/cancel/", {}, **extra)
+
+    def reserved_flags(self, seats=None):
+        ids = [s.seat_id for s in (seats or self.seats)]
+        return dict(Seat.objects.filter(seat_id__in=ids).values_list("seat_id", "is_reserved"))
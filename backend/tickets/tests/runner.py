@@ -0,0 +1,29 @@
+"""
+테스트 러너 (settings.TEST_RUNNER)
+
+users/matches/seats/reservations 등은 운영 DB 에만 있는 테이블(managed=False)이라
+migrate 로는 만들어지지 않는다. 테스트 DB 를 migrate 하기 전에 bench 와 같은
+스키마(테이블 + 트리거)를 먼저 만든다.
+"""
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.test.runner import DiscoverRunner
+
+from tickets import bench
+
+
+def _create_base_tables(sender, using, **kwargs):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+    if "matches" not in tables:
+        bench.create_base_tables(connection)
+
+
+class TicketsTestRunner(DiscoverRunner):
+    def setup_databases(self, **kwargs):
+        pre_migrate.connect(_create_base_tables, dispatch_uid="tickets_test_base_tables")
+        try:
+            return super().setup_databases(**kwargs)
+        finally:
+            pre_migrate.disconnect(dispatch_uid="tickets_test_base_tables")
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from tickets import abuse, cancels
+from tickets.models import AbuseLog
+
+from .base import TicketsTestCase
+
+
+class CandidateTests(TicketsTestCase):
+    def test_cancel_candidate_carries_representative_res_id(self):
+        res_ids = []
+        for seat in self.seats[:cancels.CANCEL_LIMIT]:
+            res_id = self.reserve(seat).json()["reservation_id"]
+            self.cancel(res_id)
+            res_ids.append(res_id)
+
+        response = self.client.get("/api/admin/abuse/")
+        self.assertEqual(response.status_code, 200)
+        rows = {row["user_id"]: row for row in response.json()}
+        self.assertEqual(rows[self.user.user_id]["res_id"], min(res_ids))
+        self.assertEqual(rows[self.user.user_id]["cancel_count"], cancels.CANCEL_LIMIT)
+
+    def test_event_only_candidate_has_no_res_id(self):
+        AbuseLog.objects.create(
+            user=self.other, match=self.match, event_type="attempt_rate", detected_time=timezone.now()
+        )
+        rows = abuse.candidates(timezone.now() - timedelta(hours=1), cancels.CANCEL_LIMIT)
+        self.assertEqual(len(rows), 1)
+        user_id, res_id, cancel_count, events, _ = rows[0]
+        self.assertEqual((user_id, res_id, cancel_count), (self.other.user_id, None, 0))
+        self.assertEqual(events[0]["event_type"], "attempt_rate")
+
+
+@override_settings(
+    ABUSE_WINDOW=60, ABUSE_MAX_ATTEMPTS=5, ABUSE_MIN_ATTEMPTS=4, ABUSE_FAILURE_RATIO=0.75,
+    ABUSE_CANCEL_WINDOW=3600, ABUSE_MAX_CANCELS=3,
+)
+class DetectorRuleTests(SimpleTestCase):
+    def setUp(self):
+        self.detector = abuse.AbuseDetector()
+
+    def attempts(self, count, success=True, user_id=1, ip="10.0.0.1", start=0.0):
+        flags = []
+        for i in range(count):
+            flags += self.detector.process("attempt", start + i, user_id, 7, ip, success)
+        return flags
+
+    def test_attempt_rate_flags_user_and_ip_once_per_window(self):
+        flags = self.attempts(10)
+        self.assertEqual(flags, [(1, 7, "attempt_rate"), (1, 7, "ip_attempt_rate")])
+
+    def test_attempt_rate_flags_again_after_window(self):
+        self.attempts(6)
+        flags = self.attempts(6, start=120.0)
+        self.assertIn((1, 7, "attempt_rate"), flags)
+
+    def test_failure_ratio(self):
+        flags = self.attempts(4, success=False, ip=None)
+        self.assertEqual(flags, [(1, 7, "failure_ratio")])
+
+    def test_mostly_successful_attempts_are_not_failure_ratio(self):
+        self.attempts(3, ip=None)
+        flags = self.attempts(2, success=False, ip=None, start=3.0)
+        self.assertEqual(flags, [])
+
+    def test_cancel_churn(self):
+        flags = []
+        for i in range(4):
+            flags += self.detector.process("cancel", float(i), 1, 7, None, True)
+        self.assertEqual(flags, [(1, 7, "cancel_churn")])
@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from tickets import admission, checks, holds
+from tickets.models import Match, Seat
+
+from .base import TicketsTestCase
+
+
+class GcraTests(SimpleTestCase):
+    rate, burst = 10, 3
+
+    def issue(self, store, now):
+        return store.issue(1, now, self.rate, self.burst)[2]
+
+    def check_store(self, store):
+        # 처음 BURST 명은 바로, 이후 1/RATE 초 간격
+        self.assertEqual([self.issue(store, 1000.0) for _ in range(5)],
+                         [1000.0, 1000.0, 1000.0, 1000.1, 1000.2])
+        # 한참 조용했어도 바로 입장하는 건 BURST 명까지
+        admits = [self.issue(store, 2000.0) for _ in range(5)]
+        self.assertEqual(admits, [2000.0, 2000.0, 2000.0, 2000.1, 2000.2])
+
+    def test_memory_store(self):
+        self.check_store(admission.MemoryStore())
+
+    def test_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = admission.SQLiteStore(os.path.join(tmp, "queue.sqlite3"))
+            self.check_store(store)
+            self.assertEqual(store.issue(1, 3000.0, self.rate, self.burst)[0], 11)
+
+    def test_status(self):
+        self.assertEqual(admission.ticket_status(99.0, now=100.0)["admitted"], True)
+        status = admission.ticket_status(102.0, now=100.0)
+        self.assertEqual((status["admitted"], status["eta_seconds"]), (False, 2))
+
+
+@override_settings(WAITING_ROOM_ENABLED=True, WAITING_ROOM_BURST=1, WAITING_ROOM_RATE=0.01,
+                   WAITING_ROOM_STORE="memory")
+class WaitingRoomViewTests(TicketsTestCase):
+    def setUp(self):
+        super().setUp()
+        admission._store = None
+
+    def tearDown(self):
+        admission._store = None
+
+    def join(self):
+        return self.client.post(f"/api/matches/{self.match.match_id}/queue/").json()
+
+    def test_seat_list_requires_admitted_ticket(self):
+        url = f"/api/matches/{self.match.match_id}/seats/"
+        self.assertEqual(self.client.get(url).json()["code"], "QUEUE_REQUIRED")
+
+        first, second = self.join(), self.join()
+        self.assertTrue(first["admitted"])
+        self.assertFalse(second["admitted"])
+        self.assertEqual(self.client.get(url, HTTP_X_QUEUE_TICKET=first["ticket"]).status_code, 200)
+
+        response = self.client.get(url, HTTP_X_QUEUE_TICKET=second["ticket"])
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["code"], "NOT_ADMITTED")
+        self.assertIn("Retry-After", response)
+
+        status = self.client.get("/api/queue/status/", {"ticket": second["ticket"]}).json()
+        self.assertEqual(status["match_id"], self.match.match_id)
+        self.assertFalse(status["admitted"])
+
+    def test_hold_conversion_is_gated_by_hold_match(self):
+        [held] = holds.create_holds(self.user.user_id, self.match.match_id, [self.seats[0].seat_id])
+        body = {"user_id": self.user.user_id, "hold_id": held["hold_id"], "amount": 1, "method": "card"}
+
+        response = self.post_json("/api/reservations/", body)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["code"], "QUEUE_REQUIRED")
+
+        ticket = self.join()["ticket"]
+        response = self.post_json("/api/reservations/", body, HTTP_X_QUEUE_TICKET=ticket)
+        self.assertEqual(response.status_code, 201)
+
+    def test_hold_admission_does_not_query(self):
+        # 입장 검사는 대기표의 경기로 하고, hold 의 경기는 뷰가 전환할 때 확인
+        view = admission.admission_required(lambda request: HttpResponse(str(request.queue_match_id)))
+        request = RequestFactory().post(
+            "/api/reservations/", json.dumps({"hold_id": 1}), content_type="application/json",
+            HTTP_X_QUEUE_TICKET=self.join()["ticket"],
+        )
+        with self.assertNumQueries(0):
+            response = view(request)
+        self.assertEqual(response.content.decode(), str(self.match.match_id))
+
+    def test_hold_of_other_match_is_rejected(self):
+        other_match = Match.objects.create(
+            home_team=self.home, away_team=self.away, match_date=self.match.match_date,
+            stadium=self.match.stadium, total_seats=1,
+        )
+        seat = Seat.objects.create(match=other_match, block="A", row_no="1", seat_number="1",
+                                   grade="R", price=1, is_reserved=False)
+        [held] = holds.create_holds(self.user.user_id, other_match.match_id, [seat.seat_id])
+        body = {"user_id": self.user.user_id, "hold_id": held["hold_id"], "amount": 1, "method": "card"}
+
+        # 입장한 대기표로 다른 경기의 hold 를 전환할 수 없음
+        ticket = self.join()["ticket"]
+        response = self.post_json("/api/reservations/", body, HTTP_X_QUEUE_TICKET=ticket)
+        self.assertEqual(response.json()["code"], "MATCH_MISMATCH")
+        response = self.post_json(
+            "/api/reservations/", {**body, "match_id": self.match.match_id}, HTTP_X_QUEUE_TICKET=ticket
+        )
+        self.assertEqual(response.json()["code"], "MATCH_MISMATCH")
+        self.assertTrue(holds.SeatHold.objects.filter(pk=held["hold_id"]).exists())
+
+
+class WaitingRoomStoreCheckTests(SimpleTestCase):
+    @override_settings(WAITING_ROOM_ENABLED=True, WAITING_ROOM_STORE="memory", WEB_CONCURRENCY=4)
+    def test_memory_store_with_multiple_workers(self):
+        self.assertEqual([e.id for e in checks.check_waiting_room_store(None)], ["tickets.E002"])
+
+    @override_settings(WAITING_ROOM_ENABLED=True, WAITING_ROOM_STORE="memory", WEB_CONCURRENCY=1)
+    def test_memory_store_with_one_worker(self):
+        self.assertEqual(checks.check_waiting_room_store(None), [])
+
+    @override_settings(WAITING_ROOM_ENABLED=True, WAITING_ROOM_STORE="/run/tickets/queue.sqlite3",
+                       WEB_CONCURRENCY=4)
+    def test_sqlite_store(self):
+        self.assertEqual(checks.check_waiting_room_store(None), [])
+
+    @override_settings(WAITING_ROOM_ENABLED=False, WAITING_ROOM_STORE="memory", WEB_CONCURRENCY=4)
+    def test_disabled(self):
+        self.assertEqual(checks.check_waiting_room_store(None), [])
@@ -0,0 +1,136 @@
+import time
+from unittest import mock
+
+from django.core import signing
+from django.test import SimpleTestCase, override_settings
+
+from tickets import auth
+from tickets.models import User
+
+from .base import TicketsTestCase, make_user
+
+
+class TokenTests(TicketsTestCase):
+    def test_round_trip(self):
+        token, max_age = auth.issue_token(self.user)
+        self.assertEqual(auth.read_token(token), (self.user.user_id, "user"))
+        self.assertEqual(max_age, 86400)
+
+        admin = make_user("admin", role="admin")
+        token, _ = auth.issue_token(admin)
+        self.assertEqual(auth.read_token(token), (admin.user_id, "admin"))
+
+    def test_tampered_token(self):
+        token, _ = auth.issue_token(self.user)
+        rest = token.split(":", 1)[1]
+        forged = signing.dumps({"u": self.other.user_id, "r": "admin"}, salt=auth.SALT).split(":", 1)[0]
+        with self.assertRaises(signing.BadSignature):
+            auth.read_token(f"{forged}:{rest}")
+        # 다른 salt 로 서명한 토큰도 받지 않음
+        with self.assertRaises(signing.BadSignature):
+            auth.read_token(signing.dumps({"u": self.user.user_id, "r": "user"}))
+
+    @override_settings(AUTH_TOKEN_MAX_AGE=60)
+    def test_expired_token(self):
+        token, max_age = auth.issue_token(self.user)
+        self.assertEqual(max_age, 60)
+        with mock.patch("django.core.signing.time.time", return_value=time.time() + 61):
+            with self.assertRaises(signing.SignatureExpired):
+                auth.read_token(token)
+        self.assertEqual(auth.read_token(token)[0], self.user.user_id)
+
+
+class MiddlewareTests(TicketsTestCase):
+    URL = "/api/users/userinfo/"
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(auth, "users", auth.UserCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def bearer(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_login_token_round_trip(self):
+        response = self.post_json("/api/auth/login/", {"name": "user1", "email": self.user.email})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["user_id"], self.user.user_id)
+        self.assertEqual(auth.read_token(body["access"]), (self.user.user_id, "user"))
+
+        # 로그인 때 캐시를 채우므로 사용자 정보는 DB 를 읽지 않음
+        with self.assertNumQueries(0):
+            response = self.client.get(self.URL, headers=self.bearer(body["access"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["email"], self.user.email)
+
+    def test_admin_login_token(self):
+        admin = make_user("admin", role="admin")
+        response = self.post_json("/api/admin/login/", {"email": admin.email})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(auth.read_token(response.json()["access"]), (admin.user_id, "admin"))
+
+    def test_token_replaces_user_id(self):
+        token, _ = auth.issue_token(self.user)
+        response = self.client.get("/api/my/reservations/", headers=self.bearer(token))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            "/api/my/reservations/", {"user_id": self.other.user_id}, headers=self.bearer(token)
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["code"], "FORBIDDEN")
+
+    def test_invalid_token(self):
+        response = self.client.get(self.URL, headers=self.bearer("garbage"))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "INVALID_TOKEN")
+
+    @override_settings(AUTH_TOKEN_MAX_AGE=60)
+    def test_expired_token(self):
+        token, _ = auth.issue_token(self.user)
+        with mock.patch("django.core.signing.time.time", return_value=time.time() + 61):
+            response = self.client.get(self.URL, headers=self.bearer(token))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("만료", response.json()["error"])
+
+    def test_require_token(self):
+        query = {"user_id": self.user.user_id}
+        self.assertEqual(self.client.get("/api/my/reservations/", query).status_code, 200)
+        with override_settings(AUTH_REQUIRE_TOKEN=True):
+            response = self.client.get("/api/my/reservations/", query)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "LOGIN_REQUIRED")
+
+    def test_unknown_user(self):
+        ghost = User(user_id=self.other.user_id + 1000, role="user")
+        token, _ = auth.issue_token(ghost)
+        self.assertEqual(self.client.get(self.URL, headers=self.bearer(token)).status_code, 404)
+        self.assertIsNone(auth.get_user(ghost.user_id))
+
+
+class UserCacheTests(SimpleTestCase):
+    def user(self, user_id):
+        return User(user_id=user_id, name=f"u{user_id}", email=f"u{user_id}@example.com", role="user")
+
+    @override_settings(AUTH_USER_CACHE_SIZE=2)
+    def test_lru_eviction(self):
+        cache = auth.UserCache()
+        cache.put(self.user(1))
+        cache.put(self.user(2))
+        self.assertEqual(cache.get(1)["name"], "u1")  # 1 을 최근 사용으로
+        cache.put(self.user(3))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1)["user_id"], 1)
+        self.assertEqual(cache.get(3)["user_id"], 3)
+
+    @override_settings(AUTH_USER_CACHE_TTL=10)
+    def test_ttl(self):
+        cache = auth.UserCache()
+        with mock.patch("tickets.auth.time.monotonic", return_value=100.0):
+            cache.put(self.user(1))
+        with mock.patch("tickets.auth.time.monotonic", return_value=109.0):
+            self.assertIsNotNone(cache.get(1))
+        with mock.patch("tickets.auth.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get(1))
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+
+from tickets import availability
+from tickets.models import Seat
+
+from .base import TicketsTestCase, make_match
+
+
+class SeatAvailabilityTests(TicketsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.two_blocks = make_match(
+            cls.home, cls.away, blocks=(("A", "R", 70000), ("B", "S", 50000)), days=8
+        )
+        cls.block_seats = {
+            block: list(Seat.objects.filter(match=cls.two_blocks, block=block).order_by("seat_id"))
+            for block in ("A", "B")
+        }
+
+    def free(self, match):
+        return {
+            key[1:]: row[4] for key, row in availability.current([match.match_id]).items()
+        }
+
+    def assert_consistent(self, match):
+        self.assertEqual(availability.check([match.match_id]), [])
+
+    def test_reserve_and_cancel_update_free_seats(self):
+        res_id = self.reserve(self.seats[0]).json()["reservation_id"]
+        self.assertEqual(self.free(self.match), {("R", "A"): 9})
+        self.cancel(res_id)
+        self.assertEqual(self.free(self.match), {("R", "A"): 10})
+
+        summary = availability.summary([self.match.match_id])[0]
+        self.assertEqual((summary["total"], summary["free"]), (10, 10))
+        self.assertEqual(summary["grades"][0]["blocks"][0]["block"], "A")
+
+    @override_settings(SEAT_AVAILABILITY_ASYNC=True, SEAT_AVAILABILITY_FLUSH_INTERVAL=3600)
+    def test_rebuild_drops_buffered_deltas(self):
+        with mock.patch.object(availability, "buffer", availability.AvailabilityBuffer()):
+            self.reserve(self.seats[0])
+            self.reserve(self.seats[1])
+            self.assertEqual(self.free(self.match), {("R", "A"): 10})
+
+            # 버퍼에 남은 변화량은 이미 커밋돼서 rebuild 집계에 들어감
+            availability.rebuild([self.match.match_id])
+            availability.buffer.flush()
+            self.assertEqual(self.free(self.match), {("R", "A"): 8})
+
+            # rebuild 이후 변화량은 그대로 반영
+            self.reserve(self.seats[2])
+            availability.buffer.flush()
+        self.assertEqual(self.free(self.match), {("R", "A"): 7})
+        self.assert_consistent(self.match)
+
+    @override_settings(SEAT_AVAILABILITY_ASYNC=True, SEAT_AVAILABILITY_FLUSH_INTERVAL=3600)
+    def test_missing_rows_rebuild_does_not_double_count(self):
+        with mock.patch.object(availability, "buffer", availability.AvailabilityBuffer()):
+            self.reserve(self.block_seats["A"][0])
+            self.reserve(self.block_seats["B"][0])
+            self.reserve(self.block_seats["B"][1], user=self.other)
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM seat_availability WHERE match_id = %s", [self.two_blocks.match_id])
+
+            # 첫 구역 UPDATE 가 0행 → 경기 전체 rebuild → 같은 경기의 다른 구역 변화량은 버려짐
+            with mock.patch.object(availability, "rebuild", wraps=availability.rebuild) as rebuild:
+                availability.buffer.flush()
+            rebuild.assert_called_once_with([self.two_blocks.match_id])
+        self.assertEqual(self.free(self.two_blocks), {("R", "A"): 9, ("S", "B"): 8})
+        self.assert_consistent(self.two_blocks)
@@ -0,0 +1,104 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from tickets import abuse, availability, requestlog, stats
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def dead_thread():
+    thread = threading.Thread(target=lambda: None)
+    thread.start()
+    thread.join()
+    return thread
+
+
+class RequestLogWriterTests(SimpleTestCase):
+    def test_thread_survives_unexpected_error(self):
+        writer = requestlog.RequestLogWriter(batch_size=1, flush_interval=0.02)
+        with mock.patch.object(requestlog, "write_rows", side_effect=[ValueError("bad row"), None]), \
+                self.assertLogs("tickets.requestlog", "ERROR"):
+            writer.put(("bad",))
+            self.assertTrue(wait_for(lambda: writer.stats()["failed"] == 1))
+            writer.put(("good",))
+            self.assertTrue(wait_for(lambda: writer.stats()["written"] == 1))
+        self.assertTrue(writer._thread.is_alive())
+        writer.stop(timeout=1)
+
+    def test_dead_thread_is_restarted(self):
+        writer = requestlog.RequestLogWriter(batch_size=1, flush_interval=0.02)
+        writer._thread = dead_thread()
+        with mock.patch.object(requestlog, "write_rows"):
+            writer.put(("row",))
+            self.assertTrue(writer._thread.is_alive())
+            self.assertTrue(wait_for(lambda: writer.stats()["written"] == 1))
+        writer.stop(timeout=1)
+
+
+class DeltaBufferTests(SimpleTestCase):
+    def test_stats_flush_continues_after_error(self):
+        buf = stats.StatsBuffer(flush_interval=60)
+        current = stats.epochs([1, 2])
+        buf._pending = {1: [1, 1, 100, current[1]], 2: [1, 1, 200, current[2]]}
+        with mock.patch.object(stats, "apply_delta", side_effect=[RuntimeError("boom"), None]) as apply, \
+                self.assertLogs("tickets.stats", "ERROR"):
+            buf.flush()
+        self.assertEqual(apply.call_count, 2)
+
+    def test_stats_dead_thread_is_restarted(self):
+        buf = stats.StatsBuffer(flush_interval=60)
+        buf._thread = dead_thread()
+        buf.add(1, 1, 1, 100)
+        self.assertTrue(buf._thread.is_alive())
+
+    def test_availability_flush_continues_after_error(self):
+        buf = availability.AvailabilityBuffer()
+        current = availability.epochs([1])[1]
+        buf._pending = {(1, "R", "A"): [-1, current], (1, "S", "B"): [-2, current]}
+        with mock.patch.object(availability, "apply_delta", side_effect=[RuntimeError("boom"), None]) as apply, \
+                self.assertLogs("tickets.availability", "ERROR"):
+            buf.flush()
+        self.assertEqual(apply.call_count, 2)
+
+    def test_availability_dead_thread_is_restarted(self):
+        buf = availability.AvailabilityBuffer()
+        buf._thread = dead_thread()
+        buf.add((1, "R", "A"), -1)
+        self.assertTrue(buf._thread.is_alive())
+
+
+class AbuseDetectorThreadTests(SimpleTestCase):
+    def test_thread_survives_unexpected_error(self):
+        detector = abuse.AbuseDetector()
+        calls = []
+
+        def drain(events=None):
+            calls.append(events)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+
+        with mock.patch.object(detector, "drain", side_effect=drain), \
+                self.assertLogs("tickets.abuse", "ERROR"):
+            detector.submit(("attempt",))
+            self.assertTrue(wait_for(lambda: len(calls) == 1))
+            detector.submit(("attempt",))
+            self.assertTrue(wait_for(lambda: len(calls) == 2))
+        self.assertTrue(detector._thread.is_alive())
+
+    def test_dead_thread_is_restarted(self):
+        detector = abuse.AbuseDetector()
+        detector._thread = dead_thread()
+        with mock.patch.object(detector, "drain") as drain:
+            detector.submit(("attempt",))
+            self.assertTrue(detector._thread.is_alive())
+            self.assertTrue(wait_for(lambda: drain.called))
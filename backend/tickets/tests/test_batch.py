@@ -0,0 +1,57 @@
+from tickets import reservations
+from tickets.models import Payment, Reservation
+
+from .base import TicketsTestCase
+
+
+class BatchReservationTests(TicketsTestCase):
+    def batch(self, seats, user=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.post_json("/api/reservations/batch/", {
+                "user_id": (user or self.user).user_id,
+                "match_id": self.match.match_id,
+                "seat_ids": [s.seat_id for s in seats],
+                "method": "card",
+            })
+
+    def test_all_seats_reserved_with_seat_prices(self):
+        seats = self.seats[:3]
+        response = self.batch(seats)
+        self.assertEqual(response.status_code, 201)
+        results = response.json()["results"]
+        self.assertEqual([r["seat_id"] for r in results], [s.seat_id for s in seats])
+        self.assertTrue(all(r["status"] == "reserved" for r in results))
+        self.assertEqual(
+            sorted(Payment.objects.filter(res_id__in=[r["reservation_id"] for r in results])
+                   .values_list("amount", flat=True)),
+            [s.price for s in seats],
+        )
+        self.assertTrue(all(self.reserved_flags(seats).values()))
+
+    def test_one_taken_seat_fails_whole_batch(self):
+        self.reserve(self.seats[1], user=self.other)
+        response = self.batch(self.seats[:3])
+        self.assertEqual(response.status_code, 409)
+        body = response.json()
+        self.assertEqual(body["code"], reservations.SEAT_TAKEN)
+        self.assertEqual([r["code"] for r in body["results"]], [
+            reservations.BATCH_ABORTED, reservations.SEAT_TAKEN, reservations.BATCH_ABORTED,
+        ])
+        self.assertFalse(Reservation.objects.filter(user=self.user).exists())
+        flags = self.reserved_flags(self.seats[:3])
+        self.assertEqual(
+            [flags[s.seat_id] for s in self.seats[:3]], [False, True, False]
+        )
+
+    def test_limit_counts_existing_reservations(self):
+        self.reserve(self.seats[0])
+        self.reserve(self.seats[1])
+        response = self.batch(self.seats[2:5])
+        self.assertEqual(response.json()["code"], reservations.SEAT_LIMIT)
+        self.assertEqual(Reservation.objects.filter(user=self.user).count(), 2)
+
+    def test_invalid_requests(self):
+        self.assertEqual(
+            self.batch([self.seats[0], self.seats[0]]).json()["code"], reservations.INVALID_REQUEST
+        )
+        self.assertEqual(self.batch(self.seats[:5]).json()["code"], reservations.INVALID_REQUEST)
@@ -0,0 +1,87 @@
+import random
+from unittest import mock
+
+from tickets import bestseats
+from tickets.models import Seat
+
+from .base import TicketsTestCase, make_match
+
+BLOCKS = (("A", "VIP", 120000), ("B", "R", 70000), ("C", "S", 50000))
+
+
+def brute_force(match_id, count, grade=None, block=None, max_price=None, limit=bestseats.DEFAULT_SUGGESTIONS):
+    """모든 열의 모든 연속 구간을 보고 같은 순위로 고름"""
+    rows = {}
+    for seat in Seat.objects.filter(match_id=match_id):
+        rows.setdefault((seat.block, int(seat.row_no)), []).append(seat)
+    candidates = []
+    for order, key in enumerate(sorted(rows)):
+        seats = sorted(rows[key], key=lambda s: int(s.seat_number))
+        center = (len(seats) - 1) / 2
+        for i in range(len(seats) - count + 1):
+            window = seats[i:i + count]
+            if any(s.is_reserved for s in window) or (block and key[0] != block):
+                continue
+            if grade and any(s.grade != grade for s in window):
+                continue
+            if max_price and any(s.price > max_price for s in window):
+                continue
+            total = sum(s.price for s in window)
+            candidates.append((-total, abs(i + (count - 1) / 2 - center), order, [s.seat_id for s in window]))
+    return [c[3] for c in sorted(candidates)[:limit]]
+
+
+class BestSeatsTests(TicketsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.stadium = make_match(cls.home, cls.away, blocks=BLOCKS, rows=12, seats=12, days=8)
+        seats = list(Seat.objects.filter(match=cls.stadium).order_by("seat_id"))
+        taken = random.Random(7).sample(seats, len(seats) // 2)
+        Seat.objects.filter(pk__in=[s.pk for s in taken]).update(is_reserved=True)
+
+    def setUp(self):
+        super().setUp()
+        bestseats._indexes.clear()
+
+    def find(self, count, **kwargs):
+        _, suggestions = bestseats.find(self.stadium.match_id, count, **kwargs)
+        return [[s["seat_id"] for s in item["seats"]] for item in suggestions]
+
+    def test_matches_brute_force(self):
+        for count in range(1, 5):
+            for kwargs in ({}, {"grade": "R"}, {"block": "C"}, {"max_price": 70000}, {"limit": 20}):
+                with self.subTest(count=count, **kwargs):
+                    self.assertEqual(self.find(count, **kwargs),
+                                     brute_force(self.stadium.match_id, count, **kwargs))
+
+    def test_stops_after_limit_without_scanning_every_row(self):
+        self.find(1)
+        with mock.patch.object(bestseats._Row, "windows", autospec=True,
+                               side_effect=bestseats._Row.windows) as windows:
+            self.find(1, limit=2)
+        rows = len(bestseats._indexes[self.stadium.match_id].rows)
+        self.assertLess(windows.call_count, rows // 3)
+
+    def test_rows_and_seats_in_natural_order(self):
+        index = bestseats._indexes.get(self.stadium.match_id) or bestseats._Index(self.stadium.match_id)
+        index.refresh()
+        block_a = [row.row_no for row in index.rows if row.block == "A"]
+        self.assertEqual(block_a, [str(n) for n in range(1, 13)])
+        self.assertEqual([s[1] for s in index.rows[0].seats], [str(n) for n in range(1, 13)])
+
+    def test_follows_reservations_through_change_log(self):
+        first = self.find(2, limit=1)[0]
+        self.reserve(Seat.objects.get(pk=first[0]))
+        self.assertNotIn(first[0], sum(self.find(2, limit=20), []))
+        self.assertEqual(self.find(2), brute_force(self.stadium.match_id, 2))
+
+    def test_view(self):
+        response = self.client.get(f"/api/matches/{self.stadium.match_id}/best-seats/", {"count": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [[s["seat_id"] for s in item["seats"]] for item in response.json()["suggestions"]],
+            brute_force(self.stadium.match_id, 2),
+        )
+        response = self.client.get(f"/api/matches/{self.stadium.match_id}/best-seats/", {"count": 5})
+        self.assertEqual(response.status_code, 400)
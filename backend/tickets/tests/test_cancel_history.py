@@ -0,0 +1,78 @@
+import json
+from datetime import timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+from tickets import pagination
+from tickets.models import CancelLog, Reservation
+
+from .base import TicketsTestCase
+
+URL = "/api/admin/cancel-history/"
+
+
+class CancelHistoryPaginationTests(TicketsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        base = timezone.now().replace(microsecond=0) - timedelta(days=1)
+        # 같은 일시가 여러 건이어도 cancel_id 로 이어서 넘겨야 함
+        dates = [base, base, base, base + timedelta(hours=1), base + timedelta(hours=2),
+                 base + timedelta(hours=2), base + timedelta(hours=3)]
+        cls.logs = []
+        for i, when in enumerate(dates):
+            user = cls.user if i < 4 else cls.other
+            res = Reservation.objects.create(
+                user=user, match=cls.match, seat=cls.seats[i], res_date=base, status="active"
+            )
+            cls.logs.append(CancelLog.objects.create(res=res, user=user, cancel_date=when, reason="test"))
+        cls.expected = [
+            log.cancel_id for log in sorted(cls.logs, key=lambda l: (l.cancel_date, l.cancel_id), reverse=True)
+        ]
+
+    def pages(self, limit, **query):
+        ids, cursor = [], None
+        while True:
+            params = {"limit": limit, **query}
+            if cursor:
+                params["cursor"] = cursor
+            body = self.client.get(URL, params).json()
+            self.assertLessEqual(len(body["results"]), limit)
+            ids += [row["cancel_id"] for row in body["results"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return ids
+
+    def test_pages_cover_every_row_once_in_order(self):
+        self.assertEqual(self.pages(2), self.expected)
+        self.assertEqual(self.pages(3), self.expected)
+        self.assertEqual(self.pages(50), self.expected)
+
+    def test_filters_apply_to_every_page(self):
+        expected = [log.cancel_id for log in self.logs if log.user_id == self.other.user_id]
+        self.assertEqual(sorted(self.pages(1, user_id=self.other.user_id)), sorted(expected))
+
+    def test_invalid_cursor_and_limit(self):
+        self.assertEqual(self.client.get(URL, {"cursor": "not-a-cursor"}).status_code, 400)
+        self.assertEqual(self.client.get(URL, {"limit": "x"}).status_code, 400)
+
+    def test_export_streams_all_rows(self):
+        response = self.client.get(URL, {"export": "1"})
+        self.assertTrue(response.streaming)
+        rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([row["cancel_id"] for row in rows], self.expected)
+
+    def test_dates_keep_the_plain_format(self):
+        log = max(self.logs, key=lambda l: (l.cancel_date, l.cancel_id))
+        expected = log.cancel_date.astimezone(dt_timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        row = self.client.get(URL, {"limit": 1}).json()["results"][0]
+        self.assertEqual(row["cancel_date"], expected)
+
+        response = self.client.get(URL, {"export": "1"})
+        row = json.loads(b"".join(response.streaming_content))[0]
+        self.assertEqual(row["cancel_date"], expected)
+        self.assertRegex(row["match_date"], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+
+    def test_cursor_round_trip(self):
+        when = timezone.now().replace(microsecond=123456)
+        self.assertEqual(pagination.decode_cursor(pagination.encode_cursor(when, 42)), (when, 42))
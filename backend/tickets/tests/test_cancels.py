@@ -0,0 +1,69 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError, connection
+
+from tickets import cancels, reservations
+from tickets.models import AbuseLog, Reservation
+
+from .base import TicketsTestCase
+
+
+class CancelLimitTests(TicketsTestCase):
+    def reserve_and_cancel(self, seat):
+        res_id = self.reserve(seat).json()["reservation_id"]
+        return res_id, self.cancel(res_id)
+
+    def test_limit_blocks_after_three_cancels_and_flags_once(self):
+        for _ in range(cancels.CANCEL_LIMIT):
+            _, response = self.reserve_and_cancel(self.seats[0])
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(cancels.cancel_count(self.user.user_id, self.match.match_id), cancels.CANCEL_LIMIT)
+
+        res_id, response = self.reserve_and_cancel(self.seats[0])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Reservation.objects.get(pk=res_id).status, "active")
+        self.cancel(res_id)
+
+        flags = AbuseLog.objects.filter(user=self.user, event_type="too_many_cancels")
+        self.assertEqual(flags.count(), 1)
+
+    def test_counts_are_per_match_and_user(self):
+        self.reserve_and_cancel(self.seats[0])
+        self.assertEqual(cancels.cancel_count(self.user.user_id, self.match.match_id), 1)
+        self.assertEqual(cancels.cancel_count(self.other.user_id, self.match.match_id), 0)
+
+    def test_rebuild_recomputes_from_cancel_log(self):
+        self.reserve_and_cancel(self.seats[0])
+        self.reserve_and_cancel(self.seats[1])
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM cancel_counters")
+        self.assertEqual(cancels.cancel_count(self.user.user_id, self.match.match_id), 0)
+
+        call_command("rebuild_cancel_counters", stdout=StringIO())
+        self.assertEqual(cancels.cancel_count(self.user.user_id, self.match.match_id), 2)
+
+
+@mock.patch("tickets.reservations.time.sleep")
+class CancelRetryTests(TicketsTestCase):
+    def test_lock_error_is_retried(self, sleep):
+        res_id = self.reserve(self.seats[0]).json()["reservation_id"]
+        check_limit = cancels.check_limit
+        with mock.patch.object(
+            cancels, "check_limit",
+            side_effect=[OperationalError("database is locked"), check_limit(self.user.user_id, self.match.match_id)],
+        ):
+            response = self.cancel(res_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Reservation.objects.get(pk=res_id).status, "cancelled")
+        self.assertFalse(self.reserved_flags()[self.seats[0].seat_id])
+        self.assertEqual(cancels.cancel_count(self.user.user_id, self.match.match_id), 1)
+
+    def test_exhausted_retries_return_503(self, sleep):
+        res_id = self.reserve(self.seats[0]).json()["reservation_id"]
+        with mock.patch.object(cancels, "check_limit", side_effect=OperationalError("database is locked")):
+            response = self.cancel(res_id)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["code"], reservations.DEADLOCK)
+        self.assertEqual(Reservation.objects.get(pk=res_id).status, "active")
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from tickets import holds, reservations
+from tickets.models import Reservation, SeatHold
+from tickets.reservations import ReservationError
+
+from .base import TicketsTestCase
+
+
+class HoldTests(TicketsTestCase):
+    def hold(self, seats, user=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return holds.create_holds((user or self.user).user_id, self.match.match_id,
+                                      [s.seat_id for s in seats])
+
+    def expire_all(self):
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_hold_then_convert(self):
+        [held] = self.hold(self.seats[:1])
+        self.assertTrue(self.reserved_flags()[self.seats[0].seat_id])
+
+        response = self.post_json("/api/reservations/", {
+            "user_id": self.user.user_id, "hold_id": held["hold_id"],
+            "amount": self.seats[0].price, "method": "card",
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(Reservation.objects.get(pk=response.json()["reservation_id"]).seat_id,
+                         self.seats[0].seat_id)
+
+    def test_held_seat_is_taken_for_others(self):
+        self.hold(self.seats[:1])
+        with self.assertRaises(ReservationError) as ctx:
+            self.hold(self.seats[:1], user=self.other)
+        self.assertEqual(ctx.exception.code, reservations.SEAT_TAKEN)
+        self.assertEqual(self.reserve(self.seats[0], user=self.other).json()["code"],
+                         reservations.SEAT_TAKEN)
+
+    def test_expired_hold_cannot_be_converted(self):
+        [held] = self.hold(self.seats[:1])
+        self.expire_all()
+        with self.assertRaises(ReservationError) as ctx:
+            holds.convert_hold(self.user.user_id, held["hold_id"], 1, "card")
+        self.assertEqual(ctx.exception.code, reservations.HOLD_EXPIRED)
+
+    def test_sweeper_releases_expired_holds(self):
+        self.hold(self.seats[:2])
+        self.hold(self.seats[2:3], user=self.other)
+        SeatHold.objects.filter(user=self.user).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(holds.sweep_expired(batch_size=1), 2)
+        flags = self.reserved_flags(self.seats[:3])
+        self.assertEqual([flags[s.seat_id] for s in self.seats[:3]], [False, False, True])
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+
+class HoldLimitTests(TicketsTestCase):
+    def test_live_holds_count_toward_direct_reservation_limit(self):
+        holds.create_holds(self.user.user_id, self.match.match_id, [s.seat_id for s in self.seats[:3]])
+        self.assertEqual(self.reserve(self.seats[3]).status_code, 201)
+        response = self.reserve(self.seats[4])
+        self.assertEqual(response.json()["code"], reservations.SEAT_LIMIT)
+        self.assertFalse(self.reserved_flags()[self.seats[4].seat_id])
+
+    def test_live_holds_count_toward_batch_limit(self):
+        holds.create_holds(self.user.user_id, self.match.match_id, [s.seat_id for s in self.seats[:2]])
+        with self.assertRaises(ReservationError) as ctx:
+            reservations.reserve_seats(self.user.user_id, self.match.match_id,
+                                       [s.seat_id for s in self.seats[2:5]], "card")
+        self.assertEqual(ctx.exception.code, reservations.SEAT_LIMIT)
+
+    def test_expired_holds_do_not_count(self):
+        holds.create_holds(self.user.user_id, self.match.match_id, [s.seat_id for s in self.seats[:4]])
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(reservations.owned_count(self.user.user_id, self.match.match_id), 0)
+        self.assertEqual(self.reserve(self.seats[5]).status_code, 201)
+
+    def test_other_users_holds_do_not_count(self):
+        holds.create_holds(self.other.user_id, self.match.match_id, [s.seat_id for s in self.seats[:4]])
+        self.assertEqual(self.reserve(self.seats[5]).status_code, 201)
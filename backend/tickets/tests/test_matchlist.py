@@ -0,0 +1,54 @@
+from tickets.models import Match
+
+from .base import TicketsTestCase, make_match
+
+
+class MatchListTests(TicketsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.second = make_match(cls.away, cls.home, days=8, stadium="고척스카이돔")
+        cls.third = make_match(cls.home, cls.away, days=9)
+
+    def get(self, query="", **headers):
+        return self.client.get(f"/api/matches/{query}", headers=headers)
+
+    def test_lists_matches_by_date(self):
+        results = self.get().json()["results"]
+        self.assertEqual([r["match_id"] for r in results],
+                         [self.match.match_id, self.second.match_id, self.third.match_id])
+        self.assertEqual(results[0]["home_team"], self.home.team_name)
+
+    def test_cursor_pagination(self):
+        page = self.get("?limit=2").json()
+        self.assertEqual(len(page["results"]), 2)
+        rest = self.get(f"?limit=2&cursor={page['next_cursor']}").json()
+        self.assertEqual([r["match_id"] for r in rest["results"]], [self.third.match_id])
+        self.assertIsNone(rest["next_cursor"])
+
+    def test_filters(self):
+        results = self.get("?stadium=고척스카이돔").json()["results"]
+        self.assertEqual([r["match_id"] for r in results], [self.second.match_id])
+        self.assertEqual(self.get("?bad=1&team=abc").status_code, 400)
+
+    def test_cached_response_and_conditional_get(self):
+        first = self.get()
+        with self.assertNumQueries(0):
+            second = self.get()
+        self.assertEqual(first.content, second.content)
+
+        self.assertEqual(self.get(**{"If-None-Match": first["ETag"]}).status_code, 304)
+        self.assertEqual(self.get(**{"If-Modified-Since": first["Last-Modified"]}).status_code, 304)
+        self.assertEqual(self.get(**{"If-None-Match": '"stale"'}).status_code, 200)
+
+    def test_match_change_invalidates(self):
+        first = self.get()
+        Match.objects.filter(pk=self.third.pk).update(stadium="사직야구장")
+        self.assertEqual(self.get().content, first.content)  # update() 는 시그널이 없음 (TTL 대기)
+
+        third = Match.objects.get(pk=self.third.pk)
+        third.save()
+        second = self.get()
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second.json()["results"][2]["stadium"], "사직야구장")
+        self.assertEqual(self.get(**{"If-None-Match": first["ETag"]}).status_code, 200)
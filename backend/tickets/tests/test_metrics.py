@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+
+from tickets import metrics
+
+from .base import TicketsTestCase
+
+
+class RegistryTests(SimpleTestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        registry = metrics.Registry()
+        registry.observe("match_list", "GET", 200, 0.02, 3, 0.001, 0)
+        registry.observe("match_list", "GET", 304, 0.3, 1, 0.002, 1)
+        text = registry.render()
+
+        labels = 'view="match_list",method="GET"'
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.01"}} 0', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 2', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 2", text)
+        self.assertIn(f'http_requests_total{{{labels},status="200"}} 1', text)
+        self.assertIn(f'http_requests_total{{{labels},status="304"}} 1', text)
+        self.assertIn(f"db_queries_total{{{labels}}} 4", text)
+        self.assertIn(f"db_lock_errors_total{{{labels}}} 1", text)
+        self.assertIn('background_queue{worker="request_log",field="dropped"}', text)
+
+
+class QueryRecorderTests(SimpleTestCase):
+    def test_counts_lock_errors(self):
+        recorder = metrics._QueryRecorder(keep_sql=True)
+        context = {"connection": mock.Mock(alias="default")}
+
+        recorder(lambda *args: None, "SELECT 1", None, False, context)
+
+        def locked(*args):
+            raise OperationalError("database is locked")
+
+        with self.assertRaises(OperationalError):
+            recorder(locked, "UPDATE seats SET is_reserved = 0", None, False, context)
+        self.assertEqual((recorder.count, recorder.lock_errors), (2, 1))
+        self.assertEqual([sql for _, _, sql in recorder.statements],
+                         ["SELECT 1", "UPDATE seats SET is_reserved = 0"])
+
+
+class MiddlewareTests(TicketsTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(metrics, "registry", metrics.Registry())
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_are_recorded_by_url_name(self):
+        self.client.get("/api/matches/")
+        self.client.get("/api/no-such-endpoint/")
+        text = self.client.get("/api/metrics/").content.decode()
+
+        self.assertIn('http_requests_total{view="match_list",method="GET",status="200"} 1', text)
+        self.assertIn('http_requests_total{view="unmatched",method="GET",status="404"} 1', text)
+        queries = self.registry._endpoints[("match_list", "GET")].queries
+        self.assertGreater(queries, 0)
+
+    @override_settings(METRICS_SLOW_REQUEST_MS=0)
+    def test_slow_request_is_logged_with_sql(self):
+        with self.assertLogs("tickets.metrics", "WARNING") as logs:
+            self.client.get("/api/matches/")
+        self.assertIn("match_list", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+    @override_settings(METRICS_SLOW_REQUEST_MS=None)
+    def test_slow_log_can_be_disabled(self):
+        with self.assertNoLogs("tickets.metrics", "WARNING"):
+            self.client.get("/api/matches/")
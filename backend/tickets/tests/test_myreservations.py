@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from tickets import auth
+from tickets.models import Payment, Reservation
+
+from .base import TicketsTestCase
+
+URL = "/api/my/reservations/"
+
+
+class MyReservationsTests(TicketsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        base = timezone.now().replace(microsecond=0) - timedelta(days=1)
+        cls.reservations = []
+        # 같은 예매 일시도 res_id 로 이어서 넘겨야 함
+        for i, when in enumerate([base, base, base + timedelta(hours=1), base + timedelta(hours=2)]):
+            res = Reservation.objects.create(
+                user=cls.user, match=cls.match, seat=cls.seats[i], res_date=when,
+                status="cancelled" if i == 1 else "active",
+            )
+            Payment.objects.create(res=res, amount=cls.seats[i].price, method="card", pay_date=when)
+            cls.reservations.append(res)
+        Reservation.objects.create(
+            user=cls.other, match=cls.match, seat=cls.seats[5], res_date=base, status="active"
+        )
+        cls.expected = [
+            r.res_id for r in sorted(cls.reservations, key=lambda r: (r.res_date, r.res_id), reverse=True)
+        ]
+
+    def get(self, **query):
+        return self.client.get(URL, {"user_id": self.user.user_id, **query})
+
+    def pages(self, limit, **query):
+        ids, cursor = [], None
+        while True:
+            params = {"limit": limit, **query}
+            if cursor:
+                params["cursor"] = cursor
+            body = self.get(**params).json()
+            ids += [row["res_id"] for row in body["results"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return ids
+
+    def test_rows_join_match_seat_and_payment(self):
+        row = self.get().json()["results"][0]
+        latest = self.reservations[3]
+        self.assertEqual(row["res_id"], latest.res_id)
+        self.assertEqual((row["home_team"], row["away_team"]), (self.home.team_name, self.away.team_name))
+        self.assertEqual((row["seat_id"], row["row_no"], row["amount"], row["method"]),
+                         (latest.seat_id, self.seats[3].row_no, self.seats[3].price, "card"))
+
+    def test_pages_cover_every_row_once_in_order(self):
+        self.assertEqual(self.pages(1), self.expected)
+        self.assertEqual(self.pages(3), self.expected)
+
+    def test_status_filter(self):
+        self.assertEqual(self.pages(2, status="cancelled"), [self.reservations[1].res_id])
+        self.assertEqual(self.get(status="held").status_code, 400)
+
+    def test_cached_until_the_user_writes(self):
+        first = self.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get().content, first.content)
+
+        self.cancel(self.reservations[3].res_id)
+        row = self.get().json()["results"][0]
+        self.assertEqual(row["status"], "cancelled")
+
+    def test_other_users_write_keeps_cache(self):
+        self.get()
+        self.reserve(self.seats[6], user=self.other)
+        with self.assertNumQueries(0):
+            self.get()
+
+    def test_user_resolution(self):
+        self.assertEqual(self.client.get(URL).status_code, 400)
+        token, _ = auth.issue_token(self.user)
+        headers = {"Authorization": f"Bearer {token}"}
+        response = self.client.get(URL, headers=headers)
+        self.assertEqual([r["res_id"] for r in response.json()["results"]], self.expected)
+        response = self.client.get(URL, {"user_id": self.other.user_id}, headers=headers)
+        self.assertEqual(response.status_code, 403)
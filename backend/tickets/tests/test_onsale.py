@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.utils import timezone
+
+from tickets import checks, onsale, seatlayout, seatmap
+
+from .base import TicketsTestCase
+
+
+class ScheduleTests(TicketsTestCase):
+    def row(self, match_id):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sale_open, warmed_at FROM match_sales WHERE match_id = %s", [match_id])
+            return cursor.fetchall()
+
+    def test_set_sale_open_upserts(self):
+        now = timezone.now().replace(microsecond=0)
+        onsale.set_sale_open(self.match.match_id, now + timedelta(seconds=60))
+        self.assertEqual(onsale.due(now), [self.match.match_id])
+
+        onsale.mark_warmed(self.match.match_id)
+        self.assertEqual(onsale.due(now), [])
+        self.assertIsNotNone(self.row(self.match.match_id)[0][1])
+
+        # 오픈 시각을 바꾸면 같은 행을 갱신하고 다시 예열 대상
+        onsale.set_sale_open(self.match.match_id, now + timedelta(hours=2))
+        rows = self.row(self.match.match_id)
+        self.assertEqual(len(rows), 1)
+        self.assertIsNone(rows[0][1])
+        self.assertEqual(onsale.due(now), [])
+        self.assertEqual(onsale.due(now + timedelta(hours=2)), [self.match.match_id])
+
+    def test_due_window(self):
+        now = timezone.now()
+        onsale.set_sale_open(self.match.match_id, now + timedelta(seconds=400))
+        self.assertEqual(onsale.due(now), [])
+        self.assertEqual(onsale.due(now, lead=500), [self.match.match_id])
+        # 막 열린 경기도 예열
+        self.assertEqual(onsale.due(now + timedelta(seconds=500)), [self.match.match_id])
+        self.assertEqual(onsale.due(now + timedelta(seconds=800)), [])
+
+
+class WarmTests(TicketsTestCase):
+    def test_warm_match(self):
+        timings = onsale.warm_match(self.match.match_id)
+        self.assertEqual(set(timings), {"layout", "bitmap", "snapshot", "availability", "stats"})
+        # 조회 경로가 캐시만 읽음
+        version = seatmap.current_version(self.match.match_id)
+        with self.assertNumQueries(0):
+            seatlayout.get_layout(self.match.match_id)
+            seatlayout.get_bitmap(self.match.match_id, version)
+
+    def test_probe_local(self):
+        result = onsale.probe_local(self.match.match_id)
+        self.assertEqual([(name, status) for name, status, _ in result],
+                         [("format=layout", 200), ("format=bitmap", 200), ("full", 200)])
+
+
+class SchedulerCommandTests(TicketsTestCase):
+    def run_command(self, *args, **options):
+        out = StringIO()
+        call_command("onsale_scheduler", *args, stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_probe_required_without_shared_cache(self):
+        self.assertFalse(checks.cache_is_shared())
+        with self.assertRaisesMessage(CommandError, "--probe-url"):
+            self.run_command(match=[self.match.match_id])
+
+    def test_probe_url(self):
+        onsale.set_sale_open(self.match.match_id, timezone.now() + timedelta(seconds=10))
+        with mock.patch.object(onsale, "probe_remote", return_value={"/api/matches/": (20, 0, 1.0)}) as probe:
+            out = self.run_command(probe_url="http://127.0.0.1:8000")
+        probe.assert_called_once_with("http://127.0.0.1:8000", [self.match.match_id])
+        self.assertIn(f"match_id={self.match.match_id}: layout=", out)
+        self.assertIn("/api/matches/: 성공 20", out)
+        self.assertEqual(onsale.due(), [])
+
+    def test_shared_cache_without_probe(self):
+        with mock.patch.object(checks, "cache_is_shared", return_value=True), \
+                mock.patch.object(onsale, "probe_remote") as probe:
+            out = self.run_command(match=[self.match.match_id])
+        probe.assert_not_called()
+        self.assertIn(f"match_id={self.match.match_id}: layout=", out)
+
+    def test_open(self):
+        out = self.run_command(open=[str(self.match.match_id), "2030-05-01T10:00:00"])
+        self.assertIn("판매 오픈", out)
+        self.assertEqual([row[0] for row in onsale.schedule()], [self.match.match_id])
+        with self.assertRaisesMessage(CommandError, "없는 경기"):
+            self.run_command(open=["999", "2030-05-01T10:00:00"])
+        with self.assertRaises(CommandError):
+            self.run_command(open=[str(self.match.match_id), "tomorrow"])
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from tickets import provisioning, stats
+from tickets.models import Match, Seat
+
+from .base import TicketsTestCase
+
+TEMPLATE = {
+    "stadium": "잠실야구장",
+    "prices": {"VIP": 70000, "R": 50000},
+    "blocks": [
+        {"block": "A", "grade": "VIP", "rows": "1-2", "seats": "1-3"},
+        {"block": "B", "grade": "R", "rows": ["1", "2"], "seats": ["A-B", "7"],
+         "row_seats": {"2": "1-2"}, "row_grades": {"1": "VIP"}},
+    ],
+}
+
+
+def write_template(test, template):
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(template if isinstance(template, str) else json.dumps(template))
+    test.addCleanup(os.remove, path)
+    return path
+
+
+class TemplateTests(SimpleTestCase):
+    def test_expand(self):
+        self.assertEqual(provisioning._expand("1-3"), ["1", "2", "3"])
+        self.assertEqual(provisioning._expand(" 9 - 11 "), ["9", "10", "11"])
+        self.assertEqual(provisioning._expand("C-E"), ["C", "D", "E"])
+        self.assertEqual(provisioning._expand(7), ["7"])
+        self.assertEqual(provisioning._expand(["1-2", "A", ["B-C"]]), ["1", "2", "A", "B", "C"])
+        for spec in ("3-1", "A-1", "AA-AC", "E-C"):
+            with self.assertRaises(ValueError, msg=spec):
+                provisioning._expand(spec)
+
+    def test_iter_seats(self):
+        self.assertEqual(list(provisioning.iter_seats(TEMPLATE)), [
+            ("A", "1", "1", "VIP", 70000), ("A", "1", "2", "VIP", 70000), ("A", "1", "3", "VIP", 70000),
+            ("A", "2", "1", "VIP", 70000), ("A", "2", "2", "VIP", 70000), ("A", "2", "3", "VIP", 70000),
+            # 1열은 row_grades, 2열은 row_seats
+            ("B", "1", "A", "VIP", 70000), ("B", "1", "B", "VIP", 70000), ("B", "1", "7", "VIP", 70000),
+            ("B", "2", "1", "R", 50000), ("B", "2", "2", "R", 50000),
+        ])
+
+    def test_unknown_grade(self):
+        template = {"prices": {"R": 1}, "blocks": [{"block": "A", "grade": "S", "rows": "1", "seats": "1"}]}
+        with self.assertRaisesMessage(ValueError, "가격이 없는 등급"):
+            list(provisioning.iter_seats(template))
+
+    def test_load_template(self):
+        self.assertEqual(provisioning.load_template(write_template(self, TEMPLATE)), TEMPLATE)
+
+    def test_load_template_errors(self):
+        cases = [
+            ("{", "템플릿을 읽을 수 없습니다"),
+            ({"prices": {}, "blocks": []}, "blocks 가 비어"),
+            ({"prices": {"R": 1}, "blocks": [{"block": "A", "grade": "R", "rows": "1"}]}, "seats 가 없습니다"),
+            ({"prices": {"R": 1}, "blocks": [{"block": "A", "grade": "R", "rows": "1", "seats": ["1-2", "2"]}]},
+             "중복된 좌석"),
+        ]
+        for template, message in cases:
+            with self.subTest(message=message), self.assertRaisesMessage(ValueError, message):
+                provisioning.load_template(write_template(self, template))
+        with self.assertRaisesMessage(ValueError, "템플릿을 읽을 수 없습니다"):
+            provisioning.load_template("/nonexistent/template.json")
+
+
+class ProvisionTests(TicketsTestCase):
+    def empty_match(self):
+        return Match.objects.create(
+            home_team=self.home, away_team=self.away, match_date=self.match.match_date,
+            stadium="잠실야구장", total_seats=0,
+        )
+
+    def keys(self, match_id):
+        return sorted(provisioning.existing_keys(match_id))
+
+    def test_provision_and_resume(self):
+        match = self.empty_match()
+        calls = []
+        inserted, skipped = provisioning.provision(
+            match.match_id, TEMPLATE, chunk_size=4, progress=lambda *a: calls.append(a)
+        )
+        self.assertEqual((inserted, skipped), (11, 0))
+        self.assertEqual(calls, [(4, 11), (8, 11), (11, 11)])
+
+        # 다시 실행하면 모두 건너뜀
+        self.assertEqual(provisioning.provision(match.match_id, TEMPLATE), (0, 11))
+        self.assertEqual(len(self.keys(match.match_id)), 11)
+
+    def test_overlapping_runs(self):
+        """미리 읽은 목록 뒤에 다른 실행이 넣은 좌석은 오류 없이 건너뜀"""
+        match = self.empty_match()
+        Seat.objects.create(match=match, block="A", row_no="1", seat_number="2",
+                            grade="VIP", price=70000, is_reserved=False)
+        with mock.patch.object(provisioning, "existing_keys", return_value=set()):
+            inserted, skipped = provisioning.provision(match.match_id, TEMPLATE, chunk_size=4)
+        self.assertEqual((inserted, skipped), (10, 1))
+        self.assertEqual(len(self.keys(match.match_id)), 11)
+
+    def test_finish(self):
+        match = self.empty_match()
+        provisioning.provision(match.match_id, TEMPLATE)
+        provisioning.finish([match.match_id])
+        match.refresh_from_db()
+        self.assertEqual(match.total_seats, 11)
+        self.assertEqual(stats.check([match.match_id]), [])
+
+    def test_command(self):
+        # 기존 경기는 A 블록 1~2열 1~5번 → 템플릿의 A 블록 6석은 이미 있음
+        path = write_template(self, TEMPLATE)
+        out, err = StringIO(), StringIO()
+        call_command("provision_seats", path, str(self.match.match_id), stdout=out, stderr=err)
+        self.assertIn("생성 5석, 기존 10석", out.getvalue())
+        # 테스트는 LocMem 캐시 → 워커에 반영되지 않는다는 경고
+        self.assertIn("워커를 재시작", err.getvalue())
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.total_seats, 15)
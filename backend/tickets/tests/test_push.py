@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from tickets import push
+
+from .base import TicketsTestCase
+
+
+def parse(frame):
+    lines = dict(line.split(": ", 1) for line in frame.strip().splitlines() if ": " in line)
+    return json.loads(lines["data"])
+
+
+class SubscriberTests(SimpleTestCase):
+    def test_keeps_last_state_per_seat_and_highest_version(self):
+        async def run():
+            sub = push.Subscriber(1, asyncio.get_running_loop())
+            sub.offer(5, 10, True)
+            sub.offer(7, 11, True)
+            sub.offer(6, 10, False)
+            self.assertTrue(sub.wakeup.is_set())
+            changes = sub.take()
+            self.assertFalse(sub.wakeup.is_set())
+            return sub.version, changes
+
+        version, changes = asyncio.run(run())
+        self.assertEqual(version, 7)
+        self.assertEqual(changes, [
+            {"seat_id": 11, "is_reserved": True},
+            {"seat_id": 10, "is_reserved": False},
+        ])
+
+
+@override_settings(PUSH_COALESCE_MS=20, PUSH_HEARTBEAT=0.3)
+class StreamTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(push, "_broker", push.InProcessBroker())
+        self.broker = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_frames_heartbeat_and_unsubscribe(self):
+        async def run():
+            stream = push.stream(1, 100)
+            first = await stream.__anext__()
+            self.assertEqual(self.broker.subscriber_count(), 1)
+
+            # 다른 스레드(커밋 콜백)에서 보낸 변경이 한 프레임으로 모임
+            def commit():
+                push.publish(1, 101, 3, True)
+                push.publish(1, 102, 4, True)
+                push.publish(2, 103, 9, True)  # 다른 경기
+
+            threading.Thread(target=commit).start()
+            second = await stream.__anext__()
+            ping = await stream.__anext__()
+            await stream.aclose()
+            return first, second, ping
+
+        first, second, ping = asyncio.run(run())
+        self.assertTrue(first.startswith("retry: 3000\n"))
+        self.assertEqual(parse(first), {"version": 100, "changes": []})
+        self.assertEqual(parse(second), {"version": 102, "changes": [
+            {"seat_id": 3, "is_reserved": True},
+            {"seat_id": 4, "is_reserved": True},
+        ]})
+        self.assertEqual(ping, ": ping\n\n")
+        self.assertEqual(self.broker.subscriber_count(), 0)
+
+    def test_publish_errors_are_logged(self):
+        with mock.patch.object(self.broker, "publish", side_effect=RuntimeError("boom")), \
+                self.assertLogs("tickets.push", "ERROR"):
+            push.publish(1, 1, 1, True)
+
+
+class SeatEventsViewTests(TicketsTestCase):
+    def test_requires_asgi(self):
+        response = self.client.get(f"/api/matches/{self.match.match_id}/seats/events/")
+        self.assertEqual(response.status_code, 501)
+
+    def test_commit_publishes_change(self):
+        with mock.patch.object(push, "publish") as publish:
+            self.reserve(self.seats[0])
+        publish.assert_called_once()
+        match_id, _, seat_id, is_reserved = publish.call_args.args
+        self.assertEqual((match_id, seat_id, is_reserved), (self.match.match_id, self.seats[0].seat_id, True))
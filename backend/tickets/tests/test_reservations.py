@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.db import DatabaseError, OperationalError, transaction
+from django.utils import timezone
+
+from tickets import reservations
+from tickets.models import Payment, Reservation, Seat
+from tickets.reservations import ReservationError
+
+from .base import TicketsTestCase, make_match
+
+
+class ReserveSeatTests(TicketsTestCase):
+    def test_reserve_creates_reservation_and_payment(self):
+        seat = self.seats[0]
+        response = self.reserve(seat)
+        self.assertEqual(response.status_code, 201)
+
+        reservation = Reservation.objects.get(pk=response.json()["reservation_id"])
+        self.assertEqual((reservation.user_id, reservation.seat_id, reservation.status),
+                         (self.user.user_id, seat.seat_id, "active"))
+        self.assertEqual(Payment.objects.get(res=reservation).amount, seat.price)
+        self.assertTrue(self.reserved_flags()[seat.seat_id])
+
+    def test_taken_seat_fails_with_code(self):
+        self.reserve(self.seats[0])
+        response = self.reserve(self.seats[0], user=self.other)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["code"], reservations.SEAT_TAKEN)
+        self.assertEqual(Reservation.objects.filter(seat_id=self.seats[0].seat_id).count(), 1)
+
+    def test_match_mismatch_and_missing_seat(self):
+        other_match = make_match(self.home, self.away, days=8)
+        response = self.post_json("/api/reservations/", {
+            "user_id": self.user.user_id, "match_id": other_match.match_id,
+            "seat_id": self.seats[0].seat_id, "amount": 1, "method": "card",
+        })
+        self.assertEqual(response.json()["code"], reservations.MATCH_MISMATCH)
+
+        response = self.post_json("/api/reservations/", {
+            "user_id": self.user.user_id, "match_id": self.match.match_id,
+            "seat_id": 999999, "amount": 1, "method": "card",
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["code"], reservations.SEAT_NOT_FOUND)
+
+    def test_fifth_seat_hits_limit(self):
+        for seat in self.seats[:reservations.MAX_SEATS_PER_USER]:
+            self.assertEqual(self.reserve(seat).status_code, 201)
+        response = self.reserve(self.seats[reservations.MAX_SEATS_PER_USER])
+        self.assertEqual(response.json()["code"], reservations.SEAT_LIMIT)
+        self.assertFalse(self.reserved_flags()[self.seats[reservations.MAX_SEATS_PER_USER].seat_id])
+
+    def test_claim_is_guarded(self):
+        seat = self.seats[0]
+        # 선점은 잠금 + 조건 확인만, is_reserved 는 예매 INSERT 후 트리거가 바꿈
+        self.assertTrue(reservations.claim_seat(self.user.user_id, self.match.match_id, seat.seat_id))
+        self.assertFalse(self.reserved_flags()[seat.seat_id])
+
+        self.reserve(seat)
+        self.assertFalse(reservations.claim_seat(self.other.user_id, self.match.match_id, seat.seat_id))
+        self.assertEqual(
+            reservations.diagnose_claim(self.other.user_id, self.match.match_id, seat.seat_id),
+            reservations.SEAT_TAKEN,
+        )
+
+
+class TriggerTests(TicketsTestCase):
+    """운영 트리거와 같은 규칙: is_reserved = 1 인 좌석의 예매 INSERT 는 거부"""
+
+    def create_reservation(self, seat):
+        return Reservation.objects.create(
+            user_id=self.other.user_id, match_id=self.match.match_id, seat_id=seat.seat_id,
+            res_date=timezone.now(), status="active",
+        )
+
+    def test_insert_on_reserved_seat_is_rejected(self):
+        seat = self.seats[0]
+        Seat.objects.filter(pk=seat.pk).update(is_reserved=True)
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            self.create_reservation(seat)
+
+    def test_insert_sets_and_cancel_clears_is_reserved(self):
+        seat = self.seats[0]
+        reservation = self.create_reservation(seat)
+        self.assertTrue(self.reserved_flags()[seat.seat_id])
+        reservation.status = "cancelled"
+        reservation.save()
+        self.assertFalse(self.reserved_flags()[seat.seat_id])
+
+
+@mock.patch("tickets.reservations.time.sleep")
+class WithRetryTests(TicketsTestCase):
+    def test_retries_lock_errors_then_succeeds(self, sleep):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < reservations.MAX_ATTEMPTS:
+                raise OperationalError("database is locked")
+            return "ok"
+
+        self.assertEqual(reservations.with_retry(flaky), "ok")
+        self.assertEqual(len(calls), reservations.MAX_ATTEMPTS)
+        self.assertEqual(sleep.call_count, reservations.MAX_ATTEMPTS - 1)
+
+    def test_exhausted_retries_become_deadlock(self, sleep):
+        def deadlock():
+            raise OperationalError(1213, "Deadlock found when trying to get lock")
+
+        with self.assertRaises(ReservationError) as ctx:
+            reservations.with_retry(deadlock)
+        self.assertEqual(ctx.exception.code, reservations.DEADLOCK)
+        self.assertEqual(ctx.exception.status, 503)
+
+    def test_other_errors_are_not_retried(self, sleep):
+        def broken():
+            raise OperationalError(1054, "Unknown column")
+
+        with self.assertRaises(OperationalError):
+            reservations.with_retry(broken)
+        sleep.assert_not_called()
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from tickets import routers
+
+from .base import TEST_SETTINGS
+
+@routers.use_replica
+def read_alias_view(request):
+    return routers.read_alias()
+
+
+@override_settings(**TEST_SETTINGS, REPLICA_READ_YOUR_WRITES=5)
+class UseReplicaTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(routers, "replica_enabled", return_value=True)
+        self.replica_enabled = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, query="", auth_user_id=None):
+        request = self.factory.get(f"/api/my-reservations/{query}")
+        request.auth_user_id = auth_user_id
+        return read_alias_view(request)
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.get("?user_id=1"), routers.REPLICA_ALIAS)
+        self.assertEqual(routers.ReplicaRouter().db_for_read(None), "default")
+
+    def test_query_user_pinned_after_write(self):
+        routers.mark_write(1)
+        self.assertEqual(self.get("?user_id=1"), "default")
+        self.assertEqual(self.get("?user_id=2"), routers.REPLICA_ALIAS)
+
+    def test_token_user_pinned_without_query_param(self):
+        routers.mark_write(1)
+        self.assertEqual(self.get(auth_user_id=1), "default")
+        self.assertEqual(self.get(auth_user_id=2), routers.REPLICA_ALIAS)
+
+    def test_token_user_wins_over_query_param(self):
+        routers.mark_write(1)
+        self.assertEqual(self.get("?user_id=2", auth_user_id=1), "default")
+
+    @override_settings(REPLICA_READ_YOUR_WRITES=0)
+    def test_pin_disabled(self):
+        routers.mark_write(1)
+        self.assertEqual(self.get(auth_user_id=1), routers.REPLICA_ALIAS)
+
+    def test_without_replica_everything_reads_default(self):
+        self.replica_enabled.return_value = False
+        self.assertEqual(self.get("?user_id=1"), "default")
@@ -0,0 +1,61 @@
+import base64
+import json
+
+from tickets import seatlayout, seatmap
+from tickets.models import Seat
+
+from .base import TicketsTestCase, make_match
+
+
+class SeatLayoutTests(TicketsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 12열 x 12석 → 문자열 순이면 "10" 이 "2" 앞에 옴
+        cls.big = make_match(cls.home, cls.away, rows=12, seats=12, days=8)
+
+    def layout(self, match_id):
+        return json.loads(seatlayout.get_layout(match_id)[0])
+
+    def test_natural_order(self):
+        self.assertEqual(
+            sorted(["10", "2", "B", "1", "A", "01"], key=seatlayout.natural_key),
+            ["01", "1", "2", "10", "A", "B"],
+        )
+        rows = self.layout(self.big.match_id)["blocks"][0]["rows"]
+        self.assertEqual([r["row_no"] for r in rows], [str(n) for n in range(1, 13)])
+        self.assertEqual(rows[0]["numbers"], [[1, 12]])
+
+    def test_seat_ids_follow_ordinals(self):
+        _, _, seat_ids = seatlayout.get_layout(self.big.match_id)
+        expected = [
+            seat.seat_id
+            for seat in sorted(
+                Seat.objects.filter(match=self.big),
+                key=lambda s: (int(s.row_no), int(s.seat_number)),
+            )
+        ]
+        self.assertEqual(seat_ids, expected)
+
+    def test_bitmap_bit_matches_reserved_seat(self):
+        seat = Seat.objects.get(match=self.big, row_no="10", seat_number="2")
+        Seat.objects.filter(pk=seat.pk).update(is_reserved=True)
+        _, _, seat_ids = seatlayout.get_layout(self.big.match_id)
+        bitmap = json.loads(seatlayout.get_bitmap(self.big.match_id, seatmap.current_version(self.big.match_id)))
+        bits = base64.b64decode(bitmap["bits"])
+        ordinal = seat_ids.index(seat.seat_id)
+        self.assertEqual(ordinal, 9 * 12 + 1)
+        self.assertTrue(bits[ordinal >> 3] & (0x80 >> (ordinal & 7)))
+        self.assertEqual(sum(bin(b).count("1") for b in bits), 1)
+
+    def test_reset_invalidates_cached_layout(self):
+        before = self.layout(self.match.match_id)
+        Seat.objects.create(
+            match=self.match, block="B", row_no="1", seat_number="1", grade="S", price=30000, is_reserved=False
+        )
+        self.assertEqual(self.layout(self.match.match_id), before)
+
+        seatmap.reset(self.match.match_id)
+        after = self.layout(self.match.match_id)
+        self.assertNotEqual(after["layout"], before["layout"])
+        self.assertEqual(after["count"], before["count"] + 1)
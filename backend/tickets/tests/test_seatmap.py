@@ -0,0 +1,72 @@
+from django.core.checks import Error
+from django.test import SimpleTestCase, override_settings
+
+from tickets import checks, seatmap
+
+from .base import TicketsTestCase
+
+
+class SeatMapVersionTests(TicketsTestCase):
+    def url(self, query=""):
+        return f"/api/matches/{self.match.match_id}/seats/{query}"
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), len(self.seats))
+        etag = response["ETag"]
+        self.assertEqual(response["X-Seat-Version"], str(seatmap.current_version(self.match.match_id)))
+
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_reservation_bumps_version_and_since_returns_delta(self):
+        before = seatmap.current_version(self.match.match_id)
+        self.assertEqual(self.reserve(self.seats[0]).status_code, 201)
+        after = seatmap.current_version(self.match.match_id)
+        self.assertEqual(after, before + 1)
+
+        body = self.client.get(self.url(f"?since={before}")).json()
+        self.assertEqual(body, {
+            "version": after,
+            "full": False,
+            "changes": [{"seat_id": self.seats[0].seat_id, "is_reserved": True}],
+        })
+        self.assertEqual(self.client.get(self.url(f"?since={after}")).json()["changes"], [])
+
+    def test_since_without_change_log_returns_full_list(self):
+        version = seatmap.current_version(self.match.match_id)
+        body = self.client.get(self.url(f"?since={version - 5}")).json()
+        self.assertTrue(body["full"])
+        self.assertEqual(len(body["seats"]), len(self.seats))
+
+    def test_reset_skips_past_change_log(self):
+        version = seatmap.current_version(self.match.match_id)
+        new_version = seatmap.reset(self.match.match_id)
+        self.assertGreater(new_version, version + seatmap.MAX_DELTA)
+        self.assertIsNone(seatmap.changes_since(self.match.match_id, version, new_version))
+
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379/0"}}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(CACHES=LOCMEM, WEB_CONCURRENCY=1, SEAT_SHM_DIR=None)
+    def test_single_worker_locmem_is_fine(self):
+        self.assertEqual(checks.check_shared_cache(None), [])
+
+    @override_settings(CACHES=LOCMEM, WEB_CONCURRENCY=4, SEAT_SHM_DIR=None)
+    def test_multiple_workers_need_shared_cache(self):
+        errors = checks.check_shared_cache(None)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], Error)
+        self.assertEqual(errors[0].id, "tickets.E001")
+
+    @override_settings(CACHES=LOCMEM, WEB_CONCURRENCY=1, SEAT_SHM_DIR="/dev/shm/tickets")
+    def test_shared_bitmap_needs_shared_cache(self):
+        self.assertEqual([e.id for e in checks.check_shared_cache(None)], ["tickets.E001"])
+
+    @override_settings(CACHES=REDIS, WEB_CONCURRENCY=4, SEAT_SHM_DIR=None)
+    def test_redis_passes(self):
+        self.assertEqual(checks.check_shared_cache(None), [])
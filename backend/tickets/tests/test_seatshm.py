@@ -0,0 +1,92 @@
+import fcntl
+import json
+import os
+import tempfile
+import threading
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from tickets import seatlayout, seatmap, seatshm
+from tickets.models import Seat
+
+from .base import TicketsTestCase
+
+
+class SeatShmTests(TicketsTestCase):
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = os.path.join(tmp.name, "shm")
+        override = override_settings(SEAT_SHM_DIR=self.dir, SEAT_SHM_RECONCILE_INTERVAL=3600)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(self.close_maps)
+
+    def close_maps(self):
+        for shm in seatshm._maps.values():
+            if shm.mm is not None:
+                shm.mm.close()
+            if shm.fd is not None:
+                os.close(shm.fd)
+        seatshm._maps.clear()
+
+    def files(self):
+        return os.listdir(self.dir) if os.path.isdir(self.dir) else []
+
+    def bits(self, match_id):
+        layout_hash, count, bits = seatshm.read(match_id)
+        return [bool(bits[i >> 3] & (0x80 >> (i & 7))) for i in range(count)]
+
+    def test_unknown_match_creates_no_file(self):
+        self.assertFalse(seatshm.is_mapped(999))
+        self.assertIsNone(seatshm.read(999))
+        self.assertEqual(seatshm.reconcile(999), 0)
+        seatshm.set_seat(999, 1, True)
+        with self.assertRaises(CommandError):
+            call_command("reconcile_seat_bitmaps", match=[999], stdout=StringIO())
+        self.assertEqual(self.files(), [])
+        self.assertEqual(self.client.get("/api/matches/999/seats/?format=bitmap").status_code, 404)
+        self.assertEqual(self.files(), [])
+
+    def test_read_maps_existing_match_and_follows_commits(self):
+        match_id = self.match.match_id
+        self.assertEqual(self.bits(match_id), [False] * len(self.seats))
+        self.assertTrue(seatshm.is_mapped(match_id))
+
+        self.reserve(self.seats[3])
+        _, _, seat_ids = seatlayout.get_layout(match_id)
+        expected = [seat_id == self.seats[3].seat_id for seat_id in seat_ids]
+        self.assertEqual(self.bits(match_id), expected)
+
+        response = self.client.get(f"/api/matches/{match_id}/seats/?format=bitmap")
+        db = json.loads(seatlayout.get_bitmap(match_id, seatmap.current_version(match_id)))
+        self.assertEqual(response.json()["bits"], db["bits"])
+
+    def test_reconcile_fixes_drift(self):
+        match_id = self.match.match_id
+        seatshm.reconcile(match_id)
+        Seat.objects.filter(pk__in=[s.pk for s in self.seats[:2]]).update(is_reserved=True)
+        with self.assertLogs("tickets.seatshm", "WARNING"):
+            self.assertEqual(seatshm.reconcile(match_id), 2)
+        self.assertEqual(sum(self.bits(match_id)), 2)
+
+    def test_read_waits_for_exclusive_lock(self):
+        match_id = self.match.match_id
+        seatshm.reconcile(match_id)
+        writer = os.open(seatshm._path(match_id), os.O_RDWR)
+        self.addCleanup(os.close, writer)
+
+        fcntl.flock(writer, fcntl.LOCK_EX)
+        result = []
+        reader = threading.Thread(target=lambda: result.append(seatshm.read(match_id)))
+        reader.start()
+        reader.join(0.2)
+        self.assertTrue(reader.is_alive())
+
+        fcntl.flock(writer, fcntl.LOCK_UN)
+        reader.join(5)
+        self.assertEqual(result[0][1], len(self.seats))
+        self.assertEqual(result[0][2], bytes(2))
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from tickets import holds, reservations, sequencer
+from tickets.models import Reservation, SeatHold
+from tickets.reservations import ReservationError
+
+from .base import TicketsTestCase
+
+
+class SequencerTests(TicketsTestCase):
+    def setUp(self):
+        super().setUp()
+        sequencer._owned.clear()
+        # 워커 스레드는 큐를 기다리기만 하고, 테스트는 _process 를 직접 호출
+        self.seq = sequencer.MatchSequencer(self.match.match_id)
+
+    def process(self, *claims):
+        self.seq._process(list(claims))
+
+    def claim(self, seat, user=None):
+        return sequencer._Claim((user or self.user).user_id, seat.seat_id, seat.price, "card")
+
+    def test_seat_freed_elsewhere_is_claimed_via_db(self):
+        seat = self.seats[0]
+        holds.create_holds(self.other.user_id, self.match.match_id, [seat.seat_id])
+        self.seq._load()
+        self.assertNotIn(seat.seat_id, self.seq.free)
+
+        # 다른 프로세스의 sweeper 가 만료 hold 를 해제 (이 프로세스에는 알림 없음)
+        SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        holds.sweep_expired()
+
+        claim = self.claim(seat)
+        self.process(claim)
+        reservation = claim.future.result(timeout=1)
+        self.assertEqual(reservation.seat_id, seat.seat_id)
+        self.assertTrue(self.seq.loaded)
+
+    def test_taken_seat_confirmed_by_db_keeps_state(self):
+        seat = self.seats[0]
+        reservations.reserve_seat(self.other.user_id, self.match.match_id, seat.seat_id, seat.price, "card")
+        self.seq._load()
+
+        claim = self.claim(seat)
+        self.process(claim)
+        with self.assertRaises(ReservationError) as ctx:
+            claim.future.result(timeout=1)
+        self.assertEqual(ctx.exception.code, reservations.SEAT_TAKEN)
+        self.assertTrue(self.seq.loaded)
+        self.assertEqual(self.seq.user_seats.get(self.user.user_id, set()), set())
+
+    def test_seat_limit_freed_elsewhere_is_checked_by_db(self):
+        limit = reservations.MAX_SEATS_PER_USER
+        reserved = [
+            reservations.reserve_seat(self.user.user_id, self.match.match_id, seat.seat_id, seat.price, "card")
+            for seat in self.seats[:limit]
+        ]
+        self.seq._load()
+        self.assertEqual(len(self.seq.user_seats[self.user.user_id]), limit)
+
+        # 다른 워커가 취소 (이 프로세스의 sequencer 에는 알림 없음)
+        self.assertEqual(self.cancel(reserved[0].res_id).status_code, 200)
+
+        claim = self.claim(self.seats[limit])
+        self.process(claim)
+        self.assertEqual(claim.future.result(timeout=1).seat_id, self.seats[limit].seat_id)
+        # 사용자 좌석 수가 실제보다 많았으니 다음 배치에서 다시 읽음
+        self.assertFalse(self.seq.loaded)
+
+    def test_seat_limit_in_one_batch(self):
+        limit = reservations.MAX_SEATS_PER_USER
+        self.seq._load()
+        claims = [self.claim(seat) for seat in self.seats[:limit + 1]]
+        self.process(*claims)
+        for claim in claims[:limit]:
+            claim.future.result(timeout=1)
+        with self.assertRaises(ReservationError) as ctx:
+            claims[-1].future.result(timeout=1)
+        self.assertEqual(ctx.exception.code, reservations.SEAT_LIMIT)
+        self.assertTrue(self.seq.loaded)
+        self.assertIn(self.seats[limit].seat_id, self.seq.free)
+
+    def test_same_seat_in_one_batch(self):
+        self.seq._load()
+        first, second = self.claim(self.seats[0]), self.claim(self.seats[0], self.other)
+        self.process(first, second)
+        self.assertEqual(first.future.result(timeout=1).user_id, self.user.user_id)
+        with self.assertRaises(ReservationError):
+            second.future.result(timeout=1)
+        self.assertEqual(Reservation.objects.filter(seat_id=self.seats[0].seat_id).count(), 1)
+
+    def test_hold_release_notifies_sequencer(self):
+        seat = self.seats[0]
+        [held] = holds.create_holds(self.user.user_id, self.match.match_id, [seat.seat_id])
+        with mock.patch("tickets.sequencer.seat_released") as released:
+            with self.captureOnCommitCallbacks(execute=True):
+                holds.release_hold(self.user.user_id, held["hold_id"])
+        released.assert_called_once_with(self.match.match_id, None, seat.seat_id)
+
+
+class SequencerOwnershipTests(TicketsTestCase):
+    def setUp(self):
+        super().setUp()
+        sequencer._owned.clear()
+
+    def tearDown(self):
+        sequencer._owned.clear()
+
+    def test_first_process_owns_match(self):
+        self.assertTrue(sequencer.acquire(self.match.match_id))
+        self.assertEqual(cache.get(sequencer._owner_key(self.match.match_id)), sequencer._TOKEN)
+
+    def test_other_owner_falls_back_to_direct_claim(self):
+        match_id = self.match.match_id
+        cache.set(sequencer._owner_key(match_id), "other-host:1", sequencer.OWNER_TTL)
+        with mock.patch.object(reservations, "reserve_seat") as direct, \
+                mock.patch.object(sequencer, "get_sequencer") as get_sequencer:
+            sequencer.reserve_seat(self.user.user_id, match_id, self.seats[0].seat_id, 1, "card")
+        direct.assert_called_once_with(self.user.user_id, match_id, self.seats[0].seat_id, 1, "card")
+        get_sequencer.assert_not_called()
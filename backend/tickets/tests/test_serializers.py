@@ -0,0 +1,54 @@
+import json
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.test import SimpleTestCase
+
+from tickets.serializers import (
+    BOOL, DATETIME, DATETIME_TEXT, FLOAT, INT, JSON, STR, RowLayout, format_datetime, format_datetime_text,
+)
+
+LAYOUT = RowLayout([
+    ("id", INT),
+    ("rate", FLOAT),
+    ("open", BOOL),
+    ("name", STR),
+    ("at", DATETIME),
+    ("at_text", DATETIME_TEXT),
+    ("extra", JSON),
+])
+
+
+class RowLayoutTests(SimpleTestCase):
+    def test_dumps_matches_json_module(self):
+        at = datetime(2025, 5, 1, 18, 30, 5, 123, tzinfo=dt_timezone.utc)
+        rows = [(1, 0.5, True, '따옴표 " 와 줄바꿈\n', at, at, {"k": [1]})]
+        self.assertEqual(json.loads(LAYOUT.dumps(rows)), [{
+            "id": 1, "rate": 0.5, "open": True, "name": '따옴표 " 와 줄바꿈\n',
+            "at": "2025-05-01T18:30:05+00:00", "at_text": "2025-05-01 18:30:05", "extra": {"k": [1]},
+        }])
+
+    def test_null_and_non_finite_floats(self):
+        rows = [(None, float("nan"), None, None, None, None, None), (2, float("inf"), False, "", None, None, [])]
+        decoded = json.loads(LAYOUT.dumps(rows))
+        self.assertEqual(decoded[0], dict.fromkeys(LAYOUT.names))
+        self.assertIsNone(decoded[1]["rate"])
+        self.assertEqual(LAYOUT.to_dict(rows[1])["rate"], None)
+
+    def test_empty(self):
+        self.assertEqual(LAYOUT.dumps([]), "[]")
+
+
+class DatetimeFormatTests(SimpleTestCase):
+    def test_naive_values_are_utc(self):
+        self.assertEqual(format_datetime(datetime(2025, 5, 1, 9, 0)), "2025-05-01T09:00:00+00:00")
+        kst = dt_timezone(timedelta(hours=9))
+        self.assertEqual(format_datetime(datetime(2025, 5, 1, 9, 0, tzinfo=kst)), "2025-05-01T09:00:00+09:00")
+
+    def test_strings_and_dates(self):
+        self.assertEqual(format_datetime("2025-05-01 09:00:00"), "2025-05-01T09:00:00+00:00")
+        self.assertEqual(format_datetime("not a date"), "not a date")
+        self.assertEqual(format_datetime(date(2025, 5, 1)), "2025-05-01")
+
+    def test_text_format_keeps_stored_value(self):
+        self.assertEqual(format_datetime_text(datetime(2025, 5, 1, 9, 0, 7, 500)), "2025-05-01 09:00:07")
+        self.assertEqual(format_datetime_text("2025-05-01 09:00:07.123"), "2025-05-01 09:00:07")
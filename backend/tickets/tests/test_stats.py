@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+
+from tickets import stats
+
+from .base import TEST_SETTINGS, TicketsTestCase, make_match, make_teams
+
+
+class MatchStatsTests(TicketsTestCase):
+    def row(self):
+        return stats.current([self.match.match_id])[self.match.match_id]
+
+    def assert_consistent(self):
+        self.assertEqual(stats.check([self.match.match_id]), [])
+
+    def test_reservation_and_cancel_update_stats(self):
+        seat = self.seats[0]
+        res_id = self.reserve(seat).json()["reservation_id"]
+        row = self.row()
+        # reserved_seats, occupancy_rate, total_sales, reservation_count
+        self.assertEqual((row[5], row[6], row[7], row[8]), (1, 10.0, seat.price, 1))
+
+        self.cancel(res_id)
+        self.assertEqual(self.row()[5], 0)
+        self.assert_consistent()
+
+    @override_settings(MATCH_STATS_ASYNC=True)
+    def test_rebuild_drops_buffered_deltas(self):
+        with mock.patch.object(stats, "buffer", stats.StatsBuffer(3600)):
+            self.reserve(self.seats[0])
+            self.reserve(self.seats[1])
+            self.assertEqual(self.row()[5], 0)
+
+            # 버퍼에 남은 변화량은 이미 커밋돼서 rebuild 집계에 들어감
+            stats.rebuild([self.match.match_id])
+            stats.buffer.flush()
+            self.assertEqual(self.row()[5], 2)
+
+            # rebuild 이후 변화량은 그대로 반영
+            self.reserve(self.seats[2])
+            stats.buffer.flush()
+        self.assertEqual(self.row()[5], 3)
+        self.assert_consistent()
+
+    @override_settings(MATCH_STATS_ASYNC=True)
+    def test_missing_row_rebuild_does_not_double_count(self):
+        with mock.patch.object(stats, "buffer", stats.StatsBuffer(3600)):
+            self.reserve(self.seats[0])
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM match_stats WHERE match_id = %s", [self.match.match_id])
+            self.reserve(self.seats[1])
+
+            # 0행 UPDATE → rebuild → 남은 같은 경기 변화량은 버려짐
+            stats.apply_delta(self.match.match_id, seats=1, reservations=1, sales=1)
+            stats.buffer.flush()
+        self.assertEqual(self.row()[5], 2)
+        self.assert_consistent()
+
+
+@override_settings(**TEST_SETTINGS)
+class MatchStatsMigrationTests(TransactionTestCase):
+    def test_reverse_restores_view(self):
+        home, away = make_teams()
+        match = make_match(home, away)
+        try:
+            call_command("migrate", "tickets", "0001", verbosity=0)
+            with connection.cursor() as cursor:
+                self.assertIn("match_stats", [
+                    t.name for t in connection.introspection.get_table_list(cursor) if t.type == "v"
+                ])
+                cursor.execute(
+                    "SELECT seat_count, reserved_seats, reservation_count FROM match_stats WHERE match_id = %s",
+                    [match.match_id],
+                )
+                self.assertEqual(cursor.fetchone(), (10, 0, 0))
+        finally:
+            call_command("migrate", "tickets", verbosity=0)
+        self.assertEqual(stats.rebuild([match.match_id]), [match.match_id])
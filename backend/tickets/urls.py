@@ -4,19 +4,37 @@ from . import views
 urlpatterns = [
     # 경기 목록
     path("matches/", views.match_list, name="match_list"),
+    # 경기/등급/블록별 잔여 좌석 요약
+    path("matches/availability/", views.seat_availability, name="seat_availability"),
+    # 대기열 입장 / 순번 조회
+    path("matches/<int:match_id>/queue/", views.join_queue, name="join_queue"),
+    path("queue/status/", views.queue_status, name="queue_status"),
     # 특정 경기 좌석 목록
     path("matches/<int:match_id>/seats/", views.match_seat_list, name="match_seat_list"),
+    # 붙어 있는 빈 좌석 추천
+    path("matches/<int:match_id>/best-seats/", views.best_seats, name="best_seats"),
+    # 좌석 예약/해제 실시간 전송 (SSE, ASGI 서버에서만)
+    path("matches/<int:match_id>/seats/events/", views.match_seat_events, name="match_seat_events"),
     # 예매 생성
     path("reservations/", views.create_reservation, name="create_reservation"),
+    # 여러 좌석 한 번에 예매
+    path("reservations/batch/", views.create_reservation_batch, name="create_reservation_batch"),
+    # 좌석 임시 선점 / 해제
+    path("holds/", views.create_hold, name="create_hold"),
+    path("holds/<int:hold_id>/release/", views.release_hold, name="release_hold"),
     # 예매 취소
     path("reservations/<int:res_id>/cancel/", views.cancel_reservation, name="cancel_reservation"),
     path("my/reservations/", views.my_reservations, name="my_reservations"),
 
     path("auth/login/", views.login_or_signup, name="login_or_signup"),
+    # 토큰(Authorization: Bearer) 사용자 정보
+    path("users/userinfo/", views.user_info, name="user_info"),
     path("admin/login/", views.admin_login, name="admin_login"),
     path("admin/match-stats/", views.admin_match_stats, name="admin_match_stats"),
     path("admin/abuse/", views.admin_abuse_candidates, name="admin_abuse"),
     path("admin/cancel-history/", views.admin_cancel_history, name="admin_cancel_history"),
+    # API 별 지연/SQL 지표 (Prometheus)
+    path("metrics/", views.metrics_endpoint, name="metrics"),
 
 
 ]
@@ -1,82 +1,291 @@
-from .models import Match, Seat, Reservation, Payment, Team, User
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.db import transaction, DatabaseError, connection
+import json
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-import json
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags, parse_http_date_safe
+from django.views.decorators.csrf import csrf_exempt
 
-from .models import Match, Seat, Reservation, Payment, Team
+from . import (
+    abuse, admission, auth, availability, bestseats, cancels, holds, matchlist, metrics, myreservations,
+    pagination, push, requestlog, reservations, routers, seatlayout, seatmap, seatshm, sequencer, stats,
+)
+from .admission import admission_required
+from .models import Match, Payment, Reservation, User
+from .reservations import ReservationError
+from .routers import use_replica
+from .serializers import DATETIME, DATETIME_TEXT, FLOAT, INT, STR, RowLayout, json_response
 
 
 def log_request(user_id, match_id, seat_id, success, reason, request):
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            INSERT INTO request_log
-            (user_id, match_id, seat_id, action, success, fail_reason, ip, user_agent)
-            VALUES (%s, %s, %s, 'reserve_attempt', %s, %s, %s, %s)
-        """, [
-            user_id,
-            match_id,
-            seat_id,
-            1 if success else 0,
-            reason,
-            request.META.get("REMOTE_ADDR"),
-            request.META.get("HTTP_USER_AGENT")
-        ])
-
+    # 예매 트랜잭션이 기다리지 않도록 버퍼에 넣고 백그라운드에서 모아서 INSERT
+    requestlog.enqueue((
+        user_id,
+        match_id,
+        seat_id,
+        "reserve_attempt",
+        1 if success else 0,
+        reason,
+        request.META.get("REMOTE_ADDR"),
+        request.META.get("HTTP_USER_AGENT"),
+    ))
+    abuse.observe_attempt(user_id, match_id, request.META.get("REMOTE_ADDR"), success)
+
+@use_replica
 def match_list(request):
     """
-    경기 목록 조회
+    경기 목록 조회 (경기일 오름차순)
     GET /api/matches/
+
+    query (모두 선택):
+      date_from, date_to : 경기 일시 범위 (YYYY-MM-DD 또는 ISO 일시)
+      team               : team_id (홈/원정 모두)
+      stadium            : 구장 이름
+      limit, cursor      : 페이지 크기(기본 50, 최대 200) / 이전 응답의 next_cursor
+
+    응답: {"results": [...], "next_cursor": "..." 또는 null}
+    - 직렬화된 응답을 캐시 (tickets.matchlist), ETag / Last-Modified 로 304 응답
     """
     if request.method != "GET":
         return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    matches = Match.objects.select_related("home_team", "away_team").all().order_by("match_date")
+    try:
+        params = {
+            "date_from": _parse_date_param(request.GET["date_from"]) if request.GET.get("date_from") else None,
+            "date_to": _parse_date_param(request.GET["date_to"], end=True) if request.GET.get("date_to") else None,
+            "team": int(request.GET["team"]) if request.GET.get("team") else None,
+            "stadium": request.GET.get("stadium") or None,
+            "limit": pagination.parse_limit(request.GET.get("limit")),
+            "cursor": pagination.decode_cursor(request.GET["cursor"]) if request.GET.get("cursor") else None,
+        }
+    except ValueError:
+        return JsonResponse({"error": "조회 조건이 올바르지 않습니다."}, status=400)
+
+    body, etag, last_modified = matchlist.get(params)
+
+    # If-None-Match 가 있으면 그것만, 없으면 If-Modified-Since 로 판단
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        not_modified = etag in parse_etags(if_none_match)
+    else:
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        not_modified = since is not None and since >= parse_http_date_safe(last_modified)
+
+    if not_modified:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@csrf_exempt
+def join_queue(request, match_id):
+    """
+    대기열 입장 (대기표 발급)
+    POST /api/matches/<match_id>/queue/
+
+    응답: {"ticket": "...", "admitted": false, "position": 120, "eta_seconds": 6}
+    이후 좌석 조회/예매 요청에 X-Queue-Ticket 헤더로 ticket 을 보냄
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST만 가능합니다."}, status=405)
+
+    if not admission.is_enabled(match_id):
+        return JsonResponse({"ticket": None, "admitted": True, "position": 0, "eta_seconds": 0})
+
+    ticket, status = admission.issue_ticket(match_id)
+    return JsonResponse({"ticket": ticket, **status})
+
 
-    data = []
-    for m in matches:
-        data.append({
-            "match_id": m.match_id,
-            "match_date": m.match_date.isoformat(),
-            "stadium": m.stadium,
-            "total_seats": m.total_seats,
-            "home_team": m.home_team.team_name,
-            "away_team": m.away_team.team_name,
-        })
+def queue_status(request):
+    """
+    대기 순번 / 예상 대기 시간 조회
+    GET /api/queue/status/?ticket=...
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    return JsonResponse(data, safe=False)
+    ticket = admission.read_ticket(request.GET.get("ticket"))
+    if ticket is None:
+        return JsonResponse({"error": "유효하지 않은 대기표입니다.", "code": "QUEUE_REQUIRED"}, status=400)
 
+    match_id, admit_at = ticket
+    return JsonResponse({"match_id": match_id, **admission.ticket_status(admit_at)})
 
+
+@admission_required
 def match_seat_list(request, match_id):
     """
     경기별 좌석 목록 조회
     GET /api/matches/<match_id>/seats/
+    GET /api/matches/<match_id>/seats/?since=<version>
+
+    - 응답 헤더 ETag / X-Seat-Version 에 현재 좌석 맵 버전을 담음
+    - If-None-Match 가 현재 ETag 와 같으면 304
+    - since 를 주면 그 이후 예약 상태가 바뀐 좌석만 반환
+      {"version": 12, "full": false, "changes": [{"seat_id": 1, "is_reserved": true}]}
+      변경 로그로 따라갈 수 없으면 {"version": 12, "full": true, "seats": [...]}
+    - format=layout : 좌석 배치만 (블록/열/좌석 구간, 등급·가격 표). 오래 캐시 가능
+      format=bitmap : 예약 여부 비트맵만 (좌석 순번 기준, tickets.seatlayout 참고)
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET만 가능합니다."}, status=405)
+
+    fmt = request.GET.get("format")
+    if fmt not in (None, "layout", "bitmap"):
+        return JsonResponse({"error": "format은 layout 또는 bitmap 이어야 합니다."}, status=400)
+
+    if fmt == "layout":
+        get_object_or_404(Match, pk=match_id)
+        body, layout_hash, _ = seatlayout.get_layout(match_id)
+        etag = f'"layout-{match_id}-{layout_hash}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = json_response(body)
+        response["ETag"] = etag
+        response["Cache-Control"] = f"max-age={seatlayout.LAYOUT_TTL}"
+        return response
+
+    since = request.GET.get("since")
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return JsonResponse({"error": "since는 정수여야 합니다."}, status=400)
+
+    version = seatmap.current_version(match_id)
+    etag = seatmap.make_etag(match_id, version, kind=fmt or "seats")
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        response["X-Seat-Version"] = str(version)
+        return response
+
+    # 존재하지 않는 경기면 404 (공유 비트맵이 이미 있으면 DB 를 읽지 않음)
+    if not (fmt == "bitmap" and seatshm.is_mapped(match_id)):
+        get_object_or_404(Match, pk=match_id)
+
+    if fmt == "bitmap":
+        body = seatshm.get_bitmap(match_id, version) or seatlayout.get_bitmap(match_id, version)
+        response = json_response(body)
+        response["Cache-Control"] = "no-cache"
+    elif since is None:
+        response = json_response(seatmap.seat_snapshot(match_id, version))
+    else:
+        changes = seatmap.changes_since(match_id, since, version)
+        if changes is not None:
+            response = JsonResponse({"version": version, "full": False, "changes": changes})
+        else:
+            response = json_response(
+                '{"version":%d,"full":true,"seats":%s}'
+                % (version, seatmap.seat_snapshot(match_id, version))
+            )
+
+    response["ETag"] = etag
+    response["X-Seat-Version"] = str(version)
+    return response
+
+
+@use_replica
+def seat_availability(request):
+    """
+    경기별 잔여 좌석 요약
+    GET /api/matches/availability/?match_id=1&match_id=2   (match_id 없으면 전체 경기)
+
+    seats 를 세지 않고 seat_availability(예매/취소 시 증분 갱신) 만 읽음
+    응답: [{"match_id": 1, "total": 40, "free": 37, "min_price": 30000, "max_price": 50000,
+            "grades": [{"grade": "VIP", ..., "blocks": [{"block": "A", "total": 20, "free": 17, ...}]}]}]
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET만 가능합니다."}, status=405)
+
+    try:
+        match_ids = [int(m) for m in request.GET.getlist("match_id")]
+    except ValueError:
+        return JsonResponse({"error": "match_id는 정수여야 합니다."}, status=400)
+
+    return JsonResponse(availability.summary(match_ids or None), safe=False)
+
+
+@admission_required
+def best_seats(request, match_id):
+    """
+    붙어 있는 빈 좌석 추천 (한 열 안에서 연속)
+    GET /api/matches/<match_id>/best-seats/?count=2&grade=VIP&block=A&max_price=50000&limit=5
+
+    count 는 1~4 (필수), 나머지는 선택.
+    응답: {"match_id": 1, "version": 12, "count": 2,
+           "suggestions": [{"block": "A", "row_no": "3", "total_price": 100000,
+                            "seats": [{"seat_id": 10, "seat_number": "5", "grade": "VIP", "price": 50000}, ...]}]}
+    추천만 하므로 실제로 잡으려면 선점(holds) API 를 호출해야 함 (tickets.bestseats 참고)
     """
     if request.method != "GET":
         return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    # 존재하지 않는 경기면 404
+    try:
+        count = int(request.GET.get("count", ""))
+        max_price = request.GET.get("max_price")
+        max_price = int(max_price) if max_price else None
+        limit = int(request.GET.get("limit") or bestseats.DEFAULT_SUGGESTIONS)
+    except ValueError:
+        return JsonResponse({"error": "count, max_price, limit 는 정수여야 합니다."}, status=400)
+    if not 1 <= count <= reservations.MAX_SEATS_PER_USER:
+        return JsonResponse(
+            {"error": f"count 는 1~{reservations.MAX_SEATS_PER_USER} 사이여야 합니다."}, status=400
+        )
+    limit = max(1, min(limit, bestseats.MAX_SUGGESTIONS))
+
     get_object_or_404(Match, pk=match_id)
+    version, suggestions = bestseats.find(
+        match_id,
+        count,
+        grade=request.GET.get("grade") or None,
+        block=request.GET.get("block") or None,
+        max_price=max_price,
+        limit=limit,
+    )
+    return JsonResponse(
+        {"match_id": match_id, "version": version, "count": count, "suggestions": suggestions}
+    )
 
-    seats = Seat.objects.filter(match_id=match_id).order_by("block", "row_no", "seat_number")
-    data = []
-    for s in seats:
-        data.append({
-            "seat_id": s.seat_id,
-            "block": s.block,
-            "row_no": s.row_no,
-            "seat_number": s.seat_number,
-            "grade": s.grade,
-            "price": s.price,
-            "is_reserved": bool(s.is_reserved),
-        })
-    return JsonResponse(data, safe=False)
+
+async def match_seat_events(request, match_id):
+    """
+    좌석 예약/해제 실시간 전송 (Server-Sent Events, ASGI 서버에서만)
+    GET /api/matches/<match_id>/seats/events/
+
+    event: seats
+    data: {"version": 12, "changes": [{"seat_id": 1, "is_reserved": true}]}
+    (tickets.push 참고)
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET만 가능합니다."}, status=405)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "ASGI 서버에서만 지원합니다."}, status=501)
+
+    if not await Match.objects.filter(pk=match_id).aexists():
+        return JsonResponse({"error": "경기를 찾을 수 없습니다."}, status=404)
+
+    version = await sync_to_async(seatmap.current_version)(match_id)
+    response = StreamingHttpResponse(push.stream(match_id, version), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 @csrf_exempt
-@transaction.atomic
+@admission_required
 def create_reservation(request):
     """
     예매 + 결제 생성
@@ -89,6 +298,10 @@ def create_reservation(request):
       "amount": 30000,
       "method": "card"
     }
+    좌석을 먼저 선점(POST /api/holds/)했다면 seat_id/match_id 대신 "hold_id" 를 보냄
+
+    실패 응답: {"error": "이미 예약된 좌석입니다.", "code": "SEAT_TAKEN"}
+    (code 목록은 tickets.reservations 참고)
     """
     if request.method != "POST":
         return JsonResponse({"error": "POST만 가능합니다."}, status=405)
@@ -99,70 +312,208 @@ def create_reservation(request):
         return JsonResponse({"error": "JSON 형식이 올바르지 않습니다."}, status=400)
 
     user_id = data.get("user_id")
+    user_id, error = auth.resolve_user_id(request, user_id)
+    if error:
+        return error
     match_id = data.get("match_id")
     seat_id = data.get("seat_id")
     amount = data.get("amount")
     method = data.get("method")
+    hold_id = data.get("hold_id")
+
+    if hold_id:
+        return _reserve_held_seat(request, user_id, hold_id, amount, method)
 
     if not all([user_id, match_id, seat_id, amount, method]):
         return JsonResponse({"error": "user_id, match_id, seat_id, amount, method 모두 필요합니다."}, status=400)
 
     try:
-        # 존재 여부만 미리 확인 (외래키 에러 방지차원)
-        # 실제 제약은 DB FK + 트리거가 다시 한 번 체크해 줌
-        get_object_or_404(Seat, pk=seat_id)
-        get_object_or_404(Match, pk=match_id)
-
-        # 1) 예매 생성 -> 여기서 트리거들이 좌석 중복/1인 4좌석/좌석 상태 변경 처리
-        reservation = Reservation.objects.create(
-            user_id=user_id,
-            match_id=match_id,
-            seat_id=seat_id,
-            res_date=timezone.now(),
-            status="active",
-        )
+        user_id, match_id, seat_id, amount = int(user_id), int(match_id), int(seat_id), int(amount)
+    except (TypeError, ValueError):
+        err = ReservationError(reservations.INVALID_REQUEST)
+        return JsonResponse(err.as_dict(), status=err.status)
 
-        # 2) 결제 정보 생성
-        Payment.objects.create(
-            res=reservation,
-            amount=amount,
-            method=method,
-            pay_date=timezone.now(),
-        )
+    try:
+        # 좌석 선점(UPDATE 1회) → 예매 → 결제, 데드락이면 재시도
+        # RESERVATION_ENGINE = "sequencer" 면 경기별 단일 작성자 큐를 거침
+        engine = sequencer if sequencer.is_enabled() else reservations
+        reservation = engine.reserve_seat(user_id, match_id, seat_id, amount, method)
+    except ReservationError as e:
+        # ✅ 실패 로그
+        log_request(user_id, match_id, seat_id, False, e.code, request)
+        return JsonResponse(e.as_dict(), status=e.status)
 
     # ✅ 성공 로그
-        log_request(user_id, match_id, seat_id, True, None, request)
+    log_request(user_id, match_id, seat_id, True, None, request)
+    routers.mark_write(user_id)
+    myreservations.invalidate(user_id)
 
-        return JsonResponse(
-            {"message": "예매 성공", "reservation_id": reservation.res_id},
-            status=201,
+    return JsonResponse(
+        {"message": "예매 성공", "reservation_id": reservation.res_id},
+        status=201,
+    )
+
+
+def _reserve_held_seat(request, user_id, hold_id, amount, method):
+    """선점(hold)해 둔 좌석을 결제와 함께 예매로 전환"""
+    if not all([user_id, amount, method]):
+        return JsonResponse({"error": "user_id, hold_id, amount, method 모두 필요합니다."}, status=400)
+
+    try:
+        user_id, hold_id, amount = int(user_id), int(hold_id), int(amount)
+    except (TypeError, ValueError):
+        err = ReservationError(reservations.INVALID_REQUEST)
+        return JsonResponse(err.as_dict(), status=err.status)
+
+    try:
+        # 대기열을 지난 요청이면 검사한 경기의 hold 만 전환
+        reservation = holds.convert_hold(
+            user_id, hold_id, amount, method, getattr(request, "queue_match_id", None)
         )
+    except ReservationError as e:
+        log_request(user_id, None, None, False, e.code, request)
+        return JsonResponse(e.as_dict(), status=e.status)
 
-    except DatabaseError as e:
-        # ✅ 실패 로그 (트리거/제약조건 에러 포함)
-        msg = str(e)
-
-        # (선택) 프론트가 보기 좋게 메시지 정리
-        if "이미 예약된 좌석" in msg:
-            msg = "이미 예약된 좌석입니다."
-        elif "최대 4좌석" in msg:
-            msg = "한 경기당 최대 4좌석까지 예매 가능합니다."
-        elif "경기가 일치하지" in msg:
-            msg = "예약 경기와 좌석의 경기가 일치하지 않습니다."
-        else:
-            msg = "예매 처리 중 오류가 발생했습니다."
+    log_request(user_id, reservation.match_id, reservation.seat_id, True, None, request)
+    routers.mark_write(user_id)
+    myreservations.invalidate(user_id)
 
-        log_request(user_id, match_id, seat_id, False, msg, request)
-        return JsonResponse({"error": msg}, status=400)
+    return JsonResponse(
+        {"message": "예매 성공", "reservation_id": reservation.res_id},
+        status=201,
+    )
 
-    except Exception as e:
-        msg = str(e)
-        log_request(user_id, match_id, seat_id, False, msg, request)
-        return JsonResponse({"error": msg}, status=400)
+
+@csrf_exempt
+@admission_required
+def create_reservation_batch(request):
+    """
+    여러 좌석 한 번에 예매 (최대 4좌석, 모두 성공 또는 모두 실패)
+    POST /api/reservations/batch/
+    body(JSON):
+    {
+      "user_id": 1,
+      "match_id": 3,
+      "seat_ids": [10, 11, 12],
+      "method": "card"
+    }
+
+    성공(201): {"message": "예매 성공", "results": [{"seat_id": 10, "status": "reserved", "reservation_id": 5, "amount": 30000}, ...]}
+    실패: {"error": "...", "code": "SEAT_TAKEN", "results": [{"seat_id": 10, "status": "failed", "code": "SEAT_TAKEN"}, ...]}
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST만 가능합니다."}, status=405)
+
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "JSON 형식이 올바르지 않습니다."}, status=400)
+
+    user_id = data.get("user_id")
+    user_id, error = auth.resolve_user_id(request, user_id)
+    if error:
+        return error
+    match_id = data.get("match_id")
+    seat_ids = data.get("seat_ids")
+    method = data.get("method")
+
+    if not all([user_id, match_id, seat_ids, method]) or not isinstance(seat_ids, list):
+        return JsonResponse({"error": "user_id, match_id, seat_ids(목록), method 모두 필요합니다."}, status=400)
+
+    try:
+        user_id, match_id = int(user_id), int(match_id)
+        seat_ids = [int(seat_id) for seat_id in seat_ids]
+        results = reservations.reserve_seats(user_id, match_id, seat_ids, method)
+    except (TypeError, ValueError):
+        err = ReservationError(reservations.INVALID_REQUEST)
+        return JsonResponse(err.as_dict(), status=err.status)
+    except ReservationError as e:
+        for seat_id in seat_ids:
+            log_request(user_id, match_id, seat_id, False, e.code, request)
+        return JsonResponse(e.as_dict(), status=e.status)
+
+    for r in results:
+        log_request(user_id, match_id, r["seat_id"], True, None, request)
+    routers.mark_write(user_id)
+    myreservations.invalidate(user_id)
+
+    return JsonResponse({"message": "예매 성공", "results": results}, status=201)
+
+
+@csrf_exempt
+@admission_required
+def create_hold(request):
+    """
+    좌석 임시 선점 (결제 전 HOLD_MINUTES 분 동안 유지, 최대 4좌석)
+    POST /api/holds/
+    body(JSON):
+    {
+      "user_id": 1,
+      "match_id": 3,
+      "seat_ids": [10, 11]
+    }
+
+    성공(201): {"holds": [{"hold_id": 7, "seat_id": 10, "expires_at": "..."}, ...]}
+    이후 POST /api/reservations/ 에 hold_id 를 보내 결제/예매
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST만 가능합니다."}, status=405)
+
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "JSON 형식이 올바르지 않습니다."}, status=400)
+
+    user_id = data.get("user_id")
+    user_id, error = auth.resolve_user_id(request, user_id)
+    if error:
+        return error
+    match_id = data.get("match_id")
+    seat_ids = data.get("seat_ids")
+
+    if not all([user_id, match_id, seat_ids]) or not isinstance(seat_ids, list):
+        return JsonResponse({"error": "user_id, match_id, seat_ids(목록) 모두 필요합니다."}, status=400)
+
+    try:
+        user_id, match_id = int(user_id), int(match_id)
+        seat_ids = [int(seat_id) for seat_id in seat_ids]
+        held = holds.create_holds(user_id, match_id, seat_ids)
+    except (TypeError, ValueError):
+        err = ReservationError(reservations.INVALID_REQUEST)
+        return JsonResponse(err.as_dict(), status=err.status)
+    except ReservationError as e:
+        return JsonResponse(e.as_dict(), status=e.status)
+
+    return JsonResponse({"holds": held}, status=201)
+
+
+@csrf_exempt
+def release_hold(request, hold_id):
+    """
+    좌석 선점 해제
+    POST /api/holds/<hold_id>/release/
+    body(JSON): {"user_id": 1}
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST만 가능합니다."}, status=405)
+
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+        user_id, error = auth.resolve_user_id(request, data.get("user_id"))
+        if error:
+            return error
+        user_id = int(user_id)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return JsonResponse({"error": "user_id가 필요합니다."}, status=400)
+
+    if not holds.release_hold(user_id, hold_id):
+        err = ReservationError(reservations.HOLD_NOT_FOUND)
+        return JsonResponse(err.as_dict(), status=err.status)
+
+    return JsonResponse({"message": "좌석 선점이 해제되었습니다.", "hold_id": hold_id})
 
 
 @csrf_exempt
-@transaction.atomic
 def cancel_reservation(request, res_id):
     """
     예매 취소
@@ -172,13 +523,26 @@ def cancel_reservation(request, res_id):
     - DB 트리거(trg_reservation_after_update_cancel)가
       자동으로 cancel_log INSERT + seats.is_reserved = 0 처리
     - 너무 많이 취소한 경우 제한을 걸 수도 있음
+    - 데드락/잠금은 예매와 같이 재시도, 재시도를 다 쓰면 503
     """
     if request.method != "POST":
         return JsonResponse({"error": "POST 메서드만 허용됩니다."}, status=405)
 
+    try:
+        return reservations.with_retry(_cancel_once, request, res_id)
+    except ReservationError as e:
+        return JsonResponse(e.as_dict(), status=e.status)
+
+
+def _cancel_once(request, res_id):
     # 예매 레코드 잠금 (동시성 방지)
     res = get_object_or_404(Reservation.objects.select_for_update(), pk=res_id)
 
+    # 토큰으로 요청했으면 본인 예매만 취소 가능
+    _, error = auth.resolve_user_id(request, res.user_id)
+    if error:
+        return error
+
     if res.status == "cancelled":
         return JsonResponse({"error": "이미 취소된 예매입니다."}, status=400)
 
@@ -187,29 +551,8 @@ def cancel_reservation(request, res_id):
 
     # ✅ 선택 기능: 너무 많이 취소한 사용자 제한
     # 여기서는 "같은 경기에서 3회 이상 취소한 경우" 차단 예시
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT COUNT(*)
-            FROM cancel_log c
-            JOIN reservations r ON c.res_id = r.res_id
-            WHERE c.user_id = %s
-              AND r.match_id = %s
-            """,
-            [user_id, match_id],
-        )
-        cancel_count = cursor.fetchone()[0]
-
-    if cancel_count >= 3:
-        # 너무 많이 취소함 → abuse_log에 기록해도 됨
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                INSERT INTO abuse_log (user_id, match_id, event_type)
-                VALUES (%s, %s, %s)
-                """,
-                [user_id, match_id, "too_many_cancels"],
-            )
+    # (cancel_counters PK 조회, abuse_log 는 처음 막힐 때 한 번만 기록)
+    if not cancels.check_limit(user_id, match_id):
         return JsonResponse(
             {"error": "해당 경기에 대해 취소 한도를 초과했습니다."},
             status=400,
@@ -218,6 +561,15 @@ def cancel_reservation(request, res_id):
     # 🔁 실제 취소 처리: status만 바꾸면 트리거가 나머지 처리
     res.status = "cancelled"
     res.save()
+    cancels.record_cancel(user_id, match_id)
+    seatmap.record_change(match_id, res.seat_id, False)
+    amount = Payment.objects.filter(res_id=res.res_id).values_list("amount", flat=True).first() or 0
+    stats.record(match_id, seats=-1, reservations=-1, sales=-amount)
+    transaction.on_commit(lambda: sequencer.seat_released(match_id, user_id, res.seat_id))
+    ip = request.META.get("REMOTE_ADDR")
+    transaction.on_commit(lambda: abuse.observe_cancel(user_id, match_id, ip))
+    transaction.on_commit(lambda: routers.mark_write(user_id))
+    myreservations.invalidate(user_id)
 
     return JsonResponse(
         {
@@ -271,99 +623,81 @@ def login_or_signup(request):
     )
 
     if not created:
-        # 이미 있던 유저면 이름/전화번호 갱신 정도는 해도 됨 (선택)
-        updated = False
+        # 이미 있던 유저면 바뀐 값만 UPDATE (같으면 쓰지 않음)
+        changed = []
         if user.name != name:
             user.name = name
-            updated = True
+            changed.append("name")
         if phone and user.phone != phone:
             user.phone = phone
-            updated = True
-        if updated:
-            user.save()
+            changed.append("phone")
+        if changed:
+            user.save(update_fields=changed)
 
+    auth.users.put(user)
+    access, expires_in = auth.issue_token(user)
     return JsonResponse(
         {
             "user_id": user.user_id,
             "name": user.name,
             "email": user.email,
             "phone": user.phone,
+            "role": user.role,
             "is_new": created,
+            "access": access,
+            "expires_in": expires_in,
         }
     )
 
-@csrf_exempt
-def my_reservations(request):
+
+def user_info(request):
     """
-    GET /api/my/reservations/?user_id=1
+    GET /api/users/userinfo/
+    header: Authorization: Bearer <로그인 때 받은 access>
 
-    로그인한 사용자의 예매 내역 조회
+    토큰의 사용자 정보 (프로세스 캐시에서 꺼내므로 보통 DB 를 읽지 않음)
     """
     if request.method != "GET":
         return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    user_id = request.GET.get("user_id")
-    if not user_id:
-        return JsonResponse({"error": "user_id가 필요합니다."}, status=400)
+    user_id, error = auth.resolve_user_id(request)
+    if error:
+        return error
+    if user_id is None:
+        return JsonResponse({"error": "로그인이 필요합니다.", "code": "LOGIN_REQUIRED"}, status=401)
 
-    try:
-        user = User.objects.get(pk=user_id)
-    except User.DoesNotExist:
+    info = auth.get_user(user_id)
+    if info is None:
         return JsonResponse({"error": "해당 사용자를 찾을 수 없습니다."}, status=404)
+    return JsonResponse(info)
 
-    qs = (
-        Reservation.objects
-        .filter(user=user)
-        .select_related("match", "seat")
-        .prefetch_related("payment_set")
-        .order_by("-res_date")
-    )
 
-    results = []
-    for r in qs:
-        match = r.match
-        seat = r.seat
-        payment = r.payment_set.first() if hasattr(r, "payment_set") else None
-
-        results.append({
-            "res_id": r.res_id,
-            "status": r.status,
-            "res_date": r.res_date,
-            "match": {
-                "match_id": match.match_id,
-                "match_date": match.match_date,
-                "stadium": match.stadium,
-            },
-            "seat": {
-                "seat_id": seat.seat_id,
-                "block": seat.block,
-                "row_no": seat.row_no,
-                "seat_number": seat.seat_number,
-                "grade": seat.grade,
-                "price": seat.price,
-            },
-            "payment": {
-                "amount": payment.amount if payment else None,
-                "method": payment.method if payment else None,
-                "pay_date": payment.pay_date if payment else None,
-            }
-        })
-
-    return JsonResponse(results, safe=False)
-
-from django.db import connection
+MATCH_STATS_LAYOUT = RowLayout([
+    ("match_id", INT),
+    ("match_date", DATETIME),
+    ("stadium", STR),
+    ("total_seats", INT),
+    ("seat_count", INT),
+    ("reserved_seats", INT),
+    ("occupancy_rate", FLOAT),
+    ("total_sales", FLOAT),
+    ("reservation_count", INT),
+])
+
 
 @csrf_exempt
+@use_replica
 def admin_match_stats(request):
     """
     GET /api/admin/match-stats/
 
-    match_stats 뷰에서 경기별 점유율, 매출, 예매 건수 조회
+    match_stats 테이블에서 경기별 점유율, 매출, 예매 건수 조회
+    (예매/취소 시 증분 갱신, tickets.stats 참고)
     """
     if request.method != "GET":
         return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    with connection.cursor() as cursor:
+    with routers.read_connection().cursor() as cursor:
         cursor.execute("""
             SELECT
                 match_id,
@@ -380,59 +714,41 @@ def admin_match_stats(request):
         """)
         rows = cursor.fetchall()
 
-    cols = [
-        "match_id",
-        "match_date",
-        "stadium",
-        "total_seats",
-        "seat_count",
-        "reserved_seats",
-        "occupancy_rate",
-        "total_sales",
-        "reservation_count",
-    ]
-
-    results = [
-        dict(zip(cols, row))
-        for row in rows
-    ]
-
-    return JsonResponse(results, safe=False)
+    return json_response(MATCH_STATS_LAYOUT.dumps(rows))
 
+@use_replica
 def admin_abuse_candidates(request):
     """
     GET /api/admin/abuse/
-    취소 로그 기반 이상 예매(과도한 취소) 후보 목록
+    이상 예매 후보 목록
 
     기준:
-      - cancel_log 에서 user_id 별 cancel_count >= 3 인 사용자
+      - cancel_counters 에서 user_id 별 누적 취소 >= 3 인 사용자
+      - 최근 ABUSE_REPORT_HOURS 시간 동안 탐지기(abuse.py)가 abuse_log 에 남긴 기록
+    (cancel_log 전체를 집계하지 않고 미리 쌓아 둔 값만 읽음,
+     예약 ID 는 후보 사용자의 cancel_log 에서 대표 1건만 조회)
     """
     if request.method != "GET":
         return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    # DB에서 직접 집계
-    with connection.cursor() as cur:
-        cur.execute("""
-            SELECT
-                user_id,
-                MIN(res_id) AS res_id,        -- 대표 예매 ID 하나
-                COUNT(*) AS cancel_count      -- 총 취소 횟수
-            FROM cancel_log
-            GROUP BY user_id
-            HAVING COUNT(*) >= 3
-            ORDER BY cancel_count DESC;
-        """)
-        rows = cur.fetchall()
+    hours = getattr(settings, "ABUSE_REPORT_HOURS", 24)
+    since = timezone.now() - timedelta(hours=hours)
+    rows = abuse.candidates(since, cancels.CANCEL_LIMIT)
 
-    data = []
-    for r in rows:
-        data.append({
-            "user_id": r[0],
-            "res_id": r[1],
-            "cancel_count": r[2],
-        })
+    return json_response(abuse.CANDIDATE_LAYOUT.dumps(rows))
 
-    return JsonResponse(data, safe=False)
+def metrics_endpoint(request):
+    """
+    GET /api/metrics/
+    API 별 지연/SQL 수/DB 시간 (Prometheus 텍스트 형식, tickets.metrics 참고)
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET만 가능합니다."}, status=405)
+
+    return HttpResponse(
+        metrics.registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
 
 @csrf_exempt
 def admin_login(request):
@@ -461,127 +777,215 @@ def admin_login(request):
       return JsonResponse({"error": "관리자 계정을 찾을 수 없습니다."}, status=401)
 
   # 여기서는 비밀번호 없이 email만으로 '관리자 로그인' 처리 (과제용)
+  auth.users.put(user)
+  access, expires_in = auth.issue_token(user)
   return JsonResponse(
       {
           "user_id": user.user_id,
           "name": user.name,
           "email": user.email,
           "role": user.role,
+          "access": access,
+          "expires_in": expires_in,
       }
   )
 
+# 일시는 예전 응답과 같은 'YYYY-MM-DD HH:MM:SS' (관리자 화면/내보내기 파일 호환)
+CANCEL_HISTORY_LAYOUT = RowLayout([
+    ("cancel_id", INT),
+    ("cancel_date", DATETIME_TEXT),
+    ("reason", STR),
+    ("res_id", INT),
+    ("user_id", INT),
+    ("res_date", DATETIME_TEXT),
+    ("status", STR),
+    ("match_id", INT),
+    ("match_date", DATETIME_TEXT),
+    ("stadium", STR),
+    ("seat_id", INT),
+    ("block", STR),
+    ("row_no", STR),
+    ("seat_number", STR),
+    ("grade", STR),
+    ("price", INT),
+])
+
+CANCEL_HISTORY_SQL = """
+    SELECT
+        c.cancel_id,
+        c.cancel_date,
+        c.reason,
+        c.res_id,
+        c.user_id,
+        r.res_date,
+        r.status,
+        m.match_id,
+        m.match_date,
+        m.stadium,
+        s.seat_id,
+        s.block,
+        s.row_no,
+        s.seat_number,
+        s.grade,
+        s.price
+    FROM cancel_log c
+    JOIN reservations r ON c.res_id = r.res_id
+    JOIN matches m ON r.match_id = m.match_id
+    JOIN seats s ON r.seat_id = s.seat_id
+"""
+
+
+def _parse_date_param(value, end=False):
+    """'2025-05-01' 또는 '2025-05-01T12:00:00'. 날짜만 주면 end=True 일 때 다음 날 0시"""
+    d = parse_date(value)
+    if d is not None:
+        dt = datetime.combine(d, datetime.min.time())
+        if end:
+            dt += timedelta(days=1)
+    else:
+        dt = parse_datetime(value)
+        if dt is None:
+            raise ValueError(value)
+    if settings.USE_TZ and timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def _stream_cancel_history(db, sql, params, chunk_size=500):
+    """
+    서버 사이드 커서로 읽으면서 JSON 배열을 조각조각 내보냄 (전체를 메모리에 올리지 않음)
+    MySQL 은 SSCursor, 그 외 DB 는 fetchmany 로 나눠 읽음
+    """
+    db.ensure_connection()
+    if db.vendor == "mysql":
+        from MySQLdb.cursors import SSCursor
+        cursor = db.connection.cursor(SSCursor)
+    else:
+        cursor = db.cursor()
+
+    try:
+        cursor.execute(sql, params)
+        yield "["
+        first = True
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunk = ",".join(map(CANCEL_HISTORY_LAYOUT.dump, rows))
+            yield chunk if first else "," + chunk
+            first = False
+        yield "]"
+    finally:
+        cursor.close()
+
+
 @csrf_exempt
+@use_replica
 def admin_cancel_history(request):
     """
     GET /api/admin/cancel-history/
-    전체 취소 이력 조회 (관리자용)
+    전체 취소 이력 조회 (관리자용), 최신순
 
-    ※ user_id / match_id 파라미터 없이 전체 로그 반환
+    query:
+      user_id, match_id       : 필터 (선택)
+      date_from, date_to      : 취소 일시 범위 (선택, YYYY-MM-DD 또는 ISO 일시)
+      limit                   : 페이지 크기 (기본 50, 최대 200)
+      cursor                  : 이전 응답의 next_cursor
+      export=1                : 페이지 없이 전체를 스트리밍 JSON 배열로 반환
+
+    응답: {"results": [...], "next_cursor": "..." 또는 null}
     """
     if request.method != "GET":
         return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    with connection.cursor() as cur:
-        cur.execute("""
-            SELECT
-                c.cancel_id,
-                c.res_id,
-                c.user_id,
-                c.cancel_date,
-                c.reason
-            FROM cancel_log c
-            ORDER BY c.cancel_date DESC;
-        """)
+    where = []
+    params = []
+    try:
+        if request.GET.get("user_id"):
+            where.append("c.user_id = %s")
+            params.append(int(request.GET["user_id"]))
+        if request.GET.get("match_id"):
+            where.append("r.match_id = %s")
+            params.append(int(request.GET["match_id"]))
+        if request.GET.get("date_from"):
+            where.append("c.cancel_date >= %s")
+            params.append(_parse_date_param(request.GET["date_from"]))
+        if request.GET.get("date_to"):
+            where.append("c.cancel_date < %s")
+            params.append(_parse_date_param(request.GET["date_to"], end=True))
+        limit = pagination.parse_limit(request.GET.get("limit"))
+        cursor_token = request.GET.get("cursor")
+        if cursor_token:
+            cancel_date, cancel_id = pagination.decode_cursor(cursor_token)
+            where.append(pagination.keyset_condition("c.cancel_date", "c.cancel_id"))
+            params += [cancel_date, cancel_date, cancel_id]
+    except ValueError:
+        return JsonResponse({"error": "조회 조건이 올바르지 않습니다."}, status=400)
+
+    sql = CANCEL_HISTORY_SQL
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY c.cancel_date DESC, c.cancel_id DESC"
+
+    if request.GET.get("export") == "1":
+        return StreamingHttpResponse(
+            _stream_cancel_history(routers.read_connection(), sql, params),
+            content_type="application/json",
+        )
+
+    with routers.read_connection().cursor() as cur:
+        cur.execute(sql + " LIMIT %s", params + [limit + 1])
         rows = cur.fetchall()
 
-    data = []
-    for r in rows:
-        data.append({
-            "cancel_id": r[0],
-            "res_id": r[1],
-            "user_id": r[2],
-            "cancel_date": r[3].strftime("%Y-%m-%d %H:%M:%S"),
-            "reason": r[4],
-        })
-
-    return JsonResponse(data, safe=False)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = pagination.encode_cursor(last[1], last[0])
+
+    return json_response(
+        '{"results":%s,"next_cursor":%s}'
+        % (CANCEL_HISTORY_LAYOUT.dumps(rows), json.dumps(next_cursor))
+    )
+
+
 @csrf_exempt
+@use_replica
 def my_reservations(request):
     """
     GET /api/my/reservations/?user_id=1
 
-    특정 사용자의 예매 내역을 경기/좌석/결제 정보와 함께 반환
+    특정 사용자의 예매 내역을 경기/좌석/결제 정보와 함께 최신순으로 반환
+
+    query:
+      status  : active / cancelled (선택)
+      limit   : 페이지 크기 (기본 50, 최대 200)
+      cursor  : 이전 응답의 next_cursor
+
+    응답: {"results": [...], "next_cursor": "..." 또는 null}
+    사용자별로 캐시하고, 그 사용자가 예매/취소하면 무효화 (tickets.myreservations 참고)
     """
     if request.method != "GET":
         return JsonResponse({"error": "GET만 가능합니다."}, status=405)
 
-    user_id = request.GET.get("user_id")
+    user_id, error = auth.resolve_user_id(request, request.GET.get("user_id"))
+    if error:
+        return error
     if not user_id:
         return JsonResponse({"error": "user_id가 필요합니다."}, status=400)
 
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT
-                    r.res_id,
-                    r.res_date,
-                    r.status,
-                    m.match_id,
-                    m.match_date,
-                    m.stadium,
-                    ht.team_name AS home_team,
-                    at.team_name AS away_team,
-                    s.seat_id,
-                    s.block,
-                    s.row_no,
-                    s.seat_number,
-                    s.grade,
-                    s.price,
-                    p.pay_id,
-                    p.amount,
-                    p.method,
-                    p.pay_date
-                FROM reservations r
-                JOIN matches m ON r.match_id = m.match_id
-                JOIN teams   ht ON m.home_team_id = ht.team_id
-                JOIN teams   at ON m.away_team_id = at.team_id
-                JOIN seats   s  ON r.seat_id = s.seat_id
-                LEFT JOIN payments p ON r.res_id = p.res_id
-                WHERE r.user_id = %s
-                ORDER BY r.res_date DESC
-                """,
-                [user_id],
-            )
-            rows = cursor.fetchall()
-
-        cols = [
-            "res_id",
-            "res_date",
-            "status",
-            "match_id",
-            "match_date",
-            "stadium",
-            "home_team",
-            "away_team",
-            "seat_id",
-            "block",
-            "row_no",
-            "seat_number",
-            "grade",
-            "price",
-            "pay_id",
-            "amount",
-            "method",
-            "pay_date",
-        ]
-
-        results = [dict(zip(cols, row)) for row in rows]
-
-        return JsonResponse(results, safe=False)
-
-    except Exception as e:
-        # 서버 내부 에러 확인용
-        print("my_reservations error:", e)
-        return JsonResponse({"error": "예매 내역 조회 중 오류가 발생했습니다."}, status=500)
+    status = request.GET.get("status") or None
+    if status is not None and status not in myreservations.STATUSES:
+        return JsonResponse({"error": "status는 active 또는 cancelled 입니다."}, status=400)
 
+    try:
+        user_id = int(user_id)
+        limit = pagination.parse_limit(request.GET.get("limit"))
+        cursor_token = request.GET.get("cursor")
+        cursor = pagination.decode_cursor(cursor_token) if cursor_token else None
+    except ValueError:
+        return JsonResponse({"error": "조회 조건이 올바르지 않습니다."}, status=400)
+
+    response = json_response(myreservations.get(user_id, status, limit, cursor))
+    response["Cache-Control"] = "private, no-cache"
+    return response
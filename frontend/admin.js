@@ -88,6 +88,7 @@ async function loadAbuseCandidates() {
         <td>${item.user_id}</td>
         <td>${item.res_id ?? "-"}</td>
         <td>${item.cancel_count}</td>
+        <td>${item.events.map((e) => `${e.event_type}(${e.count})`).join(", ") || "-"}</td>
       `;
       tbody.appendChild(tr);
     });
@@ -110,16 +111,17 @@ async function loadCancelHistory() {
       return;
     }
 
+    // 최근 것부터 한 페이지(기본 50건)만 표시
     const data = await res.json();
     tbody.innerHTML = "";
 
-    if (!data.length) {
+    if (!data.results.length) {
       emptyMsg.style.display = "block";
       return;
     }
     emptyMsg.style.display = "none";
 
-    data.forEach((item) => {
+    data.results.forEach((item) => {
       const tr = document.createElement("tr");
       tr.innerHTML = `
         <td>${item.cancel_id}</td>
@@ -29,6 +29,7 @@ document.addEventListener("DOMContentLoaded", () => {
       localStorage.setItem("user_id", data.user_id);
       localStorage.setItem("user_name", data.name);
       localStorage.setItem("user_role", data.role);   // 'admin'
+      localStorage.setItem("access", data.access);
       localStorage.setItem("is_admin", "true");
 
       localStorage.setItem("admin_id", data.user_id);
@@ -17,6 +17,32 @@ function getQueryParams() {
   };
 }
 
+function renderHistoryRows(tbody, items) {
+  items.forEach((item) => {
+    const tr = document.createElement("tr");
+
+    const seatLabel = `${item.block}블록 ${item.row_no}열 ${item.seat_number}번`;
+    const matchLabel = `${item.match_date} @ ${item.stadium}`;
+
+    tr.innerHTML = `
+      <td>${item.cancel_id}</td>
+      <td>${item.cancel_date}</td>
+      <td>${matchLabel}</td>
+      <td>${seatLabel} (${item.grade})</td>
+      <td>${item.price}원</td>
+      <td>${item.res_id}</td>
+      <td>${item.res_date}</td>
+      <td>${item.status}</td>
+      <td>${item.reason || ""}</td>
+    `;
+
+    tbody.appendChild(tr);
+  });
+}
+
+// 서버는 한 페이지씩(커서 기반) 내려줌 → "더 보기"로 다음 페이지
+let nextCursor = null;
+
 async function loadCancelHistory() {
   ensureAdmin();
 
@@ -30,9 +56,12 @@ async function loadCancelHistory() {
   const titleEl = document.getElementById("title");
   titleEl.textContent = `사용자 ${user_id}, 경기 ${match_id} 취소 이력`;
 
+  const params = new URLSearchParams({ user_id, match_id });
+  if (nextCursor) params.set("cursor", nextCursor);
+
   try {
     const res = await fetch(
-      `${API_BASE}/api/admin/cancel-history/?user_id=${user_id}&match_id=${match_id}`
+      `${API_BASE}/api/admin/cancel-history/?${params.toString()}`
     );
 
     if (!res.ok) {
@@ -45,38 +74,27 @@ async function loadCancelHistory() {
     const data = await res.json();
     const tbody = document.getElementById("history-tbody");
     const emptyMsg = document.getElementById("empty-msg");
-    tbody.innerHTML = "";
+    const moreBtn = document.getElementById("more-btn");
+
+    if (!nextCursor) tbody.innerHTML = "";
+    nextCursor = data.next_cursor;
+    if (moreBtn) moreBtn.style.display = nextCursor ? "inline-block" : "none";
 
-    if (!data.length) {
+    if (!data.results.length && !tbody.children.length) {
       emptyMsg.style.display = "block";
       return;
     }
     emptyMsg.style.display = "none";
 
-    data.forEach((item) => {
-      const tr = document.createElement("tr");
-
-      const seatLabel = `${item.block}블록 ${item.row_no}열 ${item.seat_number}번`;
-      const matchLabel = `${item.match_date} @ ${item.stadium}`;
-
-      tr.innerHTML = `
-        <td>${item.cancel_id}</td>
-        <td>${item.cancel_date}</td>
-        <td>${matchLabel}</td>
-        <td>${seatLabel} (${item.grade})</td>
-        <td>${item.price}원</td>
-        <td>${item.res_id}</td>
-        <td>${item.res_date}</td>
-        <td>${item.status}</td>
-        <td>${item.reason || ""}</td>
-      `;
-
-      tbody.appendChild(tr);
-    });
+    renderHistoryRows(tbody, data.results);
   } catch (err) {
     console.error(err);
     alert("취소 이력을 불러오는 중 오류가 발생했습니다.");
   }
 }
 
+document.addEventListener("DOMContentLoaded", () => {
+  const moreBtn = document.getElementById("more-btn");
+  if (moreBtn) moreBtn.addEventListener("click", loadCancelHistory);
+});
 document.addEventListener("DOMContentLoaded", loadCancelHistory);
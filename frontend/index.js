@@ -83,10 +83,14 @@ async function updateHeaderUI() {
   }
 }
 
-// 2) 경기 목록 불러오기
+// 2) 경기 목록 불러오기 (한 페이지씩, "더 보기"로 다음 페이지)
+let nextMatchCursor = null;
+
 async function loadMatches() {
   try {
-    const res = await fetch(`${API_BASE}/api/matches/`);
+    const params = new URLSearchParams();
+    if (nextMatchCursor) params.set("cursor", nextMatchCursor);
+    const res = await fetch(`${API_BASE}/api/matches/?${params.toString()}`);
 
     if (!res.ok) {
       const text = await res.text();
@@ -95,12 +99,17 @@ async function loadMatches() {
       return;
     }
 
-    const matches = await res.json();
+    const data = await res.json();
+    const matches = data.results;
     const listEl = document.getElementById("match-list");
     if (!listEl) return;
-    listEl.innerHTML = "";
+    if (!nextMatchCursor) listEl.innerHTML = "";
+
+    nextMatchCursor = data.next_cursor;
+    const moreBtn = document.getElementById("more-matches-btn");
+    if (moreBtn) moreBtn.style.display = nextMatchCursor ? "inline-block" : "none";
 
-    if (!matches.length) {
+    if (!matches.length && !listEl.children.length) {
       listEl.innerHTML = "<li>등록된 경기가 없습니다.</li>";
       return;
     }
@@ -111,20 +120,47 @@ async function loadMatches() {
         <a href="seats.html?match_id=${m.match_id}">
           ${m.match_date} — ${m.stadium} — ${m.home_team} vs ${m.away_team}
         </a>
+        <span class="match-availability" data-match-id="${m.match_id}"></span>
       `;
       listEl.appendChild(li);
     });
+
+    loadAvailability(matches.map((m) => m.match_id));
   } catch (err) {
     console.error("경기 목록 로딩 중 에러:", err);
     alert("경기 목록을 불러오지 못했습니다.");
   }
 }
 
+// 경기별 잔여 좌석 (요약 테이블 한 번 조회)
+async function loadAvailability(matchIds) {
+  if (!matchIds.length) return;
+  try {
+    const params = new URLSearchParams();
+    matchIds.forEach((id) => params.append("match_id", id));
+    const res = await fetch(`${API_BASE}/api/matches/availability/?${params.toString()}`);
+    if (!res.ok) return;
+
+    const data = await res.json();
+    data.forEach((a) => {
+      const el = document.querySelector(`.match-availability[data-match-id="${a.match_id}"]`);
+      if (!el) return;
+      const grades = a.grades.map((g) => `${g.grade} ${g.free}`).join(", ");
+      el.textContent = ` (잔여 ${a.free}/${a.total}석 — ${grades})`;
+    });
+  } catch (err) {
+    console.error("잔여 좌석 조회 실패:", err);
+  }
+}
+
 // 3) 초기화
 document.addEventListener("DOMContentLoaded", async () => {
   await updateHeaderUI();
   loadMatches();
 
+  const moreMatchesBtn = document.getElementById("more-matches-btn");
+  if (moreMatchesBtn) moreMatchesBtn.addEventListener("click", loadMatches);
+
   const logoutBtn = document.getElementById("logout-btn");
   if (logoutBtn) {
     logoutBtn.addEventListener("click", () => {
@@ -30,6 +30,8 @@ document.getElementById("login-form").addEventListener("submit", async (e) => {
     // user_id를 localStorage에 저장
     localStorage.setItem("user_id", data.user_id);
     localStorage.setItem("user_name", data.name);
+    // 이후 요청은 Authorization: Bearer <access> 로 본인 확인
+    localStorage.setItem("access", data.access);
 
     const statusEl = document.getElementById("status");
     statusEl.textContent = `${data.name}님 로그인 완료! (user_id=${data.user_id})`;
@@ -21,18 +21,32 @@ function ensureLogin() {
   return true;
 }
 
-// 내 예매 내역 불러오기
-async function loadMyReservations() {
+// 로그인 때 받은 access 토큰이 있으면 Authorization 헤더로 보냄
+function authHeaders(headers = {}) {
+  const token = localStorage.getItem("access");
+  return token ? { ...headers, Authorization: `Bearer ${token}` } : headers;
+}
+
+// 내 예매 내역 불러오기 (한 페이지씩, more=true 면 다음 페이지를 이어 붙임)
+let nextResCursor = null;
+
+async function loadMyReservations(more = false) {
   if (!ensureLogin()) return;
 
   const userId = localStorage.getItem("user_id");
   const tbody = document.getElementById("my-res-tbody");
   const emptyMsg = document.getElementById("my-res-empty");
+  const moreBtn = document.getElementById("my-res-more-btn");
+  const statusEl = document.getElementById("my-res-status");
+
+  const params = new URLSearchParams({ user_id: userId });
+  if (statusEl && statusEl.value) params.set("status", statusEl.value);
+  if (more && nextResCursor) params.set("cursor", nextResCursor);
 
   try {
-    const res = await fetch(
-      `${API_BASE}/api/my/reservations/?user_id=${encodeURIComponent(userId)}`
-    );
+    const res = await fetch(`${API_BASE}/api/my/reservations/?${params.toString()}`, {
+      headers: authHeaders(),
+    });
 
     if (!res.ok) {
       const text = await res.text();
@@ -42,16 +56,19 @@ async function loadMyReservations() {
     }
 
     const data = await res.json();
+    const items = data.results;
 
-    tbody.innerHTML = "";
+    if (!more) tbody.innerHTML = "";
+    nextResCursor = data.next_cursor;
+    if (moreBtn) moreBtn.style.display = nextResCursor ? "inline-block" : "none";
 
-    if (!data.length) {
+    if (!items.length && !tbody.children.length) {
       emptyMsg.style.display = "block";
       return;
     }
     emptyMsg.style.display = "none";
 
-    data.forEach((item) => {
+    items.forEach((item) => {
       const tr = document.createElement("tr");
 
       const matchLabel = `${item.match_date} / ${item.stadium} / ${item.home_team} vs ${item.away_team}`;
@@ -96,9 +113,9 @@ async function cancelReservation(resId) {
       `${API_BASE}/api/reservations/${resId}/cancel/`,
       {
         method: "POST",
-        headers: {
+        headers: authHeaders({
           "Content-Type": "application/json",
-        },
+        }),
       }
     );
 
@@ -124,6 +141,12 @@ document.addEventListener("DOMContentLoaded", () => {
   // 페이지 처음 로딩 시 예매 내역 가져오기
   loadMyReservations();
 
+  const moreBtn = document.getElementById("my-res-more-btn");
+  if (moreBtn) moreBtn.addEventListener("click", () => loadMyReservations(true));
+
+  const statusEl = document.getElementById("my-res-status");
+  if (statusEl) statusEl.addEventListener("change", () => loadMyReservations());
+
   const tbody = document.getElementById("my-res-tbody");
   tbody.addEventListener("click", (e) => {
     if (e.target.classList.contains("cancel-btn")) {
@@ -9,6 +9,12 @@ function getUserId() {
   return localStorage.getItem("user_id");
 }
 
+// 로그인 때 받은 access 토큰이 있으면 Authorization 헤더로 보냄
+function authHeaders(headers = {}) {
+  const token = localStorage.getItem("access");
+  return token ? { ...headers, Authorization: `Bearer ${token}` } : headers;
+}
+
 function formatPrice(n) {
   const num = Number(n) || 0;
   return num.toLocaleString("ko-KR");
@@ -86,6 +92,196 @@ function renderSeats(listEl, seats, matchId) {
   });
 }
 
+// ===== 대기열 =====
+// 대기열이 켜진 경기는 좌석 조회/예매에 대기표(X-Queue-Ticket)가 필요함
+function queueTicketKey(matchId) {
+  return `queue_ticket_${matchId}`;
+}
+
+function sleep(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+// 대기표를 받고(없으면) 입장할 때까지 순번을 보여주며 기다림
+async function waitForAdmission(matchId, ticket) {
+  const titleEl = document.getElementById("match-title");
+
+  let status = null;
+  if (!ticket) {
+    const res = await fetch(`${API_BASE}/api/matches/${matchId}/queue/`, { method: "POST" });
+    status = await res.json();
+    ticket = status.ticket;
+    if (!ticket) return;
+    sessionStorage.setItem(queueTicketKey(matchId), ticket);
+  }
+
+  while (!status || !status.admitted) {
+    if (status) {
+      if (titleEl) {
+        titleEl.textContent = `입장 대기 중... 내 앞 ${status.position}명 (약 ${status.eta_seconds}초)`;
+      }
+      await sleep(Math.min(5, Math.max(1, status.eta_seconds)) * 1000);
+    }
+    const res = await fetch(
+      `${API_BASE}/api/queue/status/?ticket=${encodeURIComponent(ticket)}`
+    );
+    if (!res.ok) {
+      // 대기표가 만료됐으면 새로 받음
+      sessionStorage.removeItem(queueTicketKey(matchId));
+      return waitForAdmission(matchId, null);
+    }
+    status = await res.json();
+  }
+
+  if (titleEl) titleEl.textContent = `경기 ID: ${matchId} 좌석 목록`;
+}
+
+// 대기표를 붙여 요청하고, 입장 전이면 기다렸다가 다시 요청
+async function queuedFetch(matchId, url, options = {}) {
+  const send = () => {
+    const ticket = sessionStorage.getItem(queueTicketKey(matchId));
+    const headers = authHeaders({ ...(options.headers || {}) });
+    if (ticket) headers["X-Queue-Ticket"] = ticket;
+    return fetch(url, { ...options, headers });
+  };
+
+  const res = await send();
+  if (res.status !== 429) return res;
+
+  const data = await res.clone().json().catch(() => ({}));
+  if (data.code === "QUEUE_REQUIRED") {
+    sessionStorage.removeItem(queueTicketKey(matchId));
+    await waitForAdmission(matchId, null);
+  } else if (data.code === "NOT_ADMITTED") {
+    await waitForAdmission(matchId, sessionStorage.getItem(queueTicketKey(matchId)));
+  } else {
+    return res;
+  }
+  return send();
+}
+
+// 좌석 배치(layout)는 한 번만 받고, 이후엔 예약 비트맵만 주기적으로 받아옴
+// (대형 경기장에서 좌석마다 객체를 다시 받지 않도록)
+const SEAT_POLL_MS = 3000;
+let seatLayoutHash = null;
+// 서버 실시간 전송(SSE)이 연결돼 있으면 비트맵 폴링을 쉼
+let seatPushConnected = false;
+
+function expandRuns(runs, step) {
+  const out = [];
+  runs.forEach(([start, count]) => {
+    for (let i = 0; i < count; i++) out.push(start + i * step);
+  });
+  return out;
+}
+
+// 배치 → 좌석 객체 목록 (순번 순서)
+function seatsFromLayout(layout) {
+  const seats = [];
+  layout.blocks.forEach((b) => {
+    b.rows.forEach((r) => {
+      const ids = expandRuns(r.ids, 1);
+      const numbers =
+        r.numbers.length && Array.isArray(r.numbers[0])
+          ? expandRuns(r.numbers, 1).map(String)
+          : r.numbers;
+      const tiers = expandRuns(r.tiers, 0);
+      ids.forEach((seatId, i) => {
+        const [grade, price] = layout.tiers[tiers[i]];
+        seats.push({
+          seat_id: seatId,
+          block: b.block,
+          row_no: r.row_no,
+          seat_number: numbers[i],
+          grade,
+          price,
+          is_reserved: false,
+        });
+      });
+    });
+  });
+  return seats;
+}
+
+// 비트맵 반영. 바뀐 좌석이 있으면 true
+function applyBitmap(seats, bitmap) {
+  const bytes = atob(bitmap.bits);
+  let changed = false;
+  seats.forEach((s, i) => {
+    const reserved = (bytes.charCodeAt(i >> 3) & (0x80 >> (i & 7))) !== 0;
+    if (s.is_reserved !== reserved) {
+      s.is_reserved = reserved;
+      changed = true;
+    }
+  });
+  return changed;
+}
+
+async function fetchLayout(matchId, seats) {
+  const res = await queuedFetch(matchId, `${API_BASE}/api/matches/${matchId}/seats/?format=layout`);
+  if (!res.ok) throw new Error("좌석 배치 조회 실패");
+  const layout = await res.json();
+  seatLayoutHash = layout.layout;
+  seats.splice(0, seats.length, ...seatsFromLayout(layout));
+}
+
+async function pollSeats(matchId, seats, rerender) {
+  if (seatPushConnected) return;
+  try {
+    // 변경이 없으면 브라우저가 ETag 로 재검증해서 304 → 캐시된 비트맵을 그대로 받음
+    const res = await queuedFetch(matchId, `${API_BASE}/api/matches/${matchId}/seats/?format=bitmap`);
+    if (!res.ok) return;
+
+    const bitmap = await res.json();
+    let changed = false;
+    if (bitmap.layout !== seatLayoutHash) {
+      // 좌석 구성이 바뀜 → 배치부터 다시
+      await fetchLayout(matchId, seats);
+      changed = true;
+    }
+    if (applyBitmap(seats, bitmap) || changed) rerender();
+  } catch (err) {
+    console.error("좌석 상태 조회 실패:", err);
+  }
+}
+
+// 좌석 예약/해제를 서버가 보내 줌 (ASGI 서버에서만, 실패하면 폴링 유지)
+function subscribeSeats(matchId, seats, rerender) {
+  if (!window.EventSource) return;
+
+  const source = new EventSource(`${API_BASE}/api/matches/${matchId}/seats/events/`);
+  // 배치를 다시 받으면 좌석 객체가 바뀌므로 그때 다시 만듦
+  let byId = null;
+  let byIdLayout = null;
+
+  source.onopen = () => {
+    // 연결 전 사이의 변경을 놓치지 않도록 한 번 맞춤
+    seatPushConnected = false;
+    pollSeats(matchId, seats, rerender).finally(() => {
+      seatPushConnected = source.readyState === EventSource.OPEN;
+    });
+  };
+  source.onerror = () => {
+    seatPushConnected = false;
+  };
+  source.addEventListener("seats", (e) => {
+    const data = JSON.parse(e.data);
+    if (byIdLayout !== seatLayoutHash) {
+      byId = new Map(seats.map((s) => [s.seat_id, s]));
+      byIdLayout = seatLayoutHash;
+    }
+    let changed = false;
+    data.changes.forEach((c) => {
+      const seat = byId.get(c.seat_id);
+      if (seat && seat.is_reserved !== c.is_reserved) {
+        seat.is_reserved = c.is_reserved;
+        changed = true;
+      }
+    });
+    if (changed) rerender();
+  });
+}
+
 async function loadSeats() {
   const matchId = getMatchId();
   if (!matchId) {
@@ -100,19 +296,26 @@ async function loadSeats() {
   const sortEl = document.getElementById("sort-select");
 
   try {
-    const res = await fetch(`${API_BASE}/api/matches/${matchId}/seats/`);
-    const seats = await res.json();
+    const seats = [];
+    await fetchLayout(matchId, seats);
 
-    // 처음 렌더
-    const mode = sortEl ? sortEl.value : "default";
-    renderSeats(listEl, sortSeats(seats, mode), matchId);
+    const rerender = () => {
+      const mode = sortEl ? sortEl.value : "default";
+      renderSeats(listEl, sortSeats(seats, mode), matchId);
+    };
+
+    // 처음 렌더 (예약 상태 반영 후)
+    await pollSeats(matchId, seats, rerender);
+    rerender();
 
     // 정렬 바인딩
     if (sortEl) {
-      sortEl.addEventListener("change", () => {
-        renderSeats(listEl, sortSeats(seats, sortEl.value), matchId);
-      });
+      sortEl.addEventListener("change", rerender);
     }
+
+    // 실시간 전송을 받고, 안 되면 비트맵만 주기적으로 반영
+    subscribeSeats(matchId, seats, rerender);
+    setInterval(() => pollSeats(matchId, seats, rerender), SEAT_POLL_MS);
   } catch (err) {
     console.error(err);
     alert("좌석 목록을 불러오지 못했습니다.");
@@ -128,20 +331,44 @@ async function handleReserveSeat(matchId, seat) {
     return;
   }
 
-  const ok = confirm(
-    `${seatLabel(seat)}\n` +
-    `${formatPrice(seat.price)}원으로 예매할까요?`
-  );
-  if (!ok) return;
-
   try {
-    const res = await fetch(`${API_BASE}/api/reservations/`, {
+    // 1) 결제 확인 동안 다른 사람이 못 잡도록 먼저 좌석 선점(hold)
+    const holdRes = await queuedFetch(matchId, `${API_BASE}/api/holds/`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
         user_id: parseInt(userId, 10),
         match_id: matchId,
-        seat_id: seat.seat_id,
+        seat_ids: [seat.seat_id],
+      }),
+    });
+
+    const holdData = await holdRes.json();
+    if (!holdRes.ok) {
+      throw new Error(holdData.error || "좌석 선점 실패");
+    }
+    const holdId = holdData.holds[0].hold_id;
+
+    const ok = confirm(
+      `${seatLabel(seat)}\n` +
+      `${formatPrice(seat.price)}원으로 예매할까요?`
+    );
+    if (!ok) {
+      await fetch(`${API_BASE}/api/holds/${holdId}/release/`, {
+        method: "POST",
+        headers: authHeaders({ "Content-Type": "application/json" }),
+        body: JSON.stringify({ user_id: parseInt(userId, 10) }),
+      });
+      return;
+    }
+
+    // 2) 선점한 좌석 결제 → 예매
+    const res = await fetch(`${API_BASE}/api/reservations/`, {
+      method: "POST",
+      headers: authHeaders({ "Content-Type": "application/json" }),
+      body: JSON.stringify({
+        user_id: parseInt(userId, 10),
+        hold_id: holdId,
         amount: seat.price,
         method: "card",
       }),